@@ -0,0 +1,40 @@
+from typing import Any
+
+from server.app.database.async_database import get_async_pool_stats
+from server.app.database.database import get_pool_stats, get_replica_pools_stats
+from server.app.database.query_metrics import query_metrics
+from server.app.utils.crypto import envelope_cipher
+from server.app.utils.executor import crypto_executor, handler_executor
+from server.app.utils.permission_snapshot import permission_snapshot
+from server.app.utils.token_cache import verified_tokens
+from server.app.utils.token_signer import token_signer
+from server.app.utils.user_cache import user_principals
+
+
+class AdminMetricsController:
+    @staticmethod
+    def get_server_metrics() -> dict[str, Any]:
+        return {
+            "handler_executor": handler_executor.stats(),
+            "crypto_executor": crypto_executor.stats(),
+            "envelope_cipher": envelope_cipher.stats(),
+            "database_pool": get_pool_stats(),
+            "replica_database_pools": get_replica_pools_stats(),
+            "async_database_pool": get_async_pool_stats(),
+            "verified_token_cache": verified_tokens.stats(),
+            "token_signer": token_signer.stats(),
+            "user_cache": user_principals.stats(),
+            "permission_snapshot": permission_snapshot.stats(),
+        }
+
+    @staticmethod
+    def get_top_queries(limit: int, order_by: str) -> list[dict[str, Any]]:
+        return query_metrics.top(limit=limit, order_by=order_by)
+
+    @staticmethod
+    def get_slow_queries() -> list[dict[str, Any]]:
+        return query_metrics.slow_queries()
+
+    @staticmethod
+    def reset_query_metrics() -> None:
+        query_metrics.reset()
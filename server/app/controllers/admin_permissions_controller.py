@@ -1,7 +1,8 @@
 from typing import Any
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, after_commit
 from server.app.models.permission_model import Permission
+from server.app.services.cache_permissions_service import load_permissions
 
 
 class AdminPermissionsController:
@@ -25,6 +26,8 @@ class AdminPermissionsController:
             plan_names = list(set(plan_names + ['admin']))
 
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(load_permissions)
+
             return db.fetch(
                 """
                      WITH selected_plans AS (
@@ -70,6 +73,8 @@ class AdminPermissionsController:
         updated_plans = permission_data.get("plans", None)
 
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(load_permissions)
+
             if not updated_plans:
                 updated_plans = db.fetch(
                     """
@@ -117,3 +122,4 @@ class AdminPermissionsController:
     @staticmethod
     def delete_permission(permission_id: int) -> None:
         Permission.delete_record_by_id(permission_id)
+        after_commit(load_permissions)
@@ -1,7 +1,9 @@
 from typing import Any
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, after_commit
 from server.app.models.plan_model import Plan
+from server.app.services.cache_permissions_service import load_permissions
+from server.app.utils.user_cache import user_principals
 
 
 class AdminPlansController:
@@ -12,6 +14,8 @@ class AdminPlansController:
     @staticmethod
     def create_plan(plan_data: dict[str, str]) -> dict[str, Any]:
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(load_permissions)
+
             return db.fetch(
                 """
                     INSERT INTO plans (name)
@@ -30,8 +34,17 @@ class AdminPlansController:
             plan_id: int,
             plan_data: dict[str, str]
     ) -> dict[str, Any]:
-        return Plan.update_plan_by_id(plan_id, plan_data["plan"])
+        plan = Plan.update_plan_by_id(plan_id, plan_data["plan"])
+        after_commit(AdminPlansController._reload_plans)
+
+        return plan
 
     @staticmethod
     def delete_plan_by_id(plan_id: int) -> None:
         Plan.delete_record_by_id(plan_id)
+        after_commit(AdminPlansController._reload_plans)
+
+    @staticmethod
+    def _reload_plans() -> None:
+        load_permissions()
+        user_principals.invalidate_all()
@@ -2,12 +2,15 @@ from datetime import datetime
 from typing import Any
 
 from server.app.database.database import PostgresDatabase
+from server.app.utils.user_cache import user_principals
 
 
 class AdminUserController:
     @staticmethod
     def block_user_by_id(user_id: int, block_timestamp: datetime) -> dict[str, Any] | None:
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(lambda: user_principals.invalidate(user_id))
+
             return db.fetch(
                 """
                     WITH blocked_user AS (
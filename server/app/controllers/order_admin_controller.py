@@ -1,29 +1,59 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, stream_batches
 from server.app.models.order_model import Order
 
 
 class OrderAdminController:
     @staticmethod
-    def get_all_orders() -> list[dict[str, Any]] | dict[str, Any] | None:
+    def _get_all_orders_query(paged: bool = False) -> str:
+        return (
+            """
+                WITH selected_orders AS (
+                    SELECT
+                        o.id AS id,
+                        o.name AS name,
+                        o.description AS description,
+                        o.customer_id AS customer_id,
+                        o.execution_type AS execution_type,
+                        o.performer_id AS performer_id,
+                        o.performer_team_id AS performer_team_id,
+                        i.image_link AS image_link,
+                        ARRAY(
+                            SELECT t.name
+                            FROM orders_tags ot
+                            JOIN tags t ON t.id = ot.tag_id
+                            WHERE ot.order_id = o.id
+                        ) AS tags
+                    FROM orders o
+                    JOIN orders_images oi ON o.id = oi.order_id
+                    JOIN images i ON i.id = oi.image_id
+                    WHERE oi.is_main IS TRUE
+                    {}
+                )
+                SELECT id, name, description, customer_id, execution_type, performer_id, performer_team_id, image_link, tags
+                FROM selected_orders
+                ORDER BY id DESC;
+            """
+        ).format("AND o.id < %s ORDER BY o.id DESC LIMIT %s" if paged else "")
+
+    @staticmethod
+    def get_all_orders(
+            after_id: int,
+            limit: int
+    ) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    WITH selected_orders AS (
-                        SELECT o.id AS id, o.name AS name, o.description AS description, o.customer_id AS customer_id, o.performer_id AS performer_id, i.image_link AS image_link
-                        FROM orders o
-                        JOIN orders_images oi ON o.id = oi.order_id
-                        JOIN images i ON i.id = oi.image_id
-                        WHERE oi.is_main IS TRUE
-                    )
-                    SELECT id, name, description, customer_id, performer_id, image_link
-                    FROM selected_orders;
-                """,
+                OrderAdminController._get_all_orders_query(paged=True),
+                (after_id, limit + 1),
                 is_all=True
             )
 
+    @staticmethod
+    def stream_all_orders() -> Iterator[list[dict[str, Any]]]:
+        return stream_batches(OrderAdminController._get_all_orders_query())
+
     @staticmethod
     def get_order_by_id(order_id: int) -> dict[str, Any] | None:
         with PostgresDatabase() as db:
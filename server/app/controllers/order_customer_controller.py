@@ -7,8 +7,12 @@ from server.app.models.team_model import Team
 
 class OrderCustomerController:
     @staticmethod
-    def get_all_customer_orders(customer_id: int) -> list[dict[str, Any]] | dict[str, Any] | None:
-        return Order.get_orders_by_customer(customer_id)
+    def get_all_customer_orders(
+            customer_id: int,
+            after_id: int,
+            limit: int
+    ) -> list[dict[str, Any]] | dict[str, Any] | None:
+        return Order.get_orders_by_customer(customer_id, after_id, limit)
 
     @staticmethod
     def get_all_customer_performers(
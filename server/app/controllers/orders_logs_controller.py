@@ -5,7 +5,7 @@ from server.app.utils.logger import logger
 
 from psycopg2.extras import RealDictCursor
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, get_unit_of_work
 
 
 executor = ThreadPoolExecutor(max_workers=5)
@@ -67,9 +67,15 @@ class OrdersLogsController:
 
     @staticmethod
     def log_order_async(log_type: str, order_data: dict[str, Any], percent: int | None = None):
+        unit_of_work = get_unit_of_work()
+
         def safe_call(fn, *args, **kwargs):
             try:
-                fn(*args, **kwargs)
+                if unit_of_work is not None:
+                    with unit_of_work.savepoint():
+                        fn(*args, **kwargs)
+                else:
+                    fn(*args, **kwargs)
             except Exception as e:
                 logger.error(
                     "Error was occured: \n%s\x1b[31m" \
@@ -78,7 +84,13 @@ class OrdersLogsController:
                     traceback.format_exc()
                 )
 
+        def submit(fn, *args):
+            if unit_of_work is not None:
+                safe_call(fn, *args)
+            else:
+                executor.submit(safe_call, fn, *args)
+
         if log_type == "created":
-            executor.submit(safe_call, OrdersLogsController.log_created_order, order_data)
+            submit(OrdersLogsController.log_created_order, order_data)
         elif log_type == "updated":
-            executor.submit(safe_call, OrdersLogsController.log_updated_order, order_data, percent)
+            submit(OrdersLogsController.log_updated_order, order_data, percent)
@@ -1,16 +1,26 @@
-from typing import Any
+from typing import Any, Iterator
 
 from server.app.database.database import PostgresDatabase
-from server.app.models.payment_model import Payment
-from server.app.utils.crypto import encrypt_data, get_masked_payment
+from server.app.models.payment_model import Payment, AsyncPayment
+from server.app.utils.crypto import async_protect_payment, get_masked_payment, get_masked_payments, protect_payment
+from server.app.utils.executor import crypto_executor
 
 
 class PaymentController:
     @staticmethod
     def create_payment(user_id: int, payment_data: str) -> dict[str, Any] | None:
-        encrypted_payment = encrypt_data(payment_data)
+        protected_payment = crypto_executor.call(protect_payment, payment_data)
 
-        payment = Payment.create_payment(user_id=user_id, payment=encrypted_payment)
+        payment = Payment.create_payment(user_id=user_id, **protected_payment)
+        payment = get_masked_payment(payment)
+
+        return payment
+
+    @staticmethod
+    async def async_create_payment(user_id: int, payment_data: str) -> dict[str, Any] | None:
+        protected_payment = await async_protect_payment(payment_data)
+
+        payment = await AsyncPayment.create_payment(user_id=user_id, **protected_payment)
         payment = get_masked_payment(payment)
 
         return payment
@@ -27,17 +37,29 @@ class PaymentController:
     def get_user_payments(user_id: int) -> list[dict[str, str]]:
         payments = Payment.get_payments_by_user(user_id)
 
-        return list(map(get_masked_payment, payments))
+        return get_masked_payments(payments)
 
     @staticmethod
     def delete_payment(payment_id: int) -> None:
         Payment.delete_record_by_id(payment_id)
 
     @staticmethod
-    def get_all_users_payments():
-        payments = Payment.get_all_records()
+    def get_all_users_payments(after_id: int, limit: int):
+        payments = Payment.get_records_page(after_id, limit)
 
-        return list(map(get_masked_payment, payments))
+        return get_masked_payments(payments)
+
+    @staticmethod
+    def get_all_users_payments_unpaged() -> list[dict[str, Any]]:
+        payments = []
+        for batch in Payment.stream_all_records():
+            payments.extend(get_masked_payments(batch))
+
+        return payments
+
+    @staticmethod
+    def stream_all_users_payments() -> Iterator[list[dict[str, Any]]]:
+        return Payment.stream_all_records()
 
     @staticmethod
     def get_user_payment_details(payment_id: int) -> dict[str, Any] | None:
@@ -19,8 +19,12 @@ class ProfileFeedbackController:
         )
 
     @staticmethod
-    def get_all_user_feedback(user_id: int) -> list[ProfileFeedbackResponse] | None:
-        feedback = UserProfileFeedback.get_all_user_feedback(user_id)
+    def get_all_user_feedback(
+            user_id: int,
+            after_id: int,
+            limit: int
+    ) -> list[ProfileFeedbackResponse] | None:
+        feedback = UserProfileFeedback.get_all_user_feedback(user_id, after_id, limit)
 
         return list(map(serialize_profile_feedback, feedback))
 
@@ -43,8 +47,10 @@ class ProfileFeedbackController:
     @staticmethod
     def delete_feedback(
             user_id: int,
-            feedback_id: int
+            feedback_id: int,
+            after_id: int,
+            limit: int
     ) -> list[dict[str, Any]] | dict[str, Any] | None:
         UserProfileFeedback.delete_record_by_id(feedback_id)
 
-        return UserProfileFeedback.get_all_user_feedback(user_id)
+        return UserProfileFeedback.get_all_user_feedback(user_id, after_id, limit)
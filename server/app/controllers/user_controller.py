@@ -1,47 +1,55 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Iterator
+import asyncio
 
-from server.app.models.user_model import User
+from server.app.models.user_model import User, AsyncUser
 from server.app.models.plan_model import Plan
 from server.app.models.speciality_model import Speciality
 from server.app.models.user_model import UserPlanEnum
 from server.app.utils.auth import (
     get_password_hash,
-    create_token,
-    refresh_token,
+    async_get_password_hash,
+    async_create_token,
+    async_refresh_token,
     verify_token,
+    revoke_token,
     generate_password,
     generate_username
 )
-from server.app.utils.crypto import encrypt_data
+from server.app.utils.crypto import async_protect_payment
 from server.app.utils.auth import oauth
 from server.app.utils.exceptions import GlobalException
+from server.app.utils.executor import crypto_executor, handler_executor
 from server.app.utils.redis_client import redis_reset_passwd
+from server.app.utils.user_cache import user_principals
 from server.app.services.smtp_service import generate_code
 
 
 class UserController:
     @staticmethod
-    def create_user_customer(user_data: dict) -> dict[str, Any]:
-        user_data["password"] = get_password_hash(user_data["password"])
-        user_data["payment"] = encrypt_data(user_data["payment"])
+    async def create_user_customer(user_data: dict) -> dict[str, Any]:
+        user_data["password"], protected_payment = await asyncio.gather(
+            async_get_password_hash(user_data["password"]),
+            async_protect_payment(user_data["payment"])
+        )
+        user_data.update(protected_payment)
 
-        return User.create_user_customer(user_data)
+        return await handler_executor.run(User.create_user_customer, user_data)
 
     @staticmethod
-    def create_user_performer(user_data: dict) -> dict[str, Any]:
-        user_data["password"] = get_password_hash(user_data["password"])
+    async def create_user_performer(user_data: dict) -> dict[str, Any]:
+        user_data["password"] = await async_get_password_hash(user_data["password"])
 
-        return User.create_user_performer(user_data)
+        return await handler_executor.run(User.create_user_performer, user_data)
 
     @staticmethod
-    def authenticate_user(user_data: dict) -> dict[str, Any]:
+    async def authenticate_user(user_data: dict) -> dict[str, Any]:
         user = dict()
 
         if user_data["username"]:
-            user = User.get_user_by_field("username", user_data["username"])
+            user = await AsyncUser.get_user_by_field("username", user_data["username"])
         elif user_data["email"]:
-            user = User.get_user_by_field("email", user_data["email"])
+            user = await AsyncUser.get_user_by_field("email", user_data["email"])
 
         user_data_tokenize = {
             "first_name": user["first_name"],
@@ -52,8 +60,10 @@ class UserController:
             "plan_name": user["plan_name"],
         }
 
-        access_tkn = create_token(user_data_tokenize, timedelta(minutes=3000))
-        refresh_tkn = create_token(user_data_tokenize, timedelta(days=7))
+        access_tkn, refresh_tkn = await asyncio.gather(
+            async_create_token(user_data_tokenize, timedelta(minutes=3000)),
+            async_create_token(user_data_tokenize, timedelta(days=7))
+        )
 
         return {
             "access_token": access_tkn,
@@ -66,7 +76,9 @@ class UserController:
         user_info = await oauth.google.parse_id_token(token, None)
         plan_enum = UserPlanEnum(plan) if plan else None
 
-        if not User.get_user_by_field("email", user_info.get("email")):
+        user = await AsyncUser.get_user_by_field("email", user_info.get("email"))
+
+        if not user:
             if not plan:
                 GlobalException.CustomHTTPException.raise_exception(
                     status_code=400,
@@ -82,16 +94,15 @@ class UserController:
                 ),
                 "email": user_info.get("email"),
                 "phone_number": None,
-                "password": generate_password()
+                "password": await crypto_executor.run(generate_password)
             }
 
-            user = User.create_user(
+            user = await handler_executor.run(
+                User.create_user,
                 user_data=user_data,
                 user_plan=plan_enum
             )
-        else:
-            user = User.get_user_by_field("email", user_info.get("email"))
-        
+
         user_data_tokenize = {
             "first_name": user["first_name"],
             "last_name": user["last_name"],
@@ -101,8 +112,10 @@ class UserController:
             "plan_name": user["plan_name"],
         }
 
-        access_tkn = create_token(user_data_tokenize, timedelta(minutes=3000))
-        refresh_tkn = create_token(user_data_tokenize, timedelta(days=7))
+        access_tkn, refresh_tkn = await asyncio.gather(
+            async_create_token(user_data_tokenize, timedelta(minutes=3000)),
+            async_create_token(user_data_tokenize, timedelta(days=7))
+        )
 
         return {
             "access_token": access_tkn,
@@ -155,23 +168,34 @@ class UserController:
         
             return
         
-        hashed_password = get_password_hash(confirm_data["password"])
+        hashed_password = crypto_executor.call(get_password_hash, confirm_data["password"])
         redis_reset_passwd.hdel("passwd_reset", confirm_data["email"])
         
         return User.update_user(user_id=user["id"], user_data={"password": hashed_password})
 
     @staticmethod
-    def refresh_bearer_token(refresh_tkn: str) -> dict[str, Any]:
-        return refresh_token(refresh_tkn)
+    async def refresh_bearer_token(refresh_tkn: str) -> dict[str, Any]:
+        return await async_refresh_token(refresh_tkn)
+
+    @staticmethod
+    def logout(access_tkn: str, refresh_tkn: str | None) -> None:
+        revoke_token(access_tkn)
+        if refresh_tkn:
+            revoke_token(refresh_tkn)
 
     @staticmethod
     def get_user(user_id: int) -> dict[str, Any]:
         return User.get_user_by_id(user_id)
 
     @staticmethod
-    def get_user_by_token(access_tkn: str) -> dict[str, Any]:
+    async def get_user_by_token(access_tkn: str) -> dict[str, Any]:
         username = verify_token(access_tkn)["content"]["username"]
-        user = User.get_user_by_field_extended("username", username)
+
+        user = user_principals.get(username)
+        if user is None:
+            generation = user_principals.generation
+            user = await AsyncUser.get_user_by_field_extended("username", username)
+            user_principals.put(username, user, generation)
 
         return user
 
@@ -184,9 +208,17 @@ class UserController:
     @staticmethod
     def get_all_users(
             plan: str,
-            limit: int = 0
+            after_id: int,
+            limit: int
     ) -> list[dict[str, Any]]:
-        return User.get_all_users(plan, limit)
+        return User.get_all_users(plan, after_id, limit)
+
+    @staticmethod
+    def stream_all_users(
+            plan: str,
+            limit: int = 0
+    ) -> Iterator[list[dict[str, Any]]]:
+        return User.stream_all_users(plan, limit)
 
     @staticmethod
     def update_user(
@@ -194,7 +226,8 @@ class UserController:
         updated_user_data: dict[str, Any]
     ) -> dict[str, Any]:
         if "password" in updated_user_data:
-            updated_user_data["password"] = get_password_hash(
+            updated_user_data["password"] = crypto_executor.call(
+                get_password_hash,
                 updated_user_data["password"]
             )
 
@@ -206,7 +239,8 @@ class UserController:
         updated_user_data: dict[str, Any]
     ) -> dict[str, Any]:
         if "password" in updated_user_data:
-            updated_user_data["password"] = get_password_hash(
+            updated_user_data["password"] = crypto_executor.call(
+                get_password_hash,
                 updated_user_data["password"]
             )
 
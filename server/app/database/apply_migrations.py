@@ -1,15 +1,19 @@
-import os
+import argparse
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.migration_engine import MigrationEngine
 
 
-def apply_migrations():
-   with PostgresDatabase() as db:
-       for filename in sorted(os.listdir("sql")):
-            if filename.endswith("_up.sql"):
-                with open(os.path.join("sql", filename), "r") as file:
-                    db.execute_query(file.read())
+def apply_migrations(baseline: str | None = None):
+    return MigrationEngine.apply(baseline=baseline)
 
 
 if __name__ == "__main__":
-    apply_migrations()
+    parser = argparse.ArgumentParser(description="Apply pending migrations from database/sql")
+    parser.add_argument(
+        "--baseline",
+        help="record migrations up to this version as applied without running them "
+             "(for databases created before schema_migrations existed)"
+    )
+    args = parser.parse_args()
+
+    apply_migrations(baseline=args.baseline)
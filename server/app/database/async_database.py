@@ -0,0 +1,104 @@
+import asyncio
+
+from psycopg import AsyncConnection
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg.sql import Composed
+from psycopg_pool import AsyncConnectionPool
+
+from server.app.database.database import get_connection_params, get_pool_config
+from server.app.utils.exceptions import GlobalException
+
+
+_async_pool: AsyncConnectionPool | None = None
+_async_pool_lock = asyncio.Lock()
+
+
+async def _configure_connection(connection: AsyncConnection) -> None:
+    connection.prepared_max = get_pool_config()["prepared_statement_cache_size"]
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    global _async_pool
+
+    if _async_pool is None:
+        async with _async_pool_lock:
+            if _async_pool is None:
+                pool_config = get_pool_config()
+                pool = AsyncConnectionPool(
+                    conninfo=make_conninfo(**get_connection_params()),
+                    min_size=pool_config["min_size"],
+                    max_size=pool_config["max_size"],
+                    max_idle=pool_config["max_idle_seconds"],
+                    max_lifetime=pool_config["max_lifetime_seconds"],
+                    timeout=pool_config["checkout_timeout_seconds"],
+                    kwargs={
+                        "row_factory": dict_row,
+                        "autocommit": False,
+                        "prepare_threshold": pool_config["prepare_threshold"],
+                    },
+                    configure=_configure_connection,
+                    check=AsyncConnectionPool.check_connection,
+                    name="async-primary",
+                    open=False,
+                )
+                await pool.open()
+                _async_pool = pool
+    return _async_pool
+
+
+async def close_async_pool() -> None:
+    global _async_pool
+
+    async with _async_pool_lock:
+        if _async_pool is not None:
+            await _async_pool.close()
+            _async_pool = None
+
+
+def get_async_pool_stats() -> dict:
+    return _async_pool.get_stats() if _async_pool is not None else {}
+
+
+class AsyncPostgresDatabase:
+    def __init__(self, on_commit: bool = False):
+        self.connection: AsyncConnection | None = None
+        self.on_commit = on_commit
+
+    async def __aenter__(self):
+        try:
+            pool = await get_async_pool()
+            self.connection = await pool.getconn()
+        except Exception as e:
+            GlobalException.CustomHTTPException.raise_exception(
+                status_code=500,
+                detail=f"Could not connect to PostgreSQL: {e}"
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None and self.on_commit:
+                await self.connection.commit()
+            else:
+                await self.connection.rollback()
+        finally:
+            await _async_pool.putconn(self.connection)
+            self.connection = None
+
+    async def execute_query(self, query: str | Composed, params: tuple | None = None) -> int:
+        async with self.connection.cursor() as cursor:
+            await cursor.execute(query, params)
+            return cursor.rowcount
+
+    async def fetch(
+            self,
+            query: str | Composed,
+            params: tuple | None = None,
+            is_all: bool = False,
+            prepared: bool = False
+    ) -> list[dict] | dict[str, None] | None:
+        async with self.connection.cursor() as cursor:
+            await cursor.execute(query, params, prepare=True if prepared else None)
+            result = await cursor.fetchall() if is_all else await cursor.fetchone()
+            return result if result else {} if not is_all else []
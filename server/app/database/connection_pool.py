@@ -0,0 +1,363 @@
+from collections import OrderedDict, deque
+from typing import Any
+import hashlib
+import re
+import threading
+import time
+
+import psycopg2
+from psycopg2.extensions import (
+    connection as PgConnection,
+    cursor as PgCursor,
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_UNKNOWN,
+)
+from psycopg2.pool import PoolError
+from psycopg2.sql import Composable
+
+from server.app.database.query_metrics import query_metrics
+from server.app.utils.logger import logger
+
+
+DEFAULT_POOL_CONFIG = {
+    "min_size": 2,
+    "max_size": 20,
+    "max_idle_seconds": 300,
+    "max_lifetime_seconds": 3600,
+    "health_check_after_seconds": 30,
+    "checkout_timeout_seconds": 10,
+    "prepared_statement_cache_size": 64,
+    "prepare_threshold": 5,
+}
+
+_POSITIONAL_PLACEHOLDER_RE = re.compile(r"%%|%s")
+
+
+def to_positional_placeholders(query: str) -> tuple[str, int]:
+    count = 0
+
+    def replace(match: re.Match) -> str:
+        nonlocal count
+        if match.group(0) == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _POSITIONAL_PLACEHOLDER_RE.sub(replace, query), count
+
+
+class TimedCursorMixin:
+    def execute(self, query, vars=None):
+        started_at = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._record(query, vars, time.perf_counter() - started_at)
+
+    def executemany(self, query, vars_list):
+        started_at = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self._record(query, None, time.perf_counter() - started_at)
+
+    def _record(self, query, vars, seconds: float) -> None:
+        if isinstance(query, Composable):
+            query = query.as_string(self.connection)
+        elif isinstance(query, bytes):
+            query = query.decode()
+
+        prepared = self.connection.prepared_statement_names.get(query.split(" ", 2)[1]) \
+            if query.startswith("EXECUTE stmt_") else None
+        if prepared is not None:
+            query = prepared
+
+        query_metrics.record(self.connection, query, vars, seconds)
+
+
+_timed_cursor_classes: dict[type, type] = {}
+
+
+def timed_cursor_class(cursor_class: type) -> type:
+    timed_class = _timed_cursor_classes.get(cursor_class)
+
+    if timed_class is None:
+        timed_class = type(f"Timed{cursor_class.__name__}", (TimedCursorMixin, cursor_class), {})
+        _timed_cursor_classes[cursor_class] = timed_class
+
+    return timed_class
+
+
+class PooledConnection(PgConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.pool: "ConnectionPool | None" = None
+        self.prepared_statements: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self.prepared_statement_names: dict[str, str] = {}
+        self.prepared_statement_cache_size = DEFAULT_POOL_CONFIG["prepared_statement_cache_size"]
+
+    def cursor(self, *args, **kwargs):
+        kwargs["cursor_factory"] = timed_cursor_class(
+            kwargs.get("cursor_factory") or self.cursor_factory or PgCursor
+        )
+        return super().cursor(*args, **kwargs)
+
+    def prepare(self, query: str) -> tuple[str, int]:
+        statement = self.prepared_statements.get(query)
+
+        if statement is not None:
+            self.prepared_statements.move_to_end(query)
+            self._count("prepared_hits")
+            return statement
+
+        name = "stmt_" + hashlib.sha1(query.encode()).hexdigest()[:24]
+        positional_query, params_count = to_positional_placeholders(query)
+
+        with self.cursor() as cursor:
+            cursor.execute(f"PREPARE {name} AS {positional_query}")
+
+        statement = (name, params_count)
+        self.prepared_statements[query] = statement
+        self.prepared_statement_names[name] = query
+        self._count("prepared_misses")
+
+        while len(self.prepared_statements) > self.prepared_statement_cache_size:
+            _, (evicted_name, _) = self.prepared_statements.popitem(last=False)
+            self.prepared_statement_names.pop(evicted_name, None)
+            with self.cursor() as cursor:
+                cursor.execute(f"DEALLOCATE {evicted_name}")
+            self._count("prepared_evictions")
+
+        return statement
+
+    def _count(self, counter: str) -> None:
+        if self.pool is not None:
+            self.pool.count(counter)
+
+
+class ConnectionPool:
+    def __init__(
+            self,
+            connection_params: dict[str, Any],
+            min_size: int = DEFAULT_POOL_CONFIG["min_size"],
+            max_size: int = DEFAULT_POOL_CONFIG["max_size"],
+            max_idle_seconds: float = DEFAULT_POOL_CONFIG["max_idle_seconds"],
+            max_lifetime_seconds: float = DEFAULT_POOL_CONFIG["max_lifetime_seconds"],
+            health_check_after_seconds: float = DEFAULT_POOL_CONFIG["health_check_after_seconds"],
+            checkout_timeout_seconds: float = DEFAULT_POOL_CONFIG["checkout_timeout_seconds"],
+            prepared_statement_cache_size: int = DEFAULT_POOL_CONFIG["prepared_statement_cache_size"],
+            name: str = "primary",
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size. Expected 0 <= min_size <= max_size and max_size >= 1")
+
+        self.name = name
+        self.connection_params = connection_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self.health_check_after_seconds = health_check_after_seconds
+        self.checkout_timeout_seconds = checkout_timeout_seconds
+        self.prepared_statement_cache_size = prepared_statement_cache_size
+
+        self._idle: deque[PooledConnection] = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._counters = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "failed_health_checks": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "prepared_hits": 0,
+            "prepared_misses": 0,
+            "prepared_evictions": 0,
+        }
+
+    def open(self) -> "ConnectionPool":
+        for _ in range(self.min_size):
+            with self._condition:
+                if self._size >= self.min_size:
+                    break
+                self._size += 1
+            try:
+                connection = self._connect()
+            except Exception:
+                self._release_slot()
+                raise
+            self.putconn(connection)
+
+        logger.info(
+            "Opened PostgreSQL connection pool \x1b[1m%s\x1b[0m (min=%s, max=%s)",
+            self.name,
+            self.min_size,
+            self.max_size
+        )
+        return self
+
+    def getconn(self) -> PooledConnection:
+        started_at = time.monotonic()
+
+        while True:
+            connection = self._checkout(started_at)
+
+            if connection is None:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+            elif not self._is_healthy(connection):
+                self._discard(connection)
+                continue
+
+            with self._condition:
+                self._counters["checkouts"] += 1
+                self._counters["wait_seconds_total"] += time.monotonic() - started_at
+
+            return connection
+
+    def putconn(self, connection: PooledConnection, close: bool = False) -> None:
+        if close or self._closed or connection.closed:
+            self._discard(connection)
+            return
+
+        status = connection.info.transaction_status
+
+        if status == TRANSACTION_STATUS_UNKNOWN:
+            self._discard(connection)
+            return
+        if status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                self._discard(connection)
+                return
+
+        connection.last_used_at = time.monotonic()
+
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+        self.recycle_idle()
+
+    def recycle_idle(self) -> int:
+        now = time.monotonic()
+        expired = []
+
+        with self._condition:
+            while self._idle and self._size - len(expired) > self.min_size:
+                oldest = self._idle[0]
+                if now - oldest.last_used_at < self.max_idle_seconds:
+                    break
+                expired.append(self._idle.popleft())
+
+        for connection in expired:
+            self._discard(connection, recycled=True)
+
+        return len(expired)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._discard(connection)
+
+        logger.info("Closed PostgreSQL connection pool \x1b[1m%s\x1b[0m", self.name)
+
+    def count(self, counter: str) -> None:
+        with self._condition:
+            self._counters[counter] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "name": self.name,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                **self._counters,
+            }
+
+    def _checkout(self, started_at: float) -> PooledConnection | None:
+        deadline = started_at + self.checkout_timeout_seconds
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolError(f"Connection pool '{self.name}' is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolError(
+                        f"Timed out after {self.checkout_timeout_seconds}s waiting for a connection "
+                        f"from pool '{self.name}'"
+                    )
+
+                self._condition.wait(remaining)
+
+    def _connect(self) -> PooledConnection:
+        connection = psycopg2.connect(**self.connection_params, connection_factory=PooledConnection)
+        connection.autocommit = False
+        connection.pool = self
+        connection.prepared_statement_cache_size = self.prepared_statement_cache_size
+
+        with self._condition:
+            self._counters["created"] += 1
+
+        return connection
+
+    def _is_healthy(self, connection: PooledConnection) -> bool:
+        now = time.monotonic()
+
+        if connection.closed or now - connection.created_at > self.max_lifetime_seconds:
+            return False
+        if now - connection.last_used_at < self.health_check_after_seconds:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            with self._condition:
+                self._counters["failed_health_checks"] += 1
+            logger.warning(
+                "Discarded broken connection from PostgreSQL connection pool \x1b[1m%s\x1b[0m",
+                self.name
+            )
+            return False
+
+    def _discard(self, connection: PooledConnection, recycled: bool = False) -> None:
+        try:
+            if not connection.closed:
+                connection.close()
+        finally:
+            self._release_slot(recycled=recycled)
+
+    def _release_slot(self, recycled: bool = False) -> None:
+        with self._condition:
+            self._size -= 1
+            if recycled:
+                self._counters["recycled"] += 1
+            self._condition.notify()
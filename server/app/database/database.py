@@ -1,29 +1,299 @@
+import csv
+import io
+import itertools
 import json
 import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator
+from uuid import uuid4
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, execute_values
 from psycopg2.sql import Composed
 
+from server.app.database.connection_pool import ConnectionPool, PooledConnection, DEFAULT_POOL_CONFIG
+from server.app.database.query_metrics import query_metrics
+from server.app.database.read_your_writes import is_pinned_to_primary, pin_to_primary
 from server.app.utils.exceptions import GlobalException
+from server.app.utils.logger import logger
 
 
+CONFIG_SECTIONS = {"pool", "replicas", "read_your_writes_seconds", "slow_query"}
+ASYNC_ONLY_POOL_CONFIG_KEYS = {"prepare_threshold"}
+DEFAULT_READ_YOUR_WRITES_SECONDS = 5
+STREAM_BATCH_SIZE = 500
+COPY_BATCH_SIZE = 50_000
+COPY_NULL = "\\N"
+
+_pool: ConnectionPool | None = None
+_replica_pools: list[ConnectionPool] | None = None
+_replica_counter = itertools.count()
+_pool_lock = threading.Lock()
+
+_current_unit_of_work: ContextVar["UnitOfWork | None"] = ContextVar("current_unit_of_work", default=None)
+
+
+@lru_cache(maxsize=1)
 def load_config() -> dict:
     config_path = os.path.join(os.path.dirname(__file__), "config.json")
     with open(config_path) as config_file:
         return json.load(config_file)
 
 
+def get_connection_params() -> dict:
+    return {key: value for key, value in load_config().items() if key not in CONFIG_SECTIONS}
+
+
+def get_pool_config() -> dict:
+    return {**DEFAULT_POOL_CONFIG, **load_config().get("pool", {})}
+
+
+def get_read_your_writes_seconds() -> float:
+    return load_config().get("read_your_writes_seconds", DEFAULT_READ_YOUR_WRITES_SECONDS)
+
+
+def _get_sync_pool_config() -> dict:
+    return {key: value for key, value in get_pool_config().items() if key not in ASYNC_ONLY_POOL_CONFIG_KEYS}
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                query_metrics.configure(**load_config().get("slow_query", {}))
+                _pool = ConnectionPool(get_connection_params(), **_get_sync_pool_config()).open()
+    return _pool
+
+
+def get_replica_pools() -> list[ConnectionPool]:
+    global _replica_pools
+
+    if _replica_pools is None:
+        with _pool_lock:
+            if _replica_pools is None:
+                _replica_pools = [
+                    ConnectionPool(
+                        {**get_connection_params(), **replica_params},
+                        **_get_sync_pool_config(),
+                        name=f"replica-{index}"
+                    )
+                    for index, replica_params in enumerate(load_config().get("replicas", []))
+                ]
+    return _replica_pools
+
+
+def checkout_connection(write: bool) -> PooledConnection:
+    replica_pools = get_replica_pools()
+
+    if write or not replica_pools or is_pinned_to_primary():
+        return get_pool().getconn()
+
+    replica_pool = replica_pools[next(_replica_counter) % len(replica_pools)]
+
+    try:
+        return replica_pool.getconn()
+    except Exception as e:
+        logger.warning(
+            "Could not read from PostgreSQL replica pool \x1b[1m%s\x1b[0m, falling back to primary: %s",
+            replica_pool.name,
+            e
+        )
+        return get_pool().getconn()
+
+
+def release_connection(connection: PooledConnection) -> None:
+    (connection.pool or get_pool()).putconn(connection)
+
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def close_pool() -> None:
+    global _pool, _replica_pools
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        for replica_pool in _replica_pools or []:
+            replica_pool.close()
+        _replica_pools = None
+
+
+def get_pool_stats() -> dict:
+    return _pool.stats() if _pool is not None else {}
+
+
+def get_replica_pools_stats() -> list[dict]:
+    return [replica_pool.stats() for replica_pool in _replica_pools or []]
+
+
+def stream_batches(
+        query: str | Composed,
+        params: tuple | None = None,
+        batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[list[dict[str, Any]]]:
+    connection = checkout_connection(write=False)
+
+    try:
+        with connection.cursor(name=f"stream_{uuid4().hex}", cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+    finally:
+        release_connection(connection)
+
+
+class UnitOfWork:
+    def __init__(self):
+        self.connection: PooledConnection | None = None
+        self.read_connection: PooledConnection | None = None
+        self.rollback_only = False
+        self.wrote = False
+        self.identity_map: dict[tuple[str, Any], dict[str, Any]] = {}
+        self._savepoints = 0
+        self._after_commit: list[Callable[[], None]] = []
+
+    def acquire(self, write: bool = True) -> PooledConnection:
+        if self.connection is not None:
+            self.wrote = self.wrote or write
+            return self.connection
+
+        if not write:
+            if self.read_connection is None:
+                self.read_connection = checkout_connection(write=False)
+            return self.read_connection
+
+        if self.read_connection is not None and self.read_connection.pool is get_pool():
+            self.connection, self.read_connection = self.read_connection, None
+        else:
+            self.connection = get_pool().getconn()
+
+        self.wrote = True
+        return self.connection
+
+    def mark_rollback_only(self) -> None:
+        self.rollback_only = True
+
+    def get_identity(self, table_name: str, record_id: Any) -> dict[str, Any] | None:
+        record = self.identity_map.get((table_name, record_id))
+        return dict(record) if record is not None else None
+
+    def remember_identity(self, table_name: str, record_id: Any, record: dict[str, Any]) -> None:
+        self.identity_map[(table_name, record_id)] = dict(record)
+
+    def clear_identities(self) -> None:
+        self.identity_map.clear()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
+
+    @contextmanager
+    def savepoint(self) -> Iterator[PooledConnection]:
+        connection = self.acquire()
+        rollback_only = self.rollback_only
+        self._savepoints += 1
+        name = f"uow_savepoint_{self._savepoints}"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield connection
+        except Exception:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            self.rollback_only = rollback_only
+            raise
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(f"RELEASE SAVEPOINT {name}")
+        finally:
+            self._savepoints -= 1
+
+    def complete(self, success: bool) -> None:
+        if self.read_connection is not None:
+            release_connection(self.read_connection)
+            self.read_connection = None
+
+        callbacks, self._after_commit = self._after_commit, []
+
+        if self.connection is None:
+            return
+        try:
+            if success and not self.rollback_only:
+                self.connection.commit()
+                if self.wrote:
+                    pin_to_primary(get_read_your_writes_seconds())
+            else:
+                self.connection.rollback()
+                callbacks = []
+        finally:
+            release_connection(self.connection)
+            self.connection = None
+
+        token = set_unit_of_work(None)
+        try:
+            for callback in callbacks:
+                callback()
+        finally:
+            reset_unit_of_work(token)
+
+
+def get_unit_of_work() -> UnitOfWork | None:
+    return _current_unit_of_work.get()
+
+
+def set_unit_of_work(unit_of_work: UnitOfWork | None):
+    return _current_unit_of_work.set(unit_of_work)
+
+
+def reset_unit_of_work(token) -> None:
+    _current_unit_of_work.reset(token)
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    unit_of_work = get_unit_of_work()
+
+    if unit_of_work is not None:
+        unit_of_work.after_commit(callback)
+    else:
+        callback()
+
+
 class PostgresDatabase:
     def __init__(self, on_commit: bool = False):
-        self.config = load_config()
         self.connection = None
         self.on_commit = on_commit
+        self.unit_of_work: UnitOfWork | None = None
+        self._after_commit: list[Callable[[], None]] = []
 
     def __enter__(self):
+        self.unit_of_work = get_unit_of_work()
+
         try:
-            self.connection = psycopg2.connect(**self.config)
-            self.connection.autocommit = False
+            if self.unit_of_work is not None:
+                self.connection = self.unit_of_work.acquire(write=self.on_commit)
+                if self.on_commit:
+                    self.unit_of_work.clear_identities()
+            else:
+                self.connection = checkout_connection(write=self.on_commit)
         except Exception as e:
              GlobalException.CustomHTTPException.raise_exception(
                  status_code=500,
@@ -32,19 +302,115 @@ class PostgresDatabase:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if exc_type is not None:
-            self.connection.rollback()
-        if self.on_commit:
-            self.connection.commit()
-        self.connection.close()
+        if self.unit_of_work is not None:
+            if exc_type is not None:
+                self.unit_of_work.mark_rollback_only()
+                self.unit_of_work.clear_identities()
+            self.connection = None
+            self.unit_of_work = None
+            return
+
+        callbacks, self._after_commit = self._after_commit, []
+        try:
+            if exc_type is not None:
+                self.connection.rollback()
+                callbacks = []
+            elif self.on_commit:
+                self.connection.commit()
+                pin_to_primary(get_read_your_writes_seconds())
+        finally:
+            release_connection(self.connection)
+            self.connection = None
+
+        for callback in callbacks:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        if self.unit_of_work is not None:
+            self.unit_of_work.after_commit(callback)
+        else:
+            self._after_commit.append(callback)
 
     def execute_query(self, query: str | Composed, params: tuple | None = None) -> int:
         with self.connection.cursor() as cursor:
             cursor.execute(query, params)
             return cursor.rowcount
 
-    def fetch(self, query: str | Composed, params: tuple | None = None, is_all: bool = False) -> list[dict] | dict[str,None] | None:
+    def fetch(
+            self,
+            query: str | Composed,
+            params: tuple | None = None,
+            is_all: bool = False,
+            prepared: bool = False
+    ) -> list[dict] | dict[str,None] | None:
+        if prepared:
+            query, params = self._prepare(query, params)
+
         with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
             cursor.execute(query, params)
             result = cursor.fetchall() if is_all else cursor.fetchone()
             return result if result else {} if not is_all else []
+
+    def bulk_insert(
+            self,
+            table_name: str,
+            columns: tuple[str, ...],
+            rows: list[tuple],
+            returning: tuple[str, ...] = ()
+    ) -> list[dict[str, Any]]:
+        if not rows:
+            return []
+
+        query = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
+        if returning:
+            query += sql.SQL(" RETURNING {}").format(sql.SQL(", ").join(map(sql.Identifier, returning)))
+
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            result = execute_values(cursor, query, rows, page_size=len(rows), fetch=bool(returning))
+
+        return result or []
+
+    def copy_rows(
+            self,
+            table_name: str,
+            columns: tuple[str, ...],
+            rows: Iterable[tuple],
+            batch_size: int = COPY_BATCH_SIZE
+    ) -> int:
+        query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL {})").format(
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            sql.Literal(COPY_NULL)
+        ).as_string(self.connection)
+
+        copied = 0
+        rows = iter(rows)
+
+        with self.connection.cursor() as cursor:
+            while batch := list(itertools.islice(rows, batch_size)):
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                writer.writerows(tuple(_copy_value(value) for value in row) for row in batch)
+                buffer.seek(0)
+
+                cursor.copy_expert(query, buffer)
+                copied += len(batch)
+
+        return copied
+
+    def _prepare(self, query: str | Composed, params: tuple | None) -> tuple[str, tuple]:
+        if isinstance(query, Composed):
+            query = query.as_string(self.connection)
+
+        name, params_count = self.connection.prepare(query)
+        params = tuple(params or ())
+
+        if len(params) != params_count:
+            raise ValueError(f"Prepared statement expects {params_count} parameters, got {len(params)}")
+        if not params:
+            return f"EXECUTE {name}", params
+
+        return f"EXECUTE {name} ({', '.join(['%s'] * params_count)})", params
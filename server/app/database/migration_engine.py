@@ -0,0 +1,197 @@
+from pathlib import Path
+from typing import Any, Callable
+import hashlib
+import re
+import time
+
+import psycopg2
+
+from server.app.database.database import get_connection_params
+from server.app.utils.logger import logger
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "sql"
+MIGRATIONS_LOCK_KEY = 7_310_412_028
+NO_TRANSACTION_MARKER = "-- migration: no-transaction"
+
+_FILENAME_RE = re.compile(r"^(?P<version>\d+)_(?P<name>.+)_(?P<direction>up|down)\.sql$")
+_STATEMENT_END_RE = re.compile(r";[ \t]*(?:\n|$)")
+
+
+class MigrationError(Exception):
+    pass
+
+
+class MigrationEngine:
+    @staticmethod
+    def discover(directory: Path = MIGRATIONS_DIR) -> list[dict[str, Any]]:
+        migrations: dict[str, dict[str, Any]] = {}
+
+        for path in sorted(directory.glob("*.sql")):
+            match = _FILENAME_RE.match(path.name)
+            if not match:
+                raise MigrationError(f"Unexpected migration file name: {path.name}")
+
+            migration = migrations.setdefault(
+                match["version"],
+                {"version": match["version"], "name": match["name"], "up": None, "down": None}
+            )
+            if migration["name"] != match["name"]:
+                raise MigrationError(f"Migration version {match['version']} is used by more than one migration")
+            migration[match["direction"]] = path
+
+        for migration in migrations.values():
+            if migration["up"] is None:
+                raise MigrationError(f"Migration {migration['version']}_{migration['name']} has no _up.sql file")
+            migration["checksum"] = hashlib.sha256(migration["up"].read_bytes()).hexdigest()
+
+        return [migrations[version] for version in sorted(migrations)]
+
+    @staticmethod
+    def connect():
+        connection = psycopg2.connect(**get_connection_params())
+        connection.autocommit = True
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATIONS_LOCK_KEY, ))
+            cursor.execute(
+                """
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version VARCHAR(32) PRIMARY KEY,
+                        name VARCHAR(256) NOT NULL,
+                        checksum CHAR(64) NOT NULL,
+                        execution_ms INTEGER NOT NULL,
+                        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    )
+                """
+            )
+        return connection
+
+    @staticmethod
+    def close(connection) -> None:
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATIONS_LOCK_KEY, ))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def get_applied(connection) -> dict[str, str]:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT version, checksum FROM schema_migrations ORDER BY version")
+            return dict(cursor.fetchall())
+
+    @staticmethod
+    def is_transactional(query: str) -> bool:
+        return NO_TRANSACTION_MARKER not in query.lower()
+
+    @staticmethod
+    def split_statements(query: str) -> list[str]:
+        return [statement.strip() for statement in _STATEMENT_END_RE.split(query) if statement.strip()]
+
+    @staticmethod
+    def _run(connection, query: str, record: Callable) -> None:
+        if not MigrationEngine.is_transactional(query):
+            with connection.cursor() as cursor:
+                for statement in MigrationEngine.split_statements(query):
+                    cursor.execute(statement)
+                record(cursor)
+            return
+
+        connection.autocommit = False
+        try:
+            with connection.cursor() as cursor:
+                if query.strip():
+                    cursor.execute(query)
+                record(cursor)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.autocommit = True
+
+    @staticmethod
+    def apply(baseline: str | None = None) -> list[dict[str, Any]]:
+        migrations = MigrationEngine.discover()
+        applied_migrations = []
+        connection = MigrationEngine.connect()
+
+        try:
+            applied = MigrationEngine.get_applied(connection)
+
+            for migration in migrations:
+                label = f"{migration['version']}_{migration['name']}"
+
+                if migration["version"] in applied:
+                    if applied[migration["version"]] != migration["checksum"]:
+                        raise MigrationError(f"Migration {label} was changed after it had been applied")
+                    continue
+
+                is_baseline = baseline is not None and migration["version"] <= baseline
+                started_at = time.monotonic()
+
+                def record(cursor):
+                    cursor.execute(
+                        """
+                            INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+                            VALUES (%s, %s, %s, %s)
+                        """,
+                        (
+                            migration["version"],
+                            migration["name"],
+                            migration["checksum"],
+                            int((time.monotonic() - started_at) * 1000),
+                        )
+                    )
+
+                try:
+                    MigrationEngine._run(connection, "" if is_baseline else migration["up"].read_text(), record)
+                except psycopg2.Error as e:
+                    raise MigrationError(f"Migration {label} failed: {e}") from e
+
+                if is_baseline:
+                    logger.info("Marked migration \x1b[1m%s\x1b[0m as applied", label)
+                    continue
+
+                applied_migrations.append(migration)
+                logger.info("Applied migration \x1b[1m%s\x1b[0m in %d ms", label, (time.monotonic() - started_at) * 1000)
+        finally:
+            MigrationEngine.close(connection)
+
+        return applied_migrations
+
+    @staticmethod
+    def rollback(steps: int | None = None) -> list[dict[str, Any]]:
+        migrations = {migration["version"]: migration for migration in MigrationEngine.discover()}
+        rolled_back = []
+        connection = MigrationEngine.connect()
+
+        try:
+            versions = sorted(MigrationEngine.get_applied(connection), reverse=True)
+
+            for version in versions[:steps]:
+                migration = migrations.get(version)
+                if migration is None:
+                    raise MigrationError(f"Applied migration {version} has no files in {MIGRATIONS_DIR}")
+
+                label = f"{migration['version']}_{migration['name']}"
+
+                if migration["down"] is None:
+                    logger.warning("Migration \x1b[1m%s\x1b[0m has no _down.sql file, only its record is removed", label)
+
+                try:
+                    MigrationEngine._run(
+                        connection,
+                        migration["down"].read_text() if migration["down"] else "",
+                        lambda cursor: cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (version, ))
+                    )
+                except psycopg2.Error as e:
+                    raise MigrationError(f"Rollback of {label} failed: {e}") from e
+
+                rolled_back.append(migration)
+                logger.info("Rolled back migration \x1b[1m%s\x1b[0m", label)
+        finally:
+            MigrationEngine.close(connection)
+
+        return rolled_back
@@ -0,0 +1,173 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterator
+import re
+import threading
+import time
+
+import psycopg2
+
+from server.app.utils.logger import logger
+
+
+DEFAULT_SLOW_QUERY_CONFIG = {
+    "threshold_ms": 250,
+    "explain": True,
+    "explain_interval_seconds": 60,
+    "recent_slow_queries": 50,
+}
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%s|%\(\w+\)s|\$\d+")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.I)
+_WRITE_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|TRUNCATE)\b", re.I)
+_IGNORED_RE = re.compile(r"^\s*(EXPLAIN|PREPARE|DEALLOCATE|SAVEPOINT|RELEASE|ROLLBACK)\b|^\s*SELECT 1\s*$", re.I)
+
+_captured_statements: ContextVar[list[tuple[str, Any]] | None] = ContextVar("captured_statements", default=None)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    query = _COMMENT_RE.sub(" ", query)
+    query = _STRING_RE.sub("?", query)
+    query = _PLACEHOLDER_RE.sub("?", query)
+    query = _NUMBER_RE.sub("?", query)
+    query = _WHITESPACE_RE.sub(" ", query).strip().rstrip(";").strip()
+    return _LIST_RE.sub("(?)", query)
+
+
+class QueryMetrics:
+    def __init__(self):
+        self.config = dict(DEFAULT_SLOW_QUERY_CONFIG)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._slow_queries: deque[dict[str, Any]] = deque(maxlen=self.config["recent_slow_queries"])
+        self._explained_at: dict[str, float] = {}
+        self._explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+
+    def configure(self, **config: Any) -> None:
+        with self._lock:
+            self.config = {**DEFAULT_SLOW_QUERY_CONFIG, **config}
+            self._slow_queries = deque(self._slow_queries, maxlen=self.config["recent_slow_queries"])
+
+    def record(self, connection, query: str, params: Any, seconds: float) -> None:
+        if _IGNORED_RE.match(query):
+            return
+
+        captured = _captured_statements.get()
+        if captured is not None:
+            captured.append((query, params))
+
+        key = fingerprint(query)
+        milliseconds = seconds * 1000
+        bucket = next((limit for limit in LATENCY_BUCKETS_MS if milliseconds <= limit), "inf")
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    "fingerprint": key,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "slow_calls": 0,
+                    "histogram_ms": {str(limit): 0 for limit in (*LATENCY_BUCKETS_MS, "inf")},
+                }
+            stats["calls"] += 1
+            stats["total_ms"] += milliseconds
+            stats["max_ms"] = max(stats["max_ms"], milliseconds)
+            stats["histogram_ms"][str(bucket)] += 1
+
+            is_slow = milliseconds >= self.config["threshold_ms"]
+            if is_slow:
+                stats["slow_calls"] += 1
+
+        if is_slow:
+            self._record_slow_query(connection, key, query, params, milliseconds)
+
+    def _record_slow_query(self, connection, key: str, query: str, params: Any, milliseconds: float) -> None:
+        logger.warning(
+            "\x1b[1mSLOW QUERY\x1b[0m (%.1f ms, pool %s): %s",
+            milliseconds,
+            getattr(connection.pool, "name", None),
+            key
+        )
+
+        entry = {
+            "fingerprint": key,
+            "duration_ms": round(milliseconds, 3),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "plan": None,
+        }
+        with self._lock:
+            self._slow_queries.append(entry)
+
+            explain = (
+                self.config["explain"]
+                and connection.pool is not None
+                and _EXPLAINABLE_RE.match(query)
+                and not _WRITE_RE.search(query)
+                and time.monotonic() - self._explained_at.get(key, float("-inf")) >= self.config["explain_interval_seconds"]
+            )
+            if explain:
+                self._explained_at[key] = time.monotonic()
+
+        if explain:
+            self._explain_executor.submit(self._explain, connection.pool, entry, query, params)
+
+    def _explain(self, pool, entry: dict[str, Any], query: str, params: Any) -> None:
+        try:
+            connection = pool.getconn()
+        except Exception as e:
+            logger.warning("Could not capture plan for slow query: %s", e)
+            return
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            entry["plan"] = plan
+            logger.warning("\x1b[1mSLOW QUERY PLAN\x1b[0m for %s:\n%s", entry["fingerprint"], plan)
+        except psycopg2.Error as e:
+            logger.warning("Could not capture plan for slow query: %s", e)
+        finally:
+            connection.rollback()
+            pool.putconn(connection)
+
+    @contextmanager
+    def capture(self) -> Iterator[list[tuple[str, Any]]]:
+        captured = []
+        token = _captured_statements.set(captured)
+        try:
+            yield captured
+        finally:
+            _captured_statements.reset(token)
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> list[dict[str, Any]]:
+        with self._lock:
+            stats = [
+                {**item, "histogram_ms": dict(item["histogram_ms"]), "mean_ms": item["total_ms"] / item["calls"]}
+                for item in self._stats.values()
+            ]
+        return sorted(stats, key=lambda item: item[order_by], reverse=True)[:limit]
+
+    def slow_queries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._slow_queries)]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+            self._explained_at.clear()
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,35 @@
+from contextvars import ContextVar
+
+import redis
+
+from server.app.utils.logger import logger
+from server.app.utils.redis_client import redis_client
+
+
+_read_your_writes_key: ContextVar[str | None] = ContextVar("read_your_writes_key", default=None)
+
+
+def set_read_your_writes_key(key: str | None) -> None:
+    _read_your_writes_key.set(key)
+
+
+def pin_to_primary(seconds: float) -> None:
+    key = _read_your_writes_key.get()
+
+    if key is None or seconds <= 0:
+        return
+    try:
+        redis_client.set(f"read_your_writes:{key}", 1, px=int(seconds * 1000))
+    except redis.RedisError as e:
+        logger.warning("Could not pin \x1b[1m%s\x1b[0m to the primary database: %s", key, e)
+
+
+def is_pinned_to_primary() -> bool:
+    key = _read_your_writes_key.get()
+
+    if key is None:
+        return False
+    try:
+        return bool(redis_client.exists(f"read_your_writes:{key}"))
+    except redis.RedisError:
+        return True
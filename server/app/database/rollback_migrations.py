@@ -1,15 +1,15 @@
-import os
+import argparse
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.migration_engine import MigrationEngine
 
 
-def rollback_migrations():
-    with PostgresDatabase() as db:
-        for filename in sorted(os.listdir("sql"), reverse=True):
-            if filename.endswith("_down.sql"):
-                with open(os.path.join("sql", filename), "r") as file:
-                    db.execute_query(file.read())
+def rollback_migrations(steps: int | None = None):
+    return MigrationEngine.rollback(steps=steps)
 
 
 if __name__ == "__main__":
-    rollback_migrations()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Roll back applied migrations, newest first")
+    parser.add_argument("--steps", type=int, help="number of migrations to roll back (default: all)")
+    args = parser.parse_args()
+
+    rollback_migrations(steps=args.steps)
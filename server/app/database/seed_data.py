@@ -0,0 +1,536 @@
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Iterator
+import argparse
+import random
+import time
+
+from server.app.database.database import PostgresDatabase
+from server.app.utils.auth import get_password_hash
+from server.app.utils.crypto import protect_payment
+from server.app.utils.logger import logger
+
+
+DEFAULT_SEED_CONFIG = {
+    "seed": 42,
+    "reference_time": datetime(2026, 1, 1),
+    "block_reference_time": None,
+    "users": 20_000,
+    "plan_weights": {"admin": 0.002, "moderator": 0.008, "customer": 0.39, "performer": 0.6},
+    "specialities": 40,
+    "tags": 200,
+    "tags_per_speciality": (3, 8),
+    "specialities_per_performer": (1, 3),
+    "teams": 2_000,
+    "team_size": (2, 6),
+    "orders": 200_000,
+    "power_customers": 5,
+    "power_customer_orders": 10_000,
+    "customer_skew": 1.1,
+    "performer_skew": 0.8,
+    "team_order_ratio": 0.1,
+    "assigned_ratio": 0.6,
+    "blocked_ratio": 0.02,
+    "tags_per_order": (1, 4),
+    "images_per_order": (0, 3),
+    "logs_per_order": (1, 4),
+    "chat_ratio": 0.25,
+    "messages_per_chat": (0, 40),
+    "feedbacks": 50_000,
+    "payments_per_customer": (0, 2),
+    "password": "seed-password",
+    "skip_foreign_key_checks": False,
+}
+SCALED_KEYS = ("users", "teams", "orders", "power_customer_orders", "feedbacks")
+PAYMENT_VARIANTS = 32
+
+TAG_WORDS = (
+    "python", "django", "fastapi", "react", "vue", "figma", "seo", "copywriting", "translation", "logo",
+    "branding", "video", "animation", "3d", "ios", "android", "flutter", "devops", "aws", "sql",
+    "excel", "accounting", "legal", "marketing", "smm", "illustration", "ui", "ux", "qa", "scraping",
+)
+SPECIALITY_WORDS = (
+    "backend", "frontend", "mobile", "design", "writing", "translation", "marketing", "video",
+    "data", "devops", "support", "finance", "legal", "audio", "testing",
+)
+FIRST_NAMES = ("Anna", "Ivan", "Olga", "Petr", "Maria", "Alex", "Elena", "Dmitry", "Sofia", "Nikita", "Kate", "Max")
+LAST_NAMES = ("Smith", "Ivanov", "Petrova", "Brown", "Kuznetsov", "Garcia", "Novak", "Sokolova", "Miller", "Orlov")
+MESSAGES = (
+    "Hello!", "When can you start?", "Sent you the files", "Please check the latest version",
+    "Could you lower the price?", "Done, waiting for feedback", "Thanks!", "One more change, please",
+)
+
+
+def _zipf_cum_weights(count: int, skew: float) -> list[float]:
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+class DataSeeder:
+    def __init__(self, **config: Any):
+        unknown = set(config) - set(DEFAULT_SEED_CONFIG)
+        if unknown:
+            raise ValueError(f"Unknown seed settings: {', '.join(sorted(unknown))}")
+
+        self.config = {**DEFAULT_SEED_CONFIG, **config}
+        self.rng = random.Random(self.config["seed"])
+        self.now = self.config["reference_time"].replace(microsecond=0)
+        self.block_now = (
+            self.config["block_reference_time"] or datetime.now().replace(hour=0, minute=0, second=0)
+        ).replace(microsecond=0)
+        self.counts: dict[str, int] = {}
+
+    @staticmethod
+    def scaled(scale: float, **config: Any) -> "DataSeeder":
+        return DataSeeder(**{
+            **{key: max(1, int(DEFAULT_SEED_CONFIG[key] * scale)) for key in SCALED_KEYS},
+            **config,
+        })
+
+    def _randint(self, bounds: tuple[int, int]) -> int:
+        return self.rng.randint(*bounds)
+
+    def _past(self, days: int = 365) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86_400))
+
+    def _skewed(self, population: list[int], skew: float, count: int) -> list[int]:
+        population = list(population)
+        self.rng.shuffle(population)
+        return self.rng.choices(population, cum_weights=_zipf_cum_weights(len(population), skew), k=count)
+
+    def _reserve_ids(self, db: PostgresDatabase, table_name: str, count: int) -> int:
+        if not count:
+            return 0
+
+        return db.fetch(
+            """
+                SELECT setval(pg_get_serial_sequence(%s, 'id'), nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)
+                    - %s + 1 AS first_id
+            """,
+            (table_name, table_name, count, count)
+        )["first_id"]
+
+    def _copy(self, db: PostgresDatabase, table_name: str, columns: tuple[str, ...], rows: Iterator[tuple]) -> None:
+        started_at = time.monotonic()
+        self.counts[table_name] = self.counts.get(table_name, 0) + db.copy_rows(table_name, columns, rows)
+
+        logger.info(
+            "Seeded \x1b[1m%s\x1b[0m rows into \x1b[1m%s\x1b[0m in %d ms",
+            self.counts[table_name],
+            table_name,
+            (time.monotonic() - started_at) * 1000
+        )
+
+    def run(self) -> dict[str, int]:
+        started_at = time.monotonic()
+
+        with PostgresDatabase(on_commit=True) as db:
+            if self.config["skip_foreign_key_checks"]:
+                db.execute_query("SET LOCAL session_replication_role = replica")
+
+            plans = self._seed_plans(db)
+            tags = self._seed_tags(db)
+            specialities = self._seed_specialities(db, tags)
+            customers, performers = self._seed_users(db, plans, specialities)
+            teams = self._seed_teams(db, customers, performers)
+            orders = self._seed_orders(db, customers, performers, teams, tags)
+            self._seed_chats(db, orders, teams)
+            self._seed_feedbacks(db, customers, performers)
+            self._seed_payments(db, customers)
+
+        with PostgresDatabase(on_commit=True) as db:
+            db.execute_query("ANALYZE")
+
+        logger.info("Seeding finished in \x1b[1m%.1f s\x1b[0m", time.monotonic() - started_at)
+        return self.counts
+
+    def _seed_plans(self, db: PostgresDatabase) -> dict[str, int]:
+        db.execute_query(
+            """
+                INSERT INTO plans (name)
+                SELECT UNNEST(%s::VARCHAR[])
+                ON CONFLICT (name) DO NOTHING
+            """,
+            (list(self.config["plan_weights"]), )
+        )
+        return {
+            plan["name"]: plan["id"]
+            for plan in db.fetch("SELECT id, name FROM plans", is_all=True)
+        }
+
+    def _seed_tags(self, db: PostgresDatabase) -> dict[int, str]:
+        count = self.config["tags"]
+        first_id = self._reserve_ids(db, "tags", count)
+        tags = {
+            first_id + index: f"{TAG_WORDS[index % len(TAG_WORDS)]}_{first_id + index}"
+            for index in range(count)
+        }
+
+        self._copy(db, "tags", ("id", "name"), iter(tags.items()))
+        return tags
+
+    def _seed_specialities(self, db: PostgresDatabase, tags: dict[int, str]) -> list[int]:
+        count = self.config["specialities"]
+        first_id = self._reserve_ids(db, "specialities", count)
+        specialities = list(range(first_id, first_id + count))
+
+        self._copy(
+            db,
+            "specialities",
+            ("id", "name"),
+            (
+                (speciality_id, f"{SPECIALITY_WORDS[index % len(SPECIALITY_WORDS)]}_{speciality_id}")
+                for index, speciality_id in enumerate(specialities)
+            )
+        )
+
+        tag_ids = list(tags)
+        self._copy(
+            db,
+            "specialities_tags",
+            ("speciality_id", "tag_id"),
+            (
+                (speciality_id, tag_id)
+                for speciality_id in specialities
+                for tag_id in self.rng.sample(tag_ids, min(len(tag_ids), self._randint(self.config["tags_per_speciality"])))
+            )
+        )
+        return specialities
+
+    def _seed_users(
+            self,
+            db: PostgresDatabase,
+            plans: dict[str, int],
+            specialities: list[int]
+    ) -> tuple[list[int], list[int]]:
+        count = self.config["users"]
+        plan_names = list(self.config["plan_weights"])
+        user_plans = self.rng.choices(plan_names, weights=list(self.config["plan_weights"].values()), k=count)
+
+        first_id = self._reserve_ids(db, "users", count)
+        user_ids = range(first_id, first_id + count)
+        customers = [user_id for user_id, plan in zip(user_ids, user_plans) if plan == "customer"]
+        performers = [user_id for user_id, plan in zip(user_ids, user_plans) if plan == "performer"]
+
+        if len(customers) < self.config["power_customers"] or not performers:
+            raise ValueError("Not enough customers and performers for the requested cardinalities")
+
+        password = get_password_hash(self.config["password"])
+
+        def rows():
+            for user_id, plan in zip(user_ids, user_plans):
+                is_blocked = self.rng.random() < self.config["blocked_ratio"]
+                yield (
+                    user_id,
+                    self.rng.choice(FIRST_NAMES),
+                    self.rng.choice(LAST_NAMES),
+                    f"seed_user_{user_id}",
+                    f"seed_user_{user_id}@example.com",
+                    f"+1555{user_id:08d}" if self.rng.random() < 0.5 else None,
+                    password,
+                    f"https://cdn.example.com/users/{user_id}.png" if self.rng.random() < 0.3 else None,
+                    f"Synthetic {plan} profile" if self.rng.random() < 0.5 else None,
+                    self.rng.random() < 0.8,
+                    self.block_now + timedelta(days=self.rng.randint(-30, 30)) if is_blocked else None,
+                    round(self.rng.uniform(0, 5_000), 2),
+                    self.rng.randint(0, 5) if plan == "performer" else None,
+                    plans[plan],
+                    is_blocked,
+                )
+
+        self._copy(
+            db,
+            "users",
+            (
+                "id", "first_name", "last_name", "username", "email", "phone_number", "password", "photo_link",
+                "description", "is_verified", "block_expired", "balance", "rating", "plan_id", "is_blocked",
+            ),
+            rows()
+        )
+        self._copy(
+            db,
+            "users_specialities",
+            ("user_id", "speciality_id"),
+            (
+                (user_id, speciality_id)
+                for user_id in performers
+                for speciality_id in self.rng.sample(
+                    specialities,
+                    min(len(specialities), self._randint(self.config["specialities_per_performer"]))
+                )
+            )
+        )
+        return customers, performers
+
+    def _seed_teams(
+            self,
+            db: PostgresDatabase,
+            customers: list[int],
+            performers: list[int]
+    ) -> dict[int, dict[str, Any]]:
+        count = self.config["teams"]
+        first_id = self._reserve_ids(db, "teams", count)
+        team_customers = self._skewed(customers, self.config["customer_skew"], count)
+
+        teams = {}
+        for index, customer_id in enumerate(team_customers):
+            members = self.rng.sample(performers, min(len(performers), self._randint(self.config["team_size"])))
+            teams[first_id + index] = {"customer_id": customer_id, "lead_id": members[0], "members": members}
+
+        self._copy(
+            db,
+            "teams",
+            ("id", "name", "lead_id", "customer_id"),
+            ((team_id, f"seed_team_{team_id}", team["lead_id"], team["customer_id"]) for team_id, team in teams.items())
+        )
+        self._copy(
+            db,
+            "teams_users",
+            ("team_id", "user_id"),
+            ((team_id, user_id) for team_id, team in teams.items() for user_id in team["members"])
+        )
+        return teams
+
+    def _seed_orders(
+            self,
+            db: PostgresDatabase,
+            customers: list[int],
+            performers: list[int],
+            teams: dict[int, dict[str, Any]],
+            tags: dict[int, str]
+    ) -> dict[int, dict[str, Any]]:
+        count = self.config["orders"]
+        power_customers = customers[:self.config["power_customers"]]
+        power_orders = min(count, len(power_customers) * self.config["power_customer_orders"])
+
+        order_customers = [
+            customer_id
+            for customer_id in power_customers
+            for _ in range(self.config["power_customer_orders"])
+        ][:power_orders]
+        order_customers += self._skewed(
+            customers[len(power_customers):] or power_customers,
+            self.config["customer_skew"],
+            count - power_orders
+        )
+        self.rng.shuffle(order_customers)
+
+        order_performers = self._skewed(performers, self.config["performer_skew"], count)
+        customer_teams: dict[int, list[int]] = {}
+        for team_id, team in teams.items():
+            customer_teams.setdefault(team["customer_id"], []).append(team_id)
+
+        first_id = self._reserve_ids(db, "orders", count)
+        tag_ids = list(tags)
+        orders = {}
+
+        for index, customer_id in enumerate(order_customers):
+            is_team = customer_id in customer_teams and self.rng.random() < self.config["team_order_ratio"]
+            is_assigned = self.rng.random() < self.config["assigned_ratio"]
+            is_blocked = not is_assigned and self.rng.random() < self.config["blocked_ratio"]
+
+            orders[first_id + index] = {
+                "customer_id": customer_id,
+                "execution_type": "team" if is_team else "single",
+                "performer_id": order_performers[index] if is_assigned and not is_team else None,
+                "performer_team_id": self.rng.choice(customer_teams[customer_id]) if is_assigned and is_team else None,
+                "price": round(self.rng.uniform(10, 1_000), 2),
+                "is_blocked": is_blocked,
+                "blocked_until": self.block_now + timedelta(days=self.rng.randint(-7, 7)) if is_blocked else None,
+                "tags": self.rng.sample(tag_ids, min(len(tag_ids), self._randint(self.config["tags_per_order"]))),
+            }
+
+        self._copy(
+            db,
+            "orders",
+            (
+                "id", "name", "description", "customer_id", "execution_type", "performer_id", "performer_team_id",
+                "price", "is_blocked", "blocked_until",
+            ),
+            (
+                (
+                    order_id,
+                    f"seed_order_{order_id}",
+                    f"Synthetic order {order_id}",
+                    order["customer_id"],
+                    order["execution_type"],
+                    order["performer_id"],
+                    order["performer_team_id"],
+                    order["price"],
+                    order["is_blocked"],
+                    order["blocked_until"],
+                )
+                for order_id, order in orders.items()
+            )
+        )
+        self._copy(
+            db,
+            "orders_tags",
+            ("order_id", "tag_id"),
+            ((order_id, tag_id) for order_id, order in orders.items() for tag_id in order["tags"])
+        )
+        self._seed_order_images(db, orders)
+        self._seed_order_logs(db, orders, tags)
+        return orders
+
+    def _seed_order_images(self, db: PostgresDatabase, orders: dict[int, dict[str, Any]]) -> None:
+        images_per_order = {order_id: self._randint(self.config["images_per_order"]) for order_id in orders}
+        first_id = self._reserve_ids(db, "images", sum(images_per_order.values()))
+
+        order_images = []
+        for order_id, count in images_per_order.items():
+            for position in range(count):
+                order_images.append((order_id, first_id + len(order_images), position == 0))
+
+        self._copy(
+            db,
+            "images",
+            ("id", "image_link"),
+            (
+                (image_id, f"https://cdn.example.com/orders/{order_id}/{image_id}.png")
+                for order_id, image_id, _ in order_images
+            )
+        )
+        self._copy(db, "orders_images", ("order_id", "image_id", "is_main"), iter(order_images))
+
+    def _seed_order_logs(self, db: PostgresDatabase, orders: dict[int, dict[str, Any]], tags: dict[int, str]) -> None:
+        def rows():
+            for order_id, order in orders.items():
+                count = self._randint(self.config["logs_per_order"])
+                prices = [round(self.rng.uniform(10, 1_000), 2) for _ in range(count - 1)] + [order["price"]]
+                updated_at = sorted(self._past() for _ in range(count))
+                order_tags = "{" + ",".join(f'"{tags[tag_id]}"' for tag_id in order["tags"]) + "}"
+
+                for index, (price, changed_at) in enumerate(zip(prices, updated_at)):
+                    old_price = prices[index - 1] if index else 0
+                    yield (
+                        order["customer_id"],
+                        order_id,
+                        "updated" if index else "created",
+                        old_price,
+                        price,
+                        int((price - old_price) / old_price * 100) if old_price else 100,
+                        f"seed_order_{order_id}",
+                        order_tags,
+                        changed_at,
+                    )
+
+        self._copy(
+            db,
+            "orders_logs",
+            (
+                "customer_id", "order_id", "change_type", "old_price", "new_price", "price_change_percent",
+                "order_name", "order_tags", "updated_at",
+            ),
+            rows()
+        )
+
+    def _seed_chats(
+            self,
+            db: PostgresDatabase,
+            orders: dict[int, dict[str, Any]],
+            teams: dict[int, dict[str, Any]]
+    ) -> None:
+        chats = {}
+        for order_id, order in orders.items():
+            if (order["performer_id"] or order["performer_team_id"]) and self.rng.random() < self.config["chat_ratio"]:
+                if order["performer_team_id"]:
+                    performers = teams[order["performer_team_id"]]["members"]
+                else:
+                    performers = [order["performer_id"]]
+                chats[order_id] = [order["customer_id"], *performers]
+
+        first_id = self._reserve_ids(db, "chats", len(chats))
+        chats = {first_id + index: (order_id, users) for index, (order_id, users) in enumerate(chats.items())}
+
+        def messages(users: list[int]) -> list[dict[str, Any]]:
+            created_at = sorted(self._past(90) for _ in range(self._randint(self.config["messages_per_chat"])))
+            return [
+                {"sender_id": self.rng.choice(users), "content": self.rng.choice(MESSAGES), "created_at": sent_at.isoformat()}
+                for sent_at in created_at
+            ]
+
+        self._copy(
+            db,
+            "chats",
+            ("id", "order_id", "messages"),
+            ((chat_id, order_id, messages(users)) for chat_id, (order_id, users) in chats.items())
+        )
+        self._copy(
+            db,
+            "chats_users",
+            ("chat_id", "user_id"),
+            ((chat_id, user_id) for chat_id, (_, users) in chats.items() for user_id in dict.fromkeys(users))
+        )
+
+    def _seed_feedbacks(self, db: PostgresDatabase, customers: list[int], performers: list[int]) -> None:
+        count = self.config["feedbacks"]
+        profiles = self._skewed(performers, self.config["performer_skew"], count)
+
+        self._copy(
+            db,
+            "users_profile_feedbacks",
+            ("content", "rate", "commentator_id", "profile_id"),
+            (
+                (
+                    f"Synthetic feedback {index}",
+                    self.rng.choices(range(6), weights=(2, 3, 5, 10, 30, 50))[0],
+                    self.rng.choice(customers),
+                    profile_id,
+                )
+                for index, profile_id in enumerate(profiles)
+            )
+        )
+
+    def _seed_payments(self, db: PostgresDatabase, customers: list[int]) -> None:
+        payments = [
+            protect_payment("".join(str(self.rng.randrange(10)) for _ in range(16)))
+            for _ in range(PAYMENT_VARIANTS)
+        ]
+
+        self._copy(
+            db,
+            "payments",
+            ("user_id", "payment", "payment_masked", "payment_fingerprint"),
+            (
+                (customer_id, *self.rng.choice(payments).values())
+                for customer_id in customers
+                for _ in range(self._randint(self.config["payments_per_customer"]))
+            )
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic marketplace data with COPY")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED_CONFIG["seed"], help="random seed")
+    parser.add_argument(
+        "--reference-time",
+        type=datetime.fromisoformat,
+        help=f"ISO timestamp generated dates are relative to (default {DEFAULT_SEED_CONFIG['reference_time'].isoformat()})"
+    )
+    parser.add_argument(
+        "--block-reference-time",
+        type=datetime.fromisoformat,
+        help="ISO timestamp block expiry dates are relative to (default midnight of the run date, "
+             "so active blocks survive the startup unblock sweep)"
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help=f"multiplier for {', '.join(SCALED_KEYS)}")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--teams", type=int)
+    parser.add_argument("--orders", type=int)
+    parser.add_argument("--power-customers", type=int)
+    parser.add_argument("--power-customer-orders", type=int)
+    parser.add_argument("--feedbacks", type=int)
+    parser.add_argument("--customer-skew", type=float, help="zipf exponent of orders and teams per customer")
+    parser.add_argument("--performer-skew", type=float, help="zipf exponent of orders and feedbacks per performer")
+    parser.add_argument(
+        "--skip-foreign-key-checks",
+        action="store_true",
+        default=None,
+        help="load with session_replication_role = replica (superuser only, the generated rows are consistent)"
+    )
+    args = parser.parse_args()
+
+    DataSeeder.scaled(
+        args.scale,
+        **{key: value for key, value in vars(args).items() if key != "scale" and value is not None}
+    ).run()
@@ -1,8 +1,4 @@
-BEGIN;
-
 DROP TABLE IF EXISTS plans CASCADE;
 DROP TABLE IF EXISTS permissions CASCADE;
 DROP TABLE IF EXISTS plans_permissions CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
-
-COMMIT;
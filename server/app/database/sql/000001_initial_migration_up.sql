@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS plans (
   id SERIAL PRIMARY KEY,
   name VARCHAR(32) NOT NULL UNIQUE
@@ -37,5 +35,3 @@ CREATE TABLE IF NOT EXISTS users (
   plan_id INTEGER NOT NULL,
   FOREIGN KEY (plan_id) REFERENCES plans(id) ON DELETE CASCADE
 );
-
-COMMIT;
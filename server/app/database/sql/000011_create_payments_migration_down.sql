@@ -1,5 +1 @@
-BEGIN;
-
 DROP TABLE IF EXISTS payments CASCADE;
-
-COMMIT;
\ No newline at end of file
@@ -1,10 +1,6 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS payments (
   id SERIAL PRIMARY KEY,
   user_id INTEGER NOT NULL,
   payment BYTEA NOT NULL,
   FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
-
-COMMIT;
@@ -1,7 +1,3 @@
-BEGIN;
-
-DROP TABLE IF EXISTS orders;
-DROP TABLE IF EXISTS images;
 DROP TABLE IF EXISTS orders_images;
-
-COMMIT;
+DROP TABLE IF EXISTS images;
+DROP TABLE IF EXISTS orders;
@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS orders (
 	id SERIAL PRIMARY KEY,
 	name VARCHAR(256) NOT NULL,
@@ -25,5 +23,3 @@ CREATE TABLE IF NOT EXISTS orders_images (
 	FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE,
 	FOREIGN KEY (image_id) REFERENCES images(id) ON DELETE CASCADE
 );
-
-COMMIT;
@@ -1,5 +1 @@
-BEGIN;
-
 DROP INDEX unique_main_order;
-
-COMMIT;
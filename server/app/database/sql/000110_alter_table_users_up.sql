@@ -1,5 +1 @@
-BEGIN;
-
 ALTER TABLE users ADD COLUMN IF NOT EXISTS is_blocked BOOLEAN;
-
-COMMIT;
@@ -1,6 +1,2 @@
-BEGIN;
-
 DROP TABLE IF EXISTS profile_feedbacks_images;
 DROP TABLE IF EXISTS users_profile_feedbacks;
-
-COMMIT;
@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS users_profile_feedbacks (
 	id SERIAL PRIMARY KEY,
 	content VARCHAR(2000),
@@ -16,5 +14,3 @@ CREATE TABLE IF NOT EXISTS profile_feedbacks_images (
 	profile_feedback_id INTEGER NOT NULL,
 	FOREIGN KEY (profile_feedback_id) REFERENCES users_profile_feedbacks(id) ON DELETE CASCADE
 );
-
-COMMIT;
@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS chats (
 	id SERIAL PRIMARY KEY,
 	user_one_id INTEGER NOT NULL,
@@ -8,5 +6,3 @@ CREATE TABLE IF NOT EXISTS chats (
 	FOREIGN KEY (user_one_id) REFERENCES users(id) ON DELETE SET NULL,
 	FOREIGN KEY (user_two_id) REFERENCES users(id) ON DELETE SET NULL
 );
-
-COMMIT;
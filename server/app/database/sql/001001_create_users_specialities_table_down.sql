@@ -1,5 +1,3 @@
-BEGIN;
-
 ALTER TABLE orders 
 DROP COLUMN performer_team_id;
 
@@ -10,5 +8,3 @@ DROP TABLE IF EXISTS orders_tags;
 DROP TABLE IF EXISTS specialities_tags;
 DROP TABLE IF EXISTS tags;
 DROP TABLE IF EXISTS specialities;
-
-COMMIT;
@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS specialities (
     id SERIAL PRIMARY KEY,
     name VARCHAR(128) NOT NULL
@@ -60,5 +58,3 @@ ADD COLUMN performer_team_id INTEGER NULL;
 ALTER TABLE orders 
 ADD CONSTRAINT fk_performer_team 
 FOREIGN KEY (performer_team_id) REFERENCES teams(id) ON DELETE SET NULL;
-
-COMMIT;
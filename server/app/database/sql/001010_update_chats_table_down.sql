@@ -1,5 +1 @@
-BEGIN;
-
 DROP TABLE IF EXISTS chats_users;
-
-COMMIT;
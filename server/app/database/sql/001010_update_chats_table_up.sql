@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS chats_users (
     id SERIAL PRIMARY KEY,
     chat_id INTEGER NOT NULL,
@@ -9,7 +7,7 @@ CREATE TABLE IF NOT EXISTS chats_users (
     UNIQUE (chat_id, user_id)
 );
 
-INSERT INTO chat_users (chat_id, user_id)
+INSERT INTO chats_users (chat_id, user_id)
 SELECT id, user_one_id FROM chats
 UNION
 SELECT id, user_two_id FROM chats;
@@ -17,5 +15,3 @@ SELECT id, user_two_id FROM chats;
 ALTER TABLE chats 
 DROP COLUMN user_one_id,
 DROP COLUMN user_two_id;
-
-COMMIT;
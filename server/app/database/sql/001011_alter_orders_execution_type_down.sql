@@ -1,5 +1 @@
-BEGIN;
-
 ALTER TABLE orders DROP COLUMN execution_type;
-
-COMMIT;
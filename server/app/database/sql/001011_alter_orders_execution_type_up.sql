@@ -1,5 +1,3 @@
-BEGIN;
-
 ALTER TABLE orders 
 ADD COLUMN execution_type VARCHAR(6)
 DEFAULT 'single';
@@ -11,5 +9,3 @@ CHECK (
     OR 
     (execution_type = 'team' AND performer_id IS NULL)
 );
-
-COMMIT;
@@ -1,7 +1,3 @@
-BEGIN;
-
 ALTER TABLE chats
-DROP CONSTRAINT fk_chats_orders,
+DROP CONSTRAINT fk_chats_order,
 DROP COLUMN order_id;
-
-COMMIt;
@@ -1,5 +1 @@
-BEGIN;
-
 ALTER TABLE orders DROP COLUMN price;
-
-COMMIT;
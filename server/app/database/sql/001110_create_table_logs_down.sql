@@ -1,5 +1 @@
-BEGIN;
-
 DROP TABLE IF EXISTS orders_logs;
-
-COMMIT;
@@ -1,5 +1,3 @@
-BEGIN;
-
 CREATE TABLE IF NOT EXISTS orders_logs (
     id SERIAL PRIMARY KEY,
     customer_id INTEGER,
@@ -8,16 +6,14 @@ CREATE TABLE IF NOT EXISTS orders_logs (
     old_price DECIMAL(10,2) NULL,
     new_price DECIMAL(10,2) NULL,
     price_change_percent INTEGER NULL,
-    order_name VARCHAR(256) NOT NULL
+    order_name VARCHAR(256) NOT NULL,
     order_tags TEXT[] NOT NULL,
     updated_at TIMESTAMP DEFAULT NOW(),
     FOREIGN KEY (customer_id) REFERENCES users(id) ON DELETE SET NULL,
-    FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE SET NULL
+    FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE CASCADE
 );
 
 ALTER TABLE orders_logs 
 ADD CHECK (
 	change_type = ANY(ARRAY['created', 'updated', 'completed'])
 );
-
-COMMIT;
@@ -0,0 +1,16 @@
+-- migration: no-transaction
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_block_expired;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_blocked_until;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_unassigned;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_logs_order_id_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_profile_feedbacks_profile_id_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_teams_users_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_chats_order_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_chats_users_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_specialities_speciality_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_specialities_tags_tag_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_tags_tag_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_performer_team_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_performer_id_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_customer_id_id;
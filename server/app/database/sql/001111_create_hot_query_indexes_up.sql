@@ -0,0 +1,22 @@
+-- migration: no-transaction
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_customer_id_id ON orders (customer_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_performer_id_id ON orders (performer_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_performer_team_id ON orders (performer_team_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_tags_tag_id ON orders_tags (tag_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_specialities_tags_tag_id ON specialities_tags (tag_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_specialities_speciality_id ON users_specialities (speciality_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chats_users_user_id ON chats_users (user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chats_order_id ON chats (order_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_teams_users_user_id ON teams_users (user_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_profile_feedbacks_profile_id_id ON users_profile_feedbacks (profile_id, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_logs_order_id_id ON orders_logs (order_id, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_unassigned ON orders (id)
+WHERE performer_id IS NULL AND performer_team_id IS NULL AND is_blocked IS NOT TRUE;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_blocked_until ON orders (blocked_until)
+WHERE is_blocked = TRUE;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_block_expired ON users (block_expired)
+WHERE is_blocked = TRUE;
@@ -0,0 +1,3 @@
+-- migration: no-transaction
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_orders_images_order_id;
@@ -0,0 +1,3 @@
+-- migration: no-transaction
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_orders_images_order_id ON orders_images (order_id);
@@ -0,0 +1,3 @@
+ALTER TABLE payments
+DROP COLUMN IF EXISTS payment_fingerprint,
+DROP COLUMN IF EXISTS payment_masked;
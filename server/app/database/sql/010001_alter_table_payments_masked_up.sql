@@ -0,0 +1,3 @@
+ALTER TABLE payments
+ADD COLUMN IF NOT EXISTS payment_masked VARCHAR(16),
+ADD COLUMN IF NOT EXISTS payment_fingerprint CHAR(64);
@@ -0,0 +1,35 @@
+from typing import AsyncIterator
+import traceback
+
+from starlette.concurrency import run_in_threadpool
+
+from server.app.database.database import UnitOfWork, set_unit_of_work, reset_unit_of_work
+from server.app.utils.exceptions import DATABASE_ERRORS, GlobalException
+from server.app.utils.logger import logger
+
+
+async def request_unit_of_work() -> AsyncIterator[UnitOfWork]:
+    unit_of_work = UnitOfWork()
+    token = set_unit_of_work(unit_of_work)
+    try:
+        yield unit_of_work
+    except BaseException:
+        await run_in_threadpool(unit_of_work.complete, False)
+        raise
+    else:
+        try:
+            await run_in_threadpool(unit_of_work.complete, True)
+        except DATABASE_ERRORS as e:
+            logger.error(
+                "Database error was occured on commit: \n%s\x1b[31m" \
+                "ERROR TRACEBACK:\x1b[0m\n%s",
+                " "*10,
+                traceback.format_exc()
+            )
+            GlobalException.CustomHTTPException.raise_exception(
+                500,
+                "Database error",
+                extra={"error": str(e)}
+            )
+    finally:
+        reset_unit_of_work(token)
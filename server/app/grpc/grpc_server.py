@@ -1,4 +1,5 @@
 import asyncio
+import os
 
 import grpc
 
@@ -6,9 +7,15 @@ from server.app.grpc.generated import payments_pb2_grpc
 from server.app.grpc.interceptors.auth_interceptor import AuthInterceptor
 from server.app.grpc.services.payments_service import PaymentsService
 from server.app.utils.logger import logger
+from server.app.utils.permission_snapshot import permission_snapshot
+from server.app.utils.token_cache import verified_tokens
+from server.app.utils.user_cache import user_principals
 
 
-async def serve():
+GRPC_SERVER_ADDRESS = os.getenv("GRPC_SERVER_ADDRESS", "[::]:50051")
+
+
+def create_server(address: str = GRPC_SERVER_ADDRESS) -> grpc.aio.Server:
     server = grpc.aio.server(interceptors=[AuthInterceptor()])
 
     payments_pb2_grpc.add_PaymentsServiceServicer_to_server(
@@ -16,10 +23,24 @@ async def serve():
         server
     )
 
-    server.add_insecure_port('[::]:50051')
-    logger.info("gRPC AsyncIO server started on port 50051")
+    server.add_insecure_port(address)
+    return server
+
+
+async def serve():
+    server = create_server()
+    permission_snapshot.start_listener()
+    user_principals.start_listener()
+    verified_tokens.start_listener()
+
+    logger.info("gRPC AsyncIO server started on \x1b[1m%s\x1b[0m", GRPC_SERVER_ADDRESS)
     await server.start()
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        verified_tokens.stop_listener()
+        user_principals.stop_listener()
+        permission_snapshot.stop_listener()
 
 
 if __name__ == "__main__":
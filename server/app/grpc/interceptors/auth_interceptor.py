@@ -28,7 +28,7 @@ class AuthInterceptor(grpc.aio.ServerInterceptor):
                 return await continuation(handler_call_details)
 
             token = auth_headers.split(" ")[1]
-            user = UserController.get_user_by_token(token)
+            user = await UserController.get_user_by_token(token)
         
             if not user:
                 logger.error("Invalid authentication token")
@@ -14,7 +14,7 @@ class PaymentsService(PaymentsServiceServicer):
     @required_permissions(["create_payment", "read_own_payment_list", "read_own_payment_details"])
     async def CreatePayment(self, request: payments_pb2.CreatePaymentRequest, context):
         user_id = int(user_id_var.get())
-        result = PaymentController.create_payment(user_id=user_id, payment_data=request.payment)
+        result = await PaymentController.async_create_payment(user_id=user_id, payment_data=request.payment)
         
         return payments_pb2.PaymentResponse(**result)
     
@@ -53,7 +53,7 @@ class PaymentsService(PaymentsServiceServicer):
     @handle_exceptions
     @required_permissions(["read_all_users_payments"])
     async def AdminGetAllUsersPayments(self, request: empty_pb2, context):
-        result = PaymentController.get_all_users_payments()
+        result = PaymentController.get_all_users_payments_unpaged()
 
         return payments_pb2.PaymentListResponse(payments=result)
     
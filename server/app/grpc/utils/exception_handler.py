@@ -1,9 +1,9 @@
 from functools import wraps
 
 import grpc
+from fastapi import HTTPException
 
 from server.app.utils.logger import logger
-from server.app.utils.exceptions import GlobalException
 
 
 def get_grpc_error_code(status_code: int) -> grpc.StatusCode:
@@ -30,7 +30,7 @@ def handle_exceptions(func):
     async def wrapper(self, request, context: grpc.aio.ServicerContext, *args, **kwargs):
         try:
             return await func(self, request, context, *args, **kwargs)
-        except GlobalException.CustomHTTPException as e:
+        except HTTPException as e:
             logger.error(f"Error was occured: {e.detail}")
             await context.abort(get_grpc_error_code(e.status_code), str(e.detail))
         except grpc.aio.RpcError as e:
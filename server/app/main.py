@@ -9,14 +9,18 @@ from starlette.middleware.sessions import SessionMiddleware
 import socketio
 
 from server.app.services.chat_service import sio
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, close_pool, get_pool_stats, get_replica_pools_stats
+from server.app.database.async_database import close_async_pool, get_async_pool_stats
 from server.app.routers.payments_grpc_routers import router as payment_grpc_router
 from server.app.routers.user_routers import router as user_router
 from server.app.routers.admin_routers import router as admin_router
 from server.app.routers.payment_routers import router as payment_router
 from server.app.routers.order_routers import router as order_router
 from server.app.routers.profile_routers import router as profile_router
-from server.app.utils.redis_client import redis_client
+from server.app.utils.executor import crypto_executor, handler_executor
+from server.app.utils.permission_snapshot import permission_snapshot
+from server.app.utils.token_cache import verified_tokens
+from server.app.utils.user_cache import user_principals
 from server.app.utils.logger import logger
 from server.app.services.cache_permissions_service import load_permissions
 from server.app.utils.exceptions import (
@@ -31,6 +35,10 @@ async def lifespan(app: FastAPI):
     load_permissions()
     logger.info("Loaded plans and permissions for key-value fast access")
 
+    permission_snapshot.start_listener()
+    user_principals.start_listener()
+    verified_tokens.start_listener()
+
     with PostgresDatabase(on_commit=True) as db:
         with db.connection.cursor() as cursor:
             cursor.execute(
@@ -59,6 +67,8 @@ async def lifespan(app: FastAPI):
             ids = cursor.fetchall()
 
             if ids:
+                unblocked_ids = [user_id for user_id, in ids]
+                db.after_commit(lambda: user_principals.invalidate(*unblocked_ids))
                 logger.info("\x1b[1mAUTO CHECK USERS\x1b[0m: Users with ids %s were unblocked", ids)
             else:
                 logger.info("\x1b[1mAUTO CHECK USERS\x1b[0m: No users to unblock")
@@ -70,8 +80,25 @@ async def lifespan(app: FastAPI):
         logger.error("Disconnected with error. Handle disconnection")
         pass
 
-    redis_client.flushall()
-    logger.warning("Flush all plans and permissions from key-value fast access")
+    logger.info("Verified token cache stats on shutdown: %s", verified_tokens.stats())
+    verified_tokens.stop_listener()
+
+    logger.info("User cache stats on shutdown: %s", user_principals.stats())
+    user_principals.stop_listener()
+    permission_snapshot.stop_listener()
+
+    logger.info("Sync handler executor stats on shutdown: %s", handler_executor.stats())
+    handler_executor.shutdown()
+
+    logger.info("Crypto executor stats on shutdown: %s", crypto_executor.stats())
+    crypto_executor.shutdown()
+
+    logger.info("PostgreSQL connection pool stats on shutdown: %s", get_pool_stats())
+    logger.info("PostgreSQL replica connection pools stats on shutdown: %s", get_replica_pools_stats())
+    close_pool()
+
+    logger.info("PostgreSQL async connection pool stats on shutdown: %s", get_async_pool_stats())
+    await close_async_pool()
 
 
 app = FastAPI(lifespan=lifespan)
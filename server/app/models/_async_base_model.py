@@ -0,0 +1,54 @@
+from typing import Any
+
+from psycopg import sql
+
+from server.app.database.async_database import AsyncPostgresDatabase
+
+
+class AsyncBaseModel:
+    table_name: str = ""
+
+    @classmethod
+    async def get_record_by_id(cls, record_id: int) -> dict[str, Any] | None:
+        query = sql.SQL("SELECT * FROM {} WHERE id = %s").format(sql.Identifier(cls.table_name))
+
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(query, (record_id, ))
+
+    @classmethod
+    async def get_all_records(cls) -> list[dict[str, Any]] | None:
+        query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(cls.table_name))
+
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(query, is_all=True)
+
+    @classmethod
+    async def create_record(cls, **kwargs) -> dict[str, Any] | None:
+        query = sql.SQL("INSERT INTO {} ({}) VALUES ({}) RETURNING *").format(
+            sql.Identifier(cls.table_name),
+            sql.SQL(", ").join(map(sql.Identifier, kwargs.keys())),
+            sql.SQL(", ").join(sql.Placeholder() * len(kwargs)),
+        )
+
+        async with AsyncPostgresDatabase(on_commit=True) as db:
+            return await db.fetch(query, tuple(kwargs.values()))
+
+    @classmethod
+    async def update_record(cls, record_id: int, **kwargs) -> int | None:
+        query = sql.SQL("UPDATE {} SET {} WHERE id = %s").format(
+            sql.Identifier(cls.table_name),
+            sql.SQL(", ").join(
+                sql.SQL("{} = {}").format(sql.Identifier(key), sql.Placeholder())
+                for key in kwargs.keys()
+            ),
+        )
+
+        async with AsyncPostgresDatabase(on_commit=True) as db:
+            return await db.execute_query(query, tuple(kwargs.values()) + (record_id,))
+
+    @classmethod
+    async def delete_record_by_id(cls, record_id: int) -> int | None:
+        query = sql.SQL("DELETE FROM {} WHERE id = %s").format(sql.Identifier(cls.table_name))
+
+        async with AsyncPostgresDatabase(on_commit=True) as db:
+            return await db.execute_query(query, (record_id,))
@@ -1,6 +1,6 @@
-from typing import Any
+from typing import Any, Iterator
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, get_unit_of_work, stream_batches
 from server.app.models.sql_builder import SQLBuilder
 
 
@@ -9,10 +9,22 @@ class BaseModel:
 
     @classmethod
     def get_record_by_id(cls, record_id: int) -> dict[str, Any] | None:
+        unit_of_work = get_unit_of_work()
+
+        if unit_of_work is not None:
+            record = unit_of_work.get_identity(cls.table_name, record_id)
+            if record is not None:
+                return record
+
         query, params = SQLBuilder(table_name=cls.table_name).select().where("id", params=record_id).get()
 
         with PostgresDatabase() as db:
-            return db.fetch(query, params)
+            record = db.fetch(query, params)
+
+        if unit_of_work is not None and record:
+            unit_of_work.remember_identity(cls.table_name, record_id, record)
+
+        return record
 
     @classmethod
     def get_all_records(cls) -> list[dict[str, Any]] | None:
@@ -21,6 +33,19 @@ class BaseModel:
         with PostgresDatabase() as db:
             return db.fetch(query, params, is_all=True)
 
+    @classmethod
+    def get_records_page(cls, after_id: int, limit: int) -> list[dict[str, Any]]:
+        query, params = SQLBuilder(table_name=cls.table_name).select().keyset("id", after_id, limit + 1).get()
+
+        with PostgresDatabase() as db:
+            return db.fetch(query, params, is_all=True)
+
+    @classmethod
+    def stream_all_records(cls) -> Iterator[list[dict[str, Any]]]:
+        query, params = SQLBuilder(table_name=cls.table_name).select().get()
+
+        return stream_batches(query, params)
+
     @classmethod
     def create_record(cls, **kwargs) -> dict[str, Any] | None:
         columns = ", ".join(kwargs.keys())
@@ -1,5 +1,139 @@
+from typing import Any
+import json
+
+from server.app.database.database import PostgresDatabase
 from server.app.models._base_model import BaseModel
 
 
 class Chat(BaseModel):
     table_name = "chats"
+
+    @staticmethod
+    def get_order_chat_id(order_id: int, user_id: int) -> int | None:
+        with PostgresDatabase() as db:
+            chat = db.fetch(
+                """
+                    SELECT ch.id AS id
+                    FROM chats ch
+                    JOIN chats_users chu
+                        ON chu.chat_id = ch.id
+                    WHERE ch.order_id = %s
+                        AND chu.user_id = %s;
+                """,
+                (order_id, user_id, )
+            )
+        return chat.get("id")
+
+    @staticmethod
+    def is_order_participant(order_id: int, user_id: int) -> bool:
+        with PostgresDatabase() as db:
+            return bool(
+                db.fetch(
+                    """
+                        SELECT 1 AS is_participant
+                        FROM orders o
+                        LEFT JOIN teams t
+                            ON t.id = o.performer_team_id
+                        LEFT JOIN teams_users tu
+                            ON tu.team_id = t.id
+                        WHERE o.id = %s
+                            AND (o.performer_id = %s OR tu.user_id = %s OR o.customer_id = %s)
+                    """,
+                    (order_id, user_id, user_id, user_id, )
+                )
+            )
+
+    @staticmethod
+    def create_order_chat(order_id: int) -> int | None:
+        with PostgresDatabase(on_commit=True) as db:
+            chat = db.fetch(
+                """
+                    WITH inserted_chat AS (
+                        INSERT INTO chats (messages, order_id)
+                        VALUES (%s, %s)
+                        RETURNING id
+                    ),
+                    selected_users AS (
+                        SELECT o.customer_id AS user_id
+                        FROM orders o
+                        WHERE o.id = %s
+                        UNION
+                        SELECT o.performer_id AS user_id
+                        FROM orders o
+                        WHERE o.id = %s
+                        UNION
+                        SELECT tu.user_id AS user_id
+                        FROM orders o
+                        LEFT JOIN teams t
+                            ON t.id = o.performer_team_id
+                        LEFT JOIN teams_users tu
+                            ON tu.team_id = t.id
+                        WHERE o.id = %s
+                    )
+                    INSERT INTO chats_users (chat_id, user_id)
+                    SELECT ic.id, su.user_id
+                    FROM inserted_chat ic, selected_users su
+                    WHERE su.user_id IS NOT NULL
+                    RETURNING chat_id;
+                """,
+                ("[]", order_id, order_id, order_id, order_id, )
+            )
+        return chat.get("chat_id")
+
+    @staticmethod
+    def is_chat_member(chat_id: int, user_id: int) -> bool:
+        with PostgresDatabase() as db:
+            return bool(
+                db.fetch(
+                    """
+                        SELECT 1 AS is_member
+                        FROM chats ch
+                        JOIN chats_users chu
+                            ON chu.chat_id = ch.id
+                        WHERE ch.id = %s
+                            AND chu.user_id = %s;
+                    """,
+                    (chat_id, user_id, )
+                )
+            )
+
+    @staticmethod
+    def get_chat_messages(chat_id: int) -> list[dict[str, Any]] | None:
+        with PostgresDatabase() as db:
+            chat = db.fetch(
+                """
+                    SELECT messages
+                    FROM chats
+                    WHERE id = %s
+                """,
+                (chat_id, )
+            )
+        return chat.get("messages")
+
+    @staticmethod
+    def add_chat_message(chat_id: int, message: dict[str, Any]) -> int:
+        with PostgresDatabase(on_commit=True) as db:
+            return db.execute_query(
+                """
+                    UPDATE chats
+                    SET messages = messages || %s::jsonb
+                    WHERE id = %s
+                """,
+                (json.dumps([message], indent=2), chat_id)
+            )
+
+    @staticmethod
+    def get_user_chat_ids(user_id: int) -> list[int]:
+        with PostgresDatabase() as db:
+            chats = db.fetch(
+                """
+                    SELECT ch.id AS id
+                    FROM chats ch
+                    JOIN chats_users chu
+                        ON chu.chat_id = ch.id
+                    WHERE chu.user_id = %s;
+                """,
+                (user_id, ),
+                is_all=True
+            )
+        return [chat["id"] for chat in chats]
@@ -4,7 +4,9 @@ from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
 
 from server.app.models._base_model import BaseModel
+from server.app.models._async_base_model import AsyncBaseModel
 from server.app.database.database import PostgresDatabase
+from server.app.database.async_database import AsyncPostgresDatabase
 from server.app.utils.exceptions import GlobalException
 from server.app.utils.team_naming import generate_team_name
 
@@ -12,83 +14,99 @@ from server.app.utils.team_naming import generate_team_name
 class Order(BaseModel):
     table_name = "orders"
 
+    @staticmethod
+    def _get_orders_by_customer_query() -> str:
+        return (
+            """
+                WITH customers_orders AS (
+                    SELECT 
+                        o.id AS id, 
+                        o.name AS name, 
+                        o.description AS description, 
+                        o.customer_id AS customer_id,
+                        o.execution_type AS execution_type,
+                        o.performer_id AS performer_id,
+                        o.performer_team_id AS performer_team_id
+                    FROM orders o
+                    WHERE 
+                        o.customer_id = %s
+                        AND o.id < %s
+                    ORDER BY o.id DESC
+                    LIMIT %s
+                ),
+                selected_tags AS (
+                    SELECT ot.order_id AS order_id, ARRAY_AGG(t.name) AS tags
+                    FROM orders_tags ot
+                    JOIN tags t
+                        ON ot.tag_id = t.id
+                    WHERE ot.order_id IN (SELECT id FROM customers_orders)
+                    GROUP BY ot.order_id
+                )
+                SELECT 
+                    co.id AS id, 
+                    co.name AS name, 
+                    co.description AS description, 
+                    co.customer_id AS customer_id, 
+                    co.execution_type AS execution_type,
+                    co.performer_id AS performer_id,
+                    co.performer_team_id AS performer_team_id,
+                    i.image_link AS image_link,
+                    COALESCE(st.tags, '{}') AS tags
+                FROM customers_orders co
+                LEFT JOIN orders_images oi
+                    ON oi.order_id = co.id AND oi.is_main IS TRUE
+                LEFT JOIN images i
+                    ON i.id = oi.image_id
+                LEFT JOIN selected_tags st
+                    ON st.order_id = co.id
+                ORDER BY co.id DESC;
+            """
+        )
+
     @staticmethod
     def get_orders_by_customer(
-            customer_id: int
+            customer_id: int,
+            after_id: int,
+            limit: int
     ) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    WITH customers_orders AS (
-                        SELECT 
-                            o.id AS id, 
-                            o.name AS name, 
-                            o.description AS description, 
-                            o.customer_id AS customer_id,
-                            o.execution_type AS execution_type,
-                            COALESCE(o.performer_id, NULL) AS performer_id,
-                            COALESCE(o.performer_team_id, NULL) AS performer_team_id,
-                            COALESCE(i.image_link, NULL) AS image_link, 
-                            COALESCE(oi.is_main, NULL) AS is_main
-                        FROM orders o
-                        LEFT JOIN orders_images oi 
-                            ON o.id = oi.order_id
-                        LEFT JOIN images i 
-                            ON i.id = oi.image_id
-                        WHERE 
-                            customer_id = %s
-                            AND (oi.is_main IS TRUE OR oi.is_main IS NULL)
-                    ),
-                    selected_tags AS (
-                        SELECT ot.order_id AS order_id, ARRAY_AGG(t.name) AS tags
-                        FROM orders_tags ot
-                        JOIN tags t
-                            ON ot.tag_id = t.id
-                        GROUP BY ot.order_id
-                    )
-                    SELECT 
-                        id, 
-                        name, 
-                        description, 
-                        customer_id, 
-                        execution_type,
-                        performer_id,
-                        performer_team_id,
-                        image_link,
-                        st.tags AS tags
-                    FROM customers_orders co
-                    JOIN selected_tags st
-                        ON st.order_id = co.id;
-                """,
-                (customer_id, ),
+                Order._get_orders_by_customer_query(),
+                (customer_id, after_id, limit + 1),
                 is_all=True,
             )
 
+    @staticmethod
+    def _get_performers_by_customer_query() -> str:
+        return (
+            """
+                WITH selected_performers_ids AS (
+                    SELECT 
+                        ARRAY_AGG(id) AS order_ids, 
+                        performer_id
+                    FROM orders
+                    WHERE customer_id = %s
+                    GROUP BY performer_id 
+                )
+                SELECT 
+                    spf.order_ids AS order_ids,
+                    username,
+                    first_name, 
+                    last_name, 
+                    photo_link
+                FROM selected_performers_ids spf
+                JOIN users u 
+                    ON spf.performer_id = u.id
+            """
+        )
+
     @staticmethod
     def get_performers_by_customer(
             customer_id: int
     ) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    WITH selected_performers_ids AS (
-                        SELECT 
-                            ARRAY_AGG(id) AS order_ids, 
-                            performer_id
-                        FROM orders
-                        WHERE customer_id = %s
-                        GROUP BY performer_id 
-                    )
-                    SELECT 
-                        spf.order_ids AS order_ids,
-                        username,
-                        first_name, 
-                        last_name, 
-                        photo_link
-                    FROM selected_performers_ids spf
-                    JOIN users u 
-                        ON spf.performer_id = u.id
-                """,
+                Order._get_performers_by_customer_query(),
                 (customer_id, ),
                 is_all=True,
             )
@@ -98,84 +116,57 @@ class Order(BaseModel):
         customer_id: int
     ) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
-            with db.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(
-                    """
+            return db.fetch(
+                """
+                    WITH order_teams AS (
                         SELECT
                             ARRAY_AGG(id) AS order_ids,
                             performer_team_id
                         FROM orders
                         WHERE customer_id = %s AND performer_team_id IS NOT NULL
                         GROUP BY performer_team_id
-                    """,
-                    (customer_id, )
-                )
-                order_teams = cursor.fetchall()
-
-                for order_team in order_teams:
-                    cursor.execute(
-                        """
-                            SELECT 
-                                name,
-                                lead_id
-                            FROM teams
-                            WHERE id = %s 
-                        """,
-                        (order_team.get("performer_team_id"), )
                     )
-                    team = cursor.fetchone()
-
-                    cursor.execute(
-                        """
-                            SELECT
-                                username,
-                                first_name,
-                                last_name,
-                                photo_link
-                            FROM users
-                            WHERE id = %s
-                        """,
-                        (team.get("lead_id"), )
-                    )
-                    team_lead = cursor.fetchone()
-
-                    cursor.execute(
-                        """
-                            WITH selected_team AS (
-                                SELECT user_id
-                                FROM teams_users
-                                WHERE team_id = %s
-                            ),
-                            selected_users AS (
-                                SELECT 
-                                    username,
-                                    first_name,
-                                    last_name,
-                                    photo_link
-                                FROM users
-                                WHERE id = ANY (SELECT user_id FROM selected_team)
+                    SELECT
+                        ot.order_ids AS order_ids,
+                        t.name AS name,
+                        (
+                            SELECT json_build_object(
+                                'username', l.username,
+                                'first_name', l.first_name,
+                                'last_name', l.last_name,
+                                'photo_link', l.photo_link
                             )
-                            SELECT 
-                                username, 
-                                first_name,
-                                last_name,
-                                photo_link
-                            FROM selected_users
-                        """,
-                        (order_team.get("performer_team_id"), )
-                    )
-                    performers = cursor.fetchall()
-
-                    order_team.pop("performer_team_id")
-                    order_team["name"] = team.get("name")
-                    order_team["lead"] = team_lead
-                    order_team["performers"] = performers
-
-            return order_teams
+                            FROM users l
+                            WHERE l.id = t.lead_id
+                        ) AS lead,
+                        (
+                            SELECT COALESCE(
+                                json_agg(
+                                    json_build_object(
+                                        'username', u.username,
+                                        'first_name', u.first_name,
+                                        'last_name', u.last_name,
+                                        'photo_link', u.photo_link
+                                    )
+                                ),
+                                '[]'::json
+                            )
+                            FROM teams_users tu
+                            JOIN users u
+                                ON tu.user_id = u.id
+                            WHERE tu.team_id = t.id
+                        ) AS performers
+                    FROM order_teams ot
+                    JOIN teams t
+                        ON t.id = ot.performer_team_id
+                """,
+                (customer_id, ),
+                is_all=True
+            )
 
     @staticmethod
-    def _get_order_details_query() -> sql.Composed:
-        return sql.SQL(
+    def _get_order_details_query() -> str:
+        return (
             """
                 SELECT 
                     o.id AS id,
@@ -219,7 +210,8 @@ class Order(BaseModel):
         with PostgresDatabase() as db:
             return db.fetch(
                 query,
-                (order_id, )
+                (order_id, ),
+                prepared=True
             )
 
     @staticmethod
@@ -289,34 +281,22 @@ class Order(BaseModel):
                 order = cursor.fetchone()
 
                 if order_data["images_links"]:
-                    cursor.executemany(
-                        """
-                        INSERT INTO images (image_link)
-                        VALUES (%s)
-                        RETURNING id;
-                        """,
-                        [(link,) for link in order_data["images_links"]]
+                    images = db.bulk_insert(
+                        "images",
+                        ("image_link", ),
+                        [(link, ) for link in order_data["images_links"]],
+                        returning=("id", )
                     )
 
-                    image_ids = [row["id"] for row in cursor.fetchall()]
-
-                    order_images_data = [
-                        (order["id"], image_id, index == 0) for index, image_id in enumerate(image_ids)
-                    ]
-
-                    cursor.executemany(
-                        """
-                            INSERT INTO orders_images (order_id, image_id, is_main)
-                            VALUES (%s, %s, %s);
-                        """,
-                        order_images_data
+                    db.bulk_insert(
+                        "orders_images",
+                        ("order_id", "image_id", "is_main"),
+                        [(order["id"], image["id"], index == 0) for index, image in enumerate(images)]
                     )
 
-                cursor.executemany(
-                    """
-                        INSERT INTO orders_tags (order_id, tag_id)
-                        VALUES (%s, %s);
-                    """,
+                db.bulk_insert(
+                    "orders_tags",
+                    ("order_id", "tag_id"),
                     [(order["id"], tag) for tag in order_data["tags"]]
                 )
 
@@ -374,27 +354,17 @@ class Order(BaseModel):
                         (order_id, )
                     )
 
-                    cursor.executemany(
-                        """
-                        INSERT INTO images (image_link)
-                        VALUES (%s)
-                        RETURNING id;
-                        """,
-                        [(link,) for link in order_data["images_links"]]
+                    images = db.bulk_insert(
+                        "images",
+                        ("image_link", ),
+                        [(link, ) for link in order_data["images_links"]],
+                        returning=("id", )
                     )
 
-                    image_ids = [row["id"] for row in cursor.fetchall()]
-
-                    order_images_data = [
-                        (order_id, image_id, index == 0) for index, image_id in enumerate(image_ids)
-                    ]
-
-                    cursor.executemany(
-                        """
-                            INSERT INTO orders_images (order_id, image_id, is_main)
-                            VALUES (%s, %s, %s);
-                        """,
-                        order_images_data
+                    db.bulk_insert(
+                        "orders_images",
+                        ("order_id", "image_id", "is_main"),
+                        [(order_id, image["id"], index == 0) for index, image in enumerate(images)]
                     )
 
                     order_data.pop("images_links")
@@ -408,11 +378,9 @@ class Order(BaseModel):
                         (order_id, )
                     )
 
-                    cursor.executemany(
-                        """
-                            INSERT INTO orders_tags (order_id, tag_id)
-                            VALUES (%s, %s);
-                        """,
+                    db.bulk_insert(
+                        "orders_tags",
+                        ("order_id", "tag_id"),
                         [(order_id, tag) for tag in order_data["tags"]]
                     )
 
@@ -477,59 +445,68 @@ class Order(BaseModel):
 
 
     @staticmethod
-    def get_all_unassigned_orders(user_id: int) -> dict[str, Any]:
-        with PostgresDatabase() as db:
-            with db.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(
-                    """
-                        WITH selected_order_ids AS (
-                            SELECT DISTINCT(ot.order_id) AS order_id
-                            FROM users_specialities usp
-                            JOIN specialities_tags spt
-                                ON spt.speciality_id = usp.speciality_id
-                            JOIN orders_tags ot
-                                ON ot.tag_id = spt.tag_id
-                            WHERE usp.user_id = %s
-                        )
-                        SELECT 
-                            o.id AS id,
-                            o.name AS name,
-                            o.description AS description,
-                            o.customer_id AS customer_id,
-                            o.execution_type AS execution_type,
-                            o.price AS price,
-                            ARRAY_AGG(DISTINCT i.image_link) 
-                                FILTER 
-                                    (WHERE i.image_link IS NOT NULL) 
-                                AS images_links,
-                            ARRAY_AGG(t.name) AS tags
-                        FROM orders o
-                        LEFT JOIN orders_images oi
-                            ON oi.order_id = o.id
-                        LEFT JOIN images i
-                            ON oi.image_id = i.id
-                        LEFT JOIN orders_tags ot
-                            ON ot.order_id = o.id
-                        LEFT JOIN tags t
-                            ON ot.tag_id = t.id
-                        WHERE 
-                            o.id = ANY(SELECT order_id FROM selected_order_ids)
-                            AND o.is_blocked IS NOT TRUE
-                            AND o.blocked_until IS NULL
-                            AND o.performer_id IS NULL
-                            AND o.performer_team_id IS NULL
-                        GROUP BY 
-                            o.id, 
-                            o.name, 
-                            o.description, 
-                            o.customer_id,
-                            o.execution_type,
-                            o.performer_id, 
-                            o.performer_team_id;
-                    """,
-                    (user_id, )
+    def _get_all_unassigned_orders_query() -> str:
+        return (
+            """
+                WITH selected_order_ids AS (
+                    SELECT DISTINCT(ot.order_id) AS order_id
+                    FROM users_specialities usp
+                    JOIN specialities_tags spt
+                        ON spt.speciality_id = usp.speciality_id
+                    JOIN orders_tags ot
+                        ON ot.tag_id = spt.tag_id
+                    WHERE usp.user_id = %s
                 )
-                return cursor.fetchall()
+                SELECT 
+                    o.id AS id,
+                    o.name AS name,
+                    o.description AS description,
+                    o.customer_id AS customer_id,
+                    o.execution_type AS execution_type,
+                    o.price AS price,
+                    ARRAY_AGG(DISTINCT i.image_link) 
+                        FILTER 
+                            (WHERE i.image_link IS NOT NULL) 
+                        AS images_links,
+                    ARRAY_AGG(t.name) AS tags
+                FROM orders o
+                LEFT JOIN orders_images oi
+                    ON oi.order_id = o.id
+                LEFT JOIN images i
+                    ON oi.image_id = i.id
+                LEFT JOIN orders_tags ot
+                    ON ot.order_id = o.id
+                LEFT JOIN tags t
+                    ON ot.tag_id = t.id
+                WHERE 
+                    o.id = ANY(SELECT order_id FROM selected_order_ids)
+                    AND o.is_blocked IS NOT TRUE
+                    AND o.blocked_until IS NULL
+                    AND o.performer_id IS NULL
+                    AND o.performer_team_id IS NULL
+                    AND o.id < %s
+                GROUP BY 
+                    o.id, 
+                    o.name, 
+                    o.description, 
+                    o.customer_id,
+                    o.execution_type,
+                    o.performer_id, 
+                    o.performer_team_id
+                ORDER BY o.id DESC
+                LIMIT %s;
+            """
+        )
+
+    @staticmethod
+    def get_all_unassigned_orders(user_id: int, after_id: int, limit: int) -> dict[str, Any]:
+        with PostgresDatabase() as db:
+            return db.fetch(
+                Order._get_all_unassigned_orders_query(),
+                (user_id, after_id, limit + 1),
+                is_all=True,
+                prepared=True
+            )
 
     @staticmethod
     def assign_single_performer_to_order(order_id: int, performer_id: int) -> dict[str, Any]:
@@ -607,7 +584,8 @@ class Order(BaseModel):
                                         name,
                                         description,
                                         customer_id,
-                                        execution_type
+                                        execution_type,
+                                        price
                                 )
                                 SELECT 
                                     uo.id AS id,
@@ -615,6 +593,7 @@ class Order(BaseModel):
                                     uo.description AS description,
                                     uo.customer_id AS customer_id,
                                     uo.execution_type AS execution_type,
+                                    uo.price AS price,
                                     ARRAY_AGG(DISTINCT i.image_link) 
                                         FILTER 
                                             (WHERE i.image_link IS NOT NULL) 
@@ -634,7 +613,8 @@ class Order(BaseModel):
                                     uo.name,
                                     uo.description,
                                     uo.customer_id,
-                                    uo.execution_type;
+                                    uo.execution_type,
+                                    uo.price;
                             """,
                             (performer_id, order_id, )
                         )
@@ -829,82 +809,167 @@ class Order(BaseModel):
                         print(result_order)
                         return result_order
 
+    @staticmethod
+    def _get_assigned_orders_by_performer_query() -> str:
+        return (
+            """
+                WITH performer_orders AS (
+                    SELECT o.id AS id
+                    FROM teams_users tu
+                    JOIN orders o
+                        ON o.performer_team_id = tu.team_id
+                    WHERE tu.user_id = %s
+                    UNION
+                    SELECT id
+                    FROM orders
+                    WHERE performer_id = %s
+                )
+                SELECT
+                    o.id AS id,
+                    o.name AS name,
+                    o.description AS description,
+                    o.customer_id AS customer_id,
+                    o.execution_type AS execution_type,
+                    o.price AS price,
+                    ARRAY_AGG(DISTINCT(i.image_link))
+                        FILTER
+                            (WHERE i.image_link IS NOT NULL)
+                        AS images_links,
+                    ARRAY_AGG(t.name) AS tags
+                    FROM orders o
+                    LEFT JOIN orders_images oi
+                        ON oi.order_id = o.id
+                    LEFT JOIN images i
+                        ON oi.image_id = i.id
+                    LEFT JOIN orders_tags ot
+                        ON ot.order_id = o.id
+                    LEFT JOIN tags t
+                        ON ot.tag_id = t.id
+                    WHERE o.id = ANY(SELECT id FROM performer_orders)
+                    GROUP BY 
+                        o.id,
+                        o.name,
+                        o.description,
+                        o.customer_id,
+                        o.execution_type,
+                        o.price;
+            """
+        )
+
     @staticmethod
     def get_assigned_orders_by_performer(performer_id: int) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    WITH selected_teams AS (
-                        SELECT t.id AS id
-                        FROM teams_users tu
-                        JOIN teams t
-                            ON t.id = tu.team_id
-                        WHERE tu.user_id = %s
-                    )
-                    SELECT
-                        o.id AS id,
-                        o.name AS name,
-                        o.description AS description,
-                        o.customer_id AS customer_id,
-                        o.execution_type AS execution_type,
-                        ARRAY_AGG(DISTINCT(i.image_link))
-                            FILTER
-                                (WHERE i.image_link IS NOT NULL)
-                            AS images_links,
-                        ARRAY_AGG(t.name) AS tags
-                        FROM orders o
-                        LEFT JOIN orders_images oi
-                            ON oi.order_id = o.id
-                        LEFT JOIN images i
-                            ON oi.image_id = i.id
-                        LEFT JOIN orders_tags ot
-                            ON ot.order_id = o.id
-                        LEFT JOIN tags t
-                            ON ot.tag_id = t.id
-                        WHERE performer_id = %s 
-                            OR performer_team_id = ANY(SELECT id FROM selected_teams)
-                        GROUP BY 
-                            o.id,
-                            o.name,
-                            o.description,
-                            o.customer_id,
-                            o.execution_type;
-                """,
+                Order._get_assigned_orders_by_performer_query(),
                 (performer_id, performer_id, ),
-                is_all=True
+                is_all=True,
             )
 
+    @staticmethod
+    def _get_customers_by_performer_query() -> str:
+        return (
+            """
+                WITH performer_orders AS (
+                    SELECT o.id AS id
+                    FROM teams_users tu
+                    JOIN orders o
+                        ON o.performer_team_id = tu.team_id
+                    WHERE tu.user_id = %s
+                    UNION
+                    SELECT id
+                    FROM orders
+                    WHERE performer_id = %s
+                ),
+                selected_customers AS (
+                    SELECT 
+                        ARRAY_AGG(id) AS order_ids,
+                        customer_id
+                    FROM orders
+                    WHERE id = ANY(SELECT id FROM performer_orders)
+                    GROUP BY customer_id
+                )
+                SELECT 
+                    sc.order_ids AS order_ids,
+                    username,
+                    first_name,
+                    last_name,
+                    photo_link
+                FROM selected_customers sc
+                JOIN users u
+                    ON sc.customer_id = u.id
+            """
+        )
+
     @staticmethod
     def get_customers_by_performer(performer_id: int) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    WITH selected_teams AS (
-                        SELECT t.id AS id
-                        FROM teams_users tu
-                        JOIN teams t
-                            ON t.id = tu.team_id
-                        WHERE tu.user_id = %s
-                    ),
-                    selected_customers AS (
-                        SELECT 
-                            ARRAY_AGG(id) AS order_ids,
-                            customer_id
-                        FROM orders
-                        WHERE performer_id = %s
-                            OR performer_team_id = ANY(SELECT id from selected_teams)
-                        GROUP BY customer_id
-                    )
-                    SELECT 
-                        sc.order_ids AS order_ids,
-                        username,
-                        first_name,
-                        last_name,
-                        photo_link
-                    FROM selected_customers sc
-                    JOIN users u
-                        ON sc.customer_id = u.id
-                """,
+                Order._get_customers_by_performer_query(),
                 (performer_id, performer_id, ),
-                is_all=True
+                is_all=True,
+            )
+
+
+class AsyncOrder(AsyncBaseModel):
+    table_name = "orders"
+
+    @staticmethod
+    async def get_orders_by_customer(
+            customer_id: int,
+            after_id: int,
+            limit: int
+    ) -> list[dict[str, Any]] | dict[str, Any] | None:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Order._get_orders_by_customer_query(),
+                (customer_id, after_id, limit + 1),
+                is_all=True,
+            )
+
+    @staticmethod
+    async def get_performers_by_customer(
+            customer_id: int
+    ) -> list[dict[str, Any]] | dict[str, Any] | None:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Order._get_performers_by_customer_query(),
+                (customer_id, ),
+                is_all=True,
+            )
+
+    @staticmethod
+    async def get_order_details(order_id: int) -> dict[str, Any] | None:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Order._get_order_details_query(),
+                (order_id, ),
+                prepared=True
+            )
+
+    @staticmethod
+    async def get_all_unassigned_orders(user_id: int, after_id: int, limit: int) -> list[dict[str, Any]]:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Order._get_all_unassigned_orders_query(),
+                (user_id, after_id, limit + 1),
+                is_all=True,
+                prepared=True,
+            )
+
+    @staticmethod
+    async def get_assigned_orders_by_performer(performer_id: int) -> list[dict[str, Any]] | dict[str, Any] | None:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Order._get_assigned_orders_by_performer_query(),
+                (performer_id, performer_id, ),
+                is_all=True,
+            )
+
+    @staticmethod
+    async def get_customers_by_performer(performer_id: int) -> list[dict[str, Any]] | dict[str, Any] | None:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Order._get_customers_by_performer_query(),
+                (performer_id, performer_id, ),
+                is_all=True,
             )
@@ -1,28 +1,69 @@
 from typing import Any
 
 from server.app.database.database import PostgresDatabase
+from server.app.database.async_database import AsyncPostgresDatabase
 from server.app.models._base_model import BaseModel
-from server.app.models.sql_builder import SQLBuilder
+from server.app.models._async_base_model import AsyncBaseModel
 
 
 class Payment(BaseModel):
     table_name = "payments"
 
     @staticmethod
-    def create_payment(user_id: int, payment: bytes) -> dict[str, Any]:
+    def create_payment(user_id: int, payment: bytes, payment_masked: str, payment_fingerprint: str) -> dict[str, Any]:
         with PostgresDatabase(on_commit=True) as db:
             return db.fetch(
                 """
-                    INSERT INTO payments (user_id, payment)
-                    VALUES (%s, %s)
-                    RETURNING id, payment 
+                    INSERT INTO payments (user_id, payment, payment_masked, payment_fingerprint)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING id, payment_masked
                 """,
-                (user_id, payment)
+                (user_id, payment, payment_masked, payment_fingerprint)
             )
 
     @staticmethod
-    def get_payments_by_user(user_id: int) -> list[dict[str, Any]]:
-        query, params = SQLBuilder("payments").select("id", "payment").where("user_id", params=user_id).get()
+    def _get_payments_by_user_query() -> str:
+        return (
+            """
+                SELECT
+                    id,
+                    payment_masked,
+                    CASE WHEN payment_masked IS NULL THEN payment END AS payment
+                FROM payments
+                WHERE user_id = %s
+            """
+        )
 
+    @staticmethod
+    def get_payments_by_user(user_id: int) -> list[dict[str, Any]]:
         with PostgresDatabase() as db:
-            return db.fetch(query, params, is_all=True)
+            return db.fetch(
+                Payment._get_payments_by_user_query(),
+                (user_id, ),
+                is_all=True
+            )
+
+
+class AsyncPayment(AsyncBaseModel):
+    table_name = "payments"
+
+    @staticmethod
+    async def create_payment(user_id: int, payment: bytes, payment_masked: str, payment_fingerprint: str) -> dict[str, Any]:
+        async with AsyncPostgresDatabase(on_commit=True) as db:
+            return await db.fetch(
+                """
+                    INSERT INTO payments (user_id, payment, payment_masked, payment_fingerprint)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING id, payment_masked
+                """,
+                (user_id, payment, payment_masked, payment_fingerprint)
+            )
+
+    @staticmethod
+    async def get_payments_by_user(user_id: int) -> list[dict[str, Any]]:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                Payment._get_payments_by_user_query(),
+                (user_id, ),
+                is_all=True
+            )
@@ -29,7 +29,7 @@ class Plan(BaseModel):
             plan_id: int,
             plan_name: str,
     ) -> dict[str, Any]:
-        with PostgresDatabase() as db:
+        with PostgresDatabase(on_commit=True) as db:
             return db.fetch(
                 """
                     UPDATE plans
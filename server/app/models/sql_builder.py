@@ -1,14 +1,76 @@
-import traceback
+from collections import OrderedDict
+import threading
 
 from psycopg2 import sql
 
-from server.app.database.database import PostgresDatabase
-from server.app.utils.logger import logger
-
 
 ALLOWED_OPERATORS = {
     "<", ">", "=", "<=", ">=", "<>", "IS", "IS NOT", "IN", "NOT IN", "LIKE", "ILIKE"
 }
+ALLOWED_JOINS = {"INNER", "LEFT", "RIGHT", "FULL"}
+ALLOWED_AGGREGATES = {"COUNT", "SUM", "AVG", "MIN", "MAX"}
+ALLOWED_DIRECTIONS = {"ASC", "DESC"}
+
+COMPILED_QUERY_CACHE_SIZE = 256
+
+_compiled_queries: OrderedDict[tuple, "CompiledQuery"] = OrderedDict()
+_compiled_queries_lock = threading.Lock()
+
+
+def _default_operator(param) -> str:
+    return "IS" if param is None else "="
+
+
+def _check_operator(operator: str) -> str:
+    if operator.upper() not in ALLOWED_OPERATORS:
+        raise ValueError("Unsupported operator. Could not excute the query")
+    return operator.upper()
+
+
+def _identifier(column: str) -> sql.Composable:
+    if column == "*":
+        return sql.SQL("*")
+    if column.endswith(".*"):
+        return sql.Identifier(*column[:-2].split(".")) + sql.SQL(".*")
+    return sql.Identifier(*column.split("."))
+
+
+def _condition(column: str, operator: str) -> sql.Composable:
+    return sql.SQL("{} {} {}").format(_identifier(column), sql.SQL(operator), sql.Placeholder())
+
+
+class CompiledQuery(sql.Composed):
+    def __init__(self, seq):
+        super().__init__(seq)
+        self._rendered: str | None = None
+
+    def as_string(self, context) -> str:
+        if self._rendered is None:
+            self._rendered = super().as_string(context)
+        return self._rendered
+
+
+def _compile(shape: tuple, build) -> CompiledQuery:
+    with _compiled_queries_lock:
+        query = _compiled_queries.get(shape)
+        if query is not None:
+            _compiled_queries.move_to_end(shape)
+            return query
+
+    query = build()
+    query = CompiledQuery(query.seq if isinstance(query, sql.Composed) else [query])
+
+    with _compiled_queries_lock:
+        _compiled_queries[shape] = query
+        if len(_compiled_queries) > COMPILED_QUERY_CACHE_SIZE:
+            _compiled_queries.popitem(last=False)
+
+    return query
+
+
+def clear_compiled_queries() -> None:
+    with _compiled_queries_lock:
+        _compiled_queries.clear()
 
 
 class SQLBuilder:
@@ -20,10 +82,12 @@ class SQLBuilder:
         self.where_operators = []
         self.join_clauses = []
         self.group_by_columns = []
-        self.having_colnditions = []
-        self.limit = None
-        self.offset = None
+        self.having_conditions = []
+        self.order_by_columns = []
+        self.limit_count = None
+        self.offset_count = None
         self.params = []
+        self.having_params = []
 
     class Group:
         def __init__(self, parent, operator, column: str, param: str, query_operator: str = None):
@@ -36,22 +100,9 @@ class SQLBuilder:
 
 
         def _add(self, column: str, param: str, operator: str = None):
-            if not operator:
-                if param is None:
-                    operator = "IS"
-                else:
-                    operator = "="
-
-            if operator.upper() not in ALLOWED_OPERATORS:
-                raise ValueError("Unsupported operator. Could not excute the query")
-
-            self.conditions.append(
-                sql.SQL("{} {} {}").format(
-                    sql.Identifier(column),
-                    sql.SQL(operator),
-                    sql.Placeholder()
-                )
-            )
+            operator = _check_operator(operator or _default_operator(param))
+
+            self.conditions.append((column, operator))
             self.params.append(param)
 
             return self
@@ -69,17 +120,25 @@ class SQLBuilder:
             return self._add(column=column, param=param, operator=operator)
 
         def add_group(self, group):
-            self.conditions.append(sql.SQL("({})").format(group.comb()[0]))
+            self.conditions.append(group)
             self.params.extend(group.params)
 
             return self
 
+        def shape(self) -> tuple:
+            return self.operator, tuple(
+                condition.shape() if isinstance(condition, SQLBuilder.Group) else condition
+                for condition in self.conditions
+            )
+
         def comb(self):
             return sql.SQL(self.operator).join(
-                condition
+                sql.SQL("({})").format(condition.comb()[0])
+                if isinstance(condition, SQLBuilder.Group)
+                else _condition(*condition)
                 for condition in self.conditions
             ), self.params
-        
+
         def end(self):
             return self.parent
 
@@ -87,25 +146,66 @@ class SQLBuilder:
         if columns:
             self.select_columns.extend(columns)
         if not columns:
-            self.select_columns.append("*")     
+            self.select_columns.append("*")
+        return self
+
+    def join(self, table_name: str, left_column: str, right_column: str, how: str = "INNER"):
+        if how.upper() not in ALLOWED_JOINS:
+            raise ValueError("Unsupported join type. Could not excute the query")
+
+        self.join_clauses.append((how.upper(), table_name, left_column, right_column))
+
         return self
 
     def where(self, where_column: str, operator: str = None, **params):
         if not operator:
-            if None in params.values():
-                operator = "IS"
-            else:
-                operator = "="
-
-        if operator.upper() not in ALLOWED_OPERATORS:
-            raise ValueError("Unsupported operator. Could not excute the query")
+            operator = "IS" if None in params.values() else "="
 
         self.where_columns.append(where_column)
-        self.where_operators.append(operator)
+        self.where_operators.append(_check_operator(operator))
         self.params.extend(params.values())
 
         return self
 
+    def group_by(self, *columns):
+        self.group_by_columns.extend(columns)
+
+        return self
+
+    def having(self, aggregate: str, column: str, operator: str, param):
+        if aggregate.upper() not in ALLOWED_AGGREGATES:
+            raise ValueError("Unsupported aggregate. Could not excute the query")
+
+        self.having_conditions.append((aggregate.upper(), column, _check_operator(operator)))
+        self.having_params.append(param)
+
+        return self
+
+    def order_by(self, column: str, direction: str = "ASC"):
+        if direction.upper() not in ALLOWED_DIRECTIONS:
+            raise ValueError("Unsupported sort direction. Could not excute the query")
+
+        self.order_by_columns.append((column, direction.upper()))
+
+        return self
+
+    def limit(self, count: int):
+        self.limit_count = count
+
+        return self
+
+    def offset(self, count: int):
+        self.offset_count = count
+
+        return self
+
+    def keyset(self, column: str, after, limit: int, descending: bool = True):
+        self.where(column, "<" if descending else ">", **{column: after})
+        self.order_by_columns.append((column, "DESC" if descending else "ASC"))
+        self.limit_count = limit
+
+        return self
+
     def AND(self, column, param, operator = None):
         group = self.Group(
             parent=self,
@@ -128,39 +228,80 @@ class SQLBuilder:
         self.grouped_parts.append(group)
         return group
 
-    def get(self):
-        if self.select_columns:
-            query = sql.SQL("SELECT {} FROM {}").format(
-                sql.SQL(", ").join(
-                    sql.Identifier(column) if column != "*" else sql.SQL("*")
-                    for column in self.select_columns
-                ),
-                sql.Identifier(self.table_name)
+    def shape(self) -> tuple:
+        return (
+            self.table_name,
+            tuple(self.select_columns),
+            tuple(self.join_clauses),
+            tuple(zip(self.where_columns, self.where_operators)),
+            tuple(group.shape() for group in self.grouped_parts),
+            tuple(self.group_by_columns),
+            tuple(self.having_conditions),
+            tuple(self.order_by_columns),
+            self.limit_count is not None,
+            self.offset_count is not None,
+        )
+
+    def build(self) -> sql.Composed:
+        query = sql.SQL("SELECT {} FROM {}").format(
+            sql.SQL(", ").join(_identifier(column) for column in self.select_columns or ["*"]),
+            sql.Identifier(self.table_name)
+        )
+
+        for how, table_name, left_column, right_column in self.join_clauses:
+            query += sql.SQL(" {} JOIN {} ON {} = {}").format(
+                sql.SQL(how),
+                sql.Identifier(table_name),
+                _identifier(left_column),
+                _identifier(right_column)
             )
-            
-        if self.where_columns or self.grouped_parts:
-            query += sql.SQL(" WHERE ")
-
-            if self.where_columns:    
-                query += sql.SQL(" AND ").join(
-                    sql.SQL("{} {} {}").format(
-                        sql.Identifier(self.where_columns[i]),
-                        sql.SQL(self.where_operators[i]),
-                        sql.Placeholder()
-                    )
-                    for i in range(len(self.where_columns))
+
+        conditions = [
+            _condition(column, operator)
+            for column, operator in zip(self.where_columns, self.where_operators)
+        ]
+        conditions.extend(sql.SQL("({})").format(group.comb()[0]) for group in self.grouped_parts)
+
+        if conditions:
+            query += sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions)
+
+        if self.group_by_columns:
+            query += sql.SQL(" GROUP BY ") + sql.SQL(", ").join(map(_identifier, self.group_by_columns))
+
+        if self.having_conditions:
+            query += sql.SQL(" HAVING ") + sql.SQL(" AND ").join(
+                sql.SQL("{}({}) {} {}").format(
+                    sql.SQL(aggregate),
+                    _identifier(column),
+                    sql.SQL(operator),
+                    sql.Placeholder()
                 )
+                for aggregate, column, operator in self.having_conditions
+            )
 
-            if self.grouped_parts:
-                group_queries = []
-                group_params = []
+        if self.order_by_columns:
+            query += sql.SQL(" ORDER BY ") + sql.SQL(", ").join(
+                sql.SQL("{} {}").format(_identifier(column), sql.SQL(direction))
+                for column, direction in self.order_by_columns
+            )
 
-                for group in self.grouped_parts:
-                    query_part, params = group.comb()
-                    group_queries.append(query_part)
-                    group_params.extend(params)
+        if self.limit_count is not None:
+            query += sql.SQL(" LIMIT {}").format(sql.Placeholder())
+
+        if self.offset_count is not None:
+            query += sql.SQL(" OFFSET {}").format(sql.Placeholder())
+
+        return query
+
+    def get(self):
+        params = list(self.params)
+        for group in self.grouped_parts:
+            params.extend(group.params)
+        params.extend(self.having_params)
 
-                query += sql.SQL(" AND ").join(group_queries)
-                self.params.extend(group_params)
+        if self.limit_count is not None:
+            params.append(self.limit_count)
+        if self.offset_count is not None:
+            params.append(self.offset_count)
 
-        return query, self.params
+        return _compile(self.shape(), self.build), params
@@ -1,7 +1,5 @@
 from typing import Any
 
-from psycopg2.extras import RealDictCursor
-
 from server.app.models._base_model import BaseModel
 from server.app.database.database import PostgresDatabase
 
@@ -12,49 +10,39 @@ class Team(BaseModel):
     @staticmethod
     def get_order_team(team_id: int) -> dict[str, Any]:
         with PostgresDatabase() as db:
-            with db.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(
-                    """
-                        SELECT name, lead_id
-                        FROM teams
-                        WHERE id = %s
-                    """,
-                    (team_id, )
-                )
-                team = cursor.fetchone()
-
-                cursor.execute(
-                    """
-                        SELECT 
-                            username,
-                            first_name,
-                            last_name,
-                            photo_link
-                        FROM users
-                        WHERE id = %s;
-                    """,
-                    (team["lead_id"], )
-                )
-                lead = cursor.fetchone()
-
-                cursor.execute(
-                    """
-                        SELECT 
-                            username,
-                            first_name,
-                            last_name,
-                            photo_link
-                        FROM users u
-                        JOIN teams_users tu
-                            ON tu.user_id = u.id
-                        WHERE tu.team_id = %s;
-                    """,
-                    (team_id, )
-                )
-                team_users = cursor.fetchall()
-
-        team.pop("lead_id")
-        team["lead"] = lead
-        team["performers"] = team_users
-    
-        return team
+            return db.fetch(
+                """
+                    SELECT
+                        t.name AS name,
+                        (
+                            SELECT json_build_object(
+                                'username', l.username,
+                                'first_name', l.first_name,
+                                'last_name', l.last_name,
+                                'photo_link', l.photo_link
+                            )
+                            FROM users l
+                            WHERE l.id = t.lead_id
+                        ) AS lead,
+                        (
+                            SELECT COALESCE(
+                                json_agg(
+                                    json_build_object(
+                                        'username', u.username,
+                                        'first_name', u.first_name,
+                                        'last_name', u.last_name,
+                                        'photo_link', u.photo_link
+                                    )
+                                ),
+                                '[]'::json
+                            )
+                            FROM teams_users tu
+                            JOIN users u
+                                ON tu.user_id = u.id
+                            WHERE tu.team_id = t.id
+                        ) AS performers
+                    FROM teams t
+                    WHERE t.id = %s
+                """,
+                (team_id, )
+            )
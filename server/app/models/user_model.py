@@ -1,11 +1,15 @@
 from enum import Enum
-from typing import Any
+from typing import Any, Iterator
 
 from psycopg2.extras import RealDictCursor
 from psycopg2 import sql
+from psycopg import sql as async_sql
 
-from server.app.database.database import PostgresDatabase
+from server.app.database.database import PostgresDatabase, stream_batches
+from server.app.database.async_database import AsyncPostgresDatabase
 from server.app.models._base_model import BaseModel
+from server.app.models._async_base_model import AsyncBaseModel
+from server.app.utils.user_cache import user_principals
 
 
 class UserPlanEnum(Enum):
@@ -16,38 +20,54 @@ class UserPlanEnum(Enum):
 class User(BaseModel):
     table_name = "users"
 
+    @classmethod
+    def delete_record_by_id(cls, record_id: int) -> int | None:
+        with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(lambda: user_principals.invalidate(record_id))
+
+            return db.execute_query(
+                f"DELETE FROM {cls.table_name} WHERE id = %s",
+                (record_id,),
+            )
+
+    @staticmethod
+    def _get_user_by_id_query() -> str:
+        return (
+            """
+                SELECT 
+                    u.id AS id,
+                    first_name,
+                    last_name,
+                    username,
+                    email,
+                    phone_number,
+                    photo_link,
+                    description,
+                    balance,
+                    rating,
+                    pln.name AS plan_name,
+                    is_verified,
+                    block_expired,
+                    delete_date,
+                    is_blocked
+                FROM users u
+                JOIN plans pln
+                    ON pln.id = u.plan_id
+                WHERE u.id = %s 
+            """
+        )
+
     @staticmethod
     def get_user_by_id(user_id: int) -> dict[str, Any]:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    SELECT 
-                        u.id AS id,
-                        first_name,
-                        last_name,
-                        username,
-                        email,
-                        phone_number,
-                        photo_link,
-                        description,
-                        balance,
-                        rating,
-                        pln.name AS plan_name,
-                        is_verified,
-                        block_expired,
-                        delete_date,
-                        is_blocked
-                    FROM users u
-                    JOIN plans pln
-                        ON pln.id = u.plan_id
-                    WHERE u.id = %s 
-                """,
+                User._get_user_by_id_query(),
                 (user_id, )
             )
 
     @staticmethod
-    def get_user_by_field_extended(field: str, value: str | int) -> dict[str, Any]:
-        query = sql.SQL(
+    def _get_user_by_field_extended_query() -> str:
+        return (
             """
                 SELECT 
                     u.id AS id,
@@ -70,17 +90,25 @@ class User(BaseModel):
                     ON pln.id = u.plan_id
                 WHERE {} = {} 
             """
-        ).format(sql.Identifier(field), sql.Placeholder())
+        )
+
+    @staticmethod
+    def get_user_by_field_extended(field: str, value: str | int) -> dict[str, Any]:
+        query = sql.SQL(User._get_user_by_field_extended_query()).format(
+            sql.Identifier(field),
+            sql.Placeholder()
+        )
 
         with PostgresDatabase() as db:
             return db.fetch(
                 query,
-                (value, )
+                (value, ),
+                prepared=True
             )
 
     @staticmethod
-    def get_user_by_field(field: str, value: str | int) -> dict[str, Any]:
-        query = sql.SQL(
+    def _get_user_by_field_query() -> str:
+        return (
             """
                 SELECT 
                     u.id AS id,
@@ -99,7 +127,14 @@ class User(BaseModel):
                     ON pln.id = u.plan_id
                 WHERE {} = {} 
             """
-        ).format(sql.Identifier(field), sql.Placeholder())
+        )
+
+    @staticmethod
+    def get_user_by_field(field: str, value: str | int) -> dict[str, Any]:
+        query = sql.SQL(User._get_user_by_field_query()).format(
+            sql.Identifier(field),
+            sql.Placeholder()
+        )
 
         with PostgresDatabase() as db:
             return db.fetch(
@@ -107,19 +142,25 @@ class User(BaseModel):
                 (value, )
             )
 
+    @staticmethod
+    def _get_order_performer_query() -> str:
+        return (
+            """
+                SELECT 
+                    username,
+                    first_name,
+                    last_name,
+                    photo_link
+                FROM users
+                WHERE id = %s;
+            """
+        )
+
     @staticmethod
     def get_order_performer(user_id: int) -> dict[str, Any]:
         with PostgresDatabase() as db:
             return db.fetch(
-                """
-                    SELECT 
-                        username,
-                        first_name,
-                        last_name,
-                        photo_link
-                    FROM users
-                    WHERE id = %s;
-                """,
+                User._get_order_performer_query(),
                 (user_id, )
             )
 
@@ -139,31 +180,49 @@ class User(BaseModel):
                 return cursor.fetchone()[0]
 
     @staticmethod
-    def get_all_users(plan_name: str, limit: int) -> list[dict[str, Any]]:
-        query = sql.SQL("""
-            SELECT
-                u.id,
-                u.first_name,
-                u.last_name,
-                u.username,
-                u.email,
-                u.phone_number,
-                u.photo_link,
-                u.description,
-                u.balance,
-                u.rating,
-                p.name as plan_name
-            FROM users u
-            INNER JOIN plans p ON u.plan_id = p.id 
-        """)
+    def _get_all_users_query() -> str:
+        return (
+            """
+                SELECT
+                    u.id,
+                    u.first_name,
+                    u.last_name,
+                    u.username,
+                    u.email,
+                    u.phone_number,
+                    u.photo_link,
+                    u.description,
+                    u.balance,
+                    u.rating,
+                    p.name as plan_name
+                FROM users u
+                INNER JOIN plans p ON u.plan_id = p.id 
+            """
+        )
+
+    @staticmethod
+    def _build_all_users_query(
+            plan_name: str,
+            limit: int,
+            after_id: int | None = None
+    ) -> tuple[sql.Composed, tuple]:
+        conditions = []
         params = tuple()
 
+        if after_id is not None:
+            conditions.append(sql.SQL("u.id < {}").format(sql.Placeholder()))
+            params += (after_id, )
         if plan_name:
-            query = sql.Composed([
-                query,
-                sql.SQL(" WHERE p.name = {}").format(sql.Placeholder())
-            ])
+            conditions.append(sql.SQL("p.name = {}").format(sql.Placeholder()))
             params += (plan_name, )
+
+        query = sql.SQL(User._get_all_users_query())
+
+        if conditions:
+            query = sql.Composed([query, sql.SQL(" WHERE "), sql.SQL(" AND ").join(conditions)])
+
+        query = sql.Composed([query, sql.SQL(" ORDER BY u.id DESC")])
+
         if limit:
             query = sql.Composed([
                 query,
@@ -171,6 +230,12 @@ class User(BaseModel):
             ])
             params += (limit, )
 
+        return query, params
+
+    @staticmethod
+    def get_all_users(plan_name: str, after_id: int, limit: int) -> list[dict[str, Any]]:
+        query, params = User._build_all_users_query(plan_name, limit + 1, after_id)
+
         with PostgresDatabase() as db:
             return db.fetch(
                 query=query,
@@ -178,6 +243,12 @@ class User(BaseModel):
                 is_all=True,
             )
 
+    @staticmethod
+    def stream_all_users(plan_name: str, limit: int) -> Iterator[list[dict[str, Any]]]:
+        query, params = User._build_all_users_query(plan_name, limit)
+
+        return stream_batches(query, params)
+
     @staticmethod
     def _create_user(user_plan: UserPlanEnum) -> sql.Composed:
         return sql.SQL("""
@@ -228,14 +299,18 @@ class User(BaseModel):
                     )
                 )
                 user = cursor.fetchone()
-                user_payment = user_data.get("payment")
 
                 cursor.execute(
                     """
-                        INSERT INTO payments (user_id, payment)
-                        VALUES (%s, %s)
+                        INSERT INTO payments (user_id, payment, payment_masked, payment_fingerprint)
+                        VALUES (%s, %s, %s, %s)
                     """,
-                    (user.get("id"), user_payment)
+                    (
+                        user.get("id"),
+                        user_data.get("payment"),
+                        user_data.get("payment_masked"),
+                        user_data.get("payment_fingerprint")
+                    )
                 )
     
         return user
@@ -261,12 +336,10 @@ class User(BaseModel):
                 user_specialities = user_data.get("specialities", None)
 
                 if user_specialities:
-                    cursor.executemany(
-                        """
-                            INSERT INTO users_specialities (user_id, speciality_id)
-                            VALUES (%s, %s);
-                        """,
-                        [(speciality, user.get("id")) for speciality in user_specialities]
+                    db.bulk_insert(
+                        "users_specialities",
+                        ("user_id", "speciality_id"),
+                        [(user.get("id"), speciality) for speciality in user_specialities]
                     )
                 
         user["specialities"] = user_specialities
@@ -294,6 +367,8 @@ class User(BaseModel):
         query = User._update_user(user_data)
 
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(lambda: user_principals.invalidate(user_id))
+
             with db.connection.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute(
                     query,
@@ -327,6 +402,8 @@ class User(BaseModel):
         query = User._update_user(user_data)
 
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(lambda: user_principals.invalidate(user_id))
+
             with db.connection.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute(
                     query,
@@ -344,12 +421,10 @@ class User(BaseModel):
                         (user_id, )
                     )
                     
-                    cursor.executemany(
-                        """
-                            INSERT INTO users_specialities (user_id, speciality_id)
-                            VALUES (%s, %s);
-                        """,
-                        [(speciality, user_id) for speciality in user_specialities]
+                    db.bulk_insert(
+                        "users_specialities",
+                        ("user_id", "speciality_id"),
+                        [(user_id, speciality) for speciality in user_specialities]
                     )
                 
                 cursor.execute(
@@ -385,6 +460,8 @@ class User(BaseModel):
         query = User._update_user(user_data)
 
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(lambda: user_principals.invalidate(user_id))
+
             with db.connection.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute(
                     query,
@@ -417,3 +494,95 @@ class User(BaseModel):
                 )
 
                 return cursor.fetchone()
+
+
+class AsyncUser(AsyncBaseModel):
+    table_name = "users"
+
+    @staticmethod
+    async def get_user_by_id(user_id: int) -> dict[str, Any]:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                User._get_user_by_id_query(),
+                (user_id, )
+            )
+
+    @staticmethod
+    async def get_user_by_field_extended(field: str, value: str | int) -> dict[str, Any]:
+        query = async_sql.SQL(User._get_user_by_field_extended_query()).format(
+            async_sql.Identifier(field),
+            async_sql.Placeholder()
+        )
+
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                query,
+                (value, ),
+                prepared=True
+            )
+
+    @staticmethod
+    async def get_user_by_field(field: str, value: str | int) -> dict[str, Any]:
+        query = async_sql.SQL(User._get_user_by_field_query()).format(
+            async_sql.Identifier(field),
+            async_sql.Placeholder()
+        )
+
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                query,
+                (value, )
+            )
+
+    @staticmethod
+    async def get_user_hashed_password(user_id: int) -> str | None:
+        async with AsyncPostgresDatabase() as db:
+            user = await db.fetch(
+                """
+                    SELECT password
+                    FROM users
+                    WHERE id = %s
+                """,
+                (user_id, )
+            )
+
+            return user.get("password")
+
+    @staticmethod
+    async def update_user_password(user_id: int, hashed_password: str) -> int:
+        async with AsyncPostgresDatabase(on_commit=True) as db:
+            return await db.execute_query(
+                """
+                    UPDATE users
+                    SET password = %s
+                    WHERE id = %s
+                """,
+                (hashed_password, user_id)
+            )
+
+    @staticmethod
+    async def get_order_performer(user_id: int) -> dict[str, Any]:
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                User._get_order_performer_query(),
+                (user_id, )
+            )
+
+    @staticmethod
+    async def get_all_users(plan_name: str, after_id: int, limit: int) -> list[dict[str, Any]]:
+        query = async_sql.SQL(User._get_all_users_query()) + async_sql.SQL(" WHERE u.id < {}").format(async_sql.Placeholder())
+        params = (after_id, )
+
+        if plan_name:
+            query += async_sql.SQL(" AND p.name = {}").format(async_sql.Placeholder())
+            params += (plan_name, )
+
+        query += async_sql.SQL(" ORDER BY u.id DESC LIMIT {}").format(async_sql.Placeholder())
+        params += (limit + 1, )
+
+        async with AsyncPostgresDatabase() as db:
+            return await db.fetch(
+                query=query,
+                params=params,
+                is_all=True,
+            )
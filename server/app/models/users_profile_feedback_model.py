@@ -5,6 +5,7 @@ from psycopg2.extras import RealDictCursor
 
 from server.app.models._base_model import BaseModel
 from server.app.database.database import PostgresDatabase
+from server.app.utils.user_cache import user_principals
 
 
 class UserProfileFeedback(BaseModel):
@@ -17,6 +18,8 @@ class UserProfileFeedback(BaseModel):
             feedback: dict[str, Any]
     ) -> dict[str, Any] | None:
         with PostgresDatabase(on_commit=True) as db:
+            db.after_commit(lambda: user_principals.invalidate(user_id))
+
             return db.fetch(
                 """
                     WITH inserted_feedback AS (
@@ -59,7 +62,11 @@ class UserProfileFeedback(BaseModel):
             )
 
     @staticmethod
-    def get_all_user_feedback(user_id: int) -> list[dict[str, Any]] | dict[str, Any] | None:
+    def get_all_user_feedback(
+            user_id: int,
+            after_id: int,
+            limit: int
+    ) -> list[dict[str, Any]] | dict[str, Any] | None:
         with PostgresDatabase() as db:
             return db.fetch(
                 """
@@ -74,7 +81,9 @@ class UserProfileFeedback(BaseModel):
                         FROM users_profile_feedbacks upf
                         LEFT JOIN users u
                             ON upf.commentator_id = u.id
-                        WHERE profile_id = %s
+                        WHERE profile_id = %s AND upf.id < %s
+                        ORDER BY upf.id DESC
+                        LIMIT %s
                     ),
                     selected_feedback_images AS (
                         SELECT image_link, profile_feedback_id
@@ -93,8 +102,9 @@ class UserProfileFeedback(BaseModel):
                     FROM selected_user_feedback suf
                     LEFT JOIN selected_feedback_images sfi
                         ON suf.id = sfi.profile_feedback_id
+                    ORDER BY id DESC
                 """,
-                (user_id,),
+                (user_id, after_id, limit + 1),
                 is_all=True
             )
 
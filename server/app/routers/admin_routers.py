@@ -1,7 +1,9 @@
 from typing import Any, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
+from server.app.database.unit_of_work import request_unit_of_work
+from server.app.controllers.admin_metrics_controller import AdminMetricsController
 from server.app.controllers.admin_plans_controller import AdminPlansController
 from server.app.controllers.admin_permissions_controller import AdminPermissionsController
 from server.app.controllers.admin_user_controller import AdminUserController
@@ -26,7 +28,7 @@ from server.app.schemas.plan_schemas import (
 from server.app.utils.exceptions import GlobalException
 
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(request_unit_of_work, scope="function")])
 
 
 @router.get("/permissions", response_model=list[PermissionResponse])
@@ -164,3 +166,45 @@ def block_user(
         user_id=user_id,
         block_timestamp=user_block_request.block_timestamp
     )
+
+
+@router.get("/metrics")
+@GlobalException.catcher
+@required_plans(["admin"])
+@required_permissions(["read_server_metrics"])
+async def get_server_metrics(
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    return AdminMetricsController.get_server_metrics()
+
+
+@router.get("/metrics/queries")
+@GlobalException.catcher
+@required_plans(["admin"])
+@required_permissions(["read_server_metrics"])
+async def get_top_queries(
+        limit: int = Query(20, ge=1, le=500, description="number of query fingerprints to return"),
+        order_by: str = Query("total_ms", pattern="^(total_ms|mean_ms|max_ms|calls|slow_calls)$"),
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    return AdminMetricsController.get_top_queries(limit, order_by)
+
+
+@router.get("/metrics/queries/slow")
+@GlobalException.catcher
+@required_plans(["admin"])
+@required_permissions(["read_server_metrics"])
+async def get_slow_queries(
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    return AdminMetricsController.get_slow_queries()
+
+
+@router.delete("/metrics/queries")
+@GlobalException.catcher
+@required_plans(["admin"])
+@required_permissions(["read_server_metrics"])
+async def reset_query_metrics(
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    AdminMetricsController.reset_query_metrics()
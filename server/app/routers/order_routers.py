@@ -1,7 +1,8 @@
 from typing import Any, Union, Annotated
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
+from server.app.database.unit_of_work import request_unit_of_work
 from server.app.schemas.order_schemas import (
     OrderCreate,
     OrderUpdate,
@@ -26,6 +27,8 @@ from server.app.controllers.order_customer_controller import OrderCustomerContro
 from server.app.controllers.order_performer_controller import OrderPerformerController
 from server.app.controllers.order_admin_controller import OrderAdminController
 from server.app.controllers.orders_logs_controller import OrdersLogsController
+from server.app.utils.streaming import ndjson_response
+from server.app.utils.pagination import get_page_params, set_next_cursor
 from server.app.utils.exceptions import GlobalException
 from server.app.utils.dependencies.dependencies import (
     get_current_user,
@@ -35,15 +38,21 @@ from server.app.utils.dependencies.dependencies import (
 from server.app.services.mqtt_service.mqtt_service import mqtt
 
 
-router = APIRouter(prefix="/orders", tags=["orders"])
+router = APIRouter(prefix="/orders", tags=["orders"], dependencies=[Depends(request_unit_of_work, scope="function")])
 
 
 @router.get("/customer/me/list", response_model=Union[list[OrderListResponse], OrderListResponse])
 @GlobalException.catcher
 @required_plans(["customer"])
 @required_permissions(["read_own_orders"])
-def get_order_list(user: dict[str, Any] = Depends(get_current_user)):
-    return OrderCustomerController.get_all_customer_orders(user.get("id"))
+def get_order_list(
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    orders = OrderCustomerController.get_all_customer_orders(user.get("id"), **page)
+
+    return set_next_cursor(response, orders, page["limit"])
 
 
 @router.get("/customer/me/performers")
@@ -184,10 +193,14 @@ def delete_order(
 @GlobalException.catcher
 @required_plans(["performer"])
 @required_permissions(["read_unassigned_orders"])
-def get_all_unassigned_orders(
+async def get_all_unassigned_orders(
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user)
 ):
-    return OrderPerformerController.get_orders(user.get("id"))
+    orders = await OrderPerformerController.get_orders(user.get("id"), **page)
+
+    return set_next_cursor(response, orders, page["limit"])
 
 
 @router.post("/performer/list/{order_id}", response_model=Union[OrderDetailResponseSingle, OrderDetailResponseTeam])
@@ -208,20 +221,20 @@ def assign_themself_to_order(
 @GlobalException.catcher
 @required_plans(["performer"])
 @required_permissions(["read_own_orders"])
-def get_all_own_orders(
+async def get_all_own_orders(
         user: dict[str, Any] = Depends(get_current_user)
 ):
-    return OrderPerformerController.get_assigned_orders(performer_id=user.get("id"))
+    return await OrderPerformerController.get_assigned_orders(performer_id=user.get("id"))
 
 
 @router.get("/performer/me/customers", response_model=Union[list[UserCustomerResponse], UserCustomerResponse])
 @GlobalException.catcher
 @required_plans(["performer"])
 @required_permissions(["read_own_orders", "read_own_orders_customers"])
-def get_all_assigned_orders_customers(
+async def get_all_assigned_orders_customers(
         user: dict[str, Any] = Depends(get_current_user)
 ):
-    return OrderPerformerController.get_all_performer_customers(performer_id=user.get("id"))
+    return await OrderPerformerController.get_all_performer_customers(performer_id=user.get("id"))
 
 
 @router.get("/admin/orders", response_model=Union[list[OrderListResponse], OrderListResponse])
@@ -229,9 +242,23 @@ def get_all_assigned_orders_customers(
 @required_plans(["admin", "moderator"])
 @required_permissions(["read_all_orders"])
 def get_all_orders(
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user)
 ):
-    return OrderAdminController.get_all_orders()
+    orders = OrderAdminController.get_all_orders(**page)
+
+    return set_next_cursor(response, orders, page["limit"])
+
+
+@router.get("/admin/orders/stream")
+@GlobalException.catcher
+@required_plans(["admin", "moderator"])
+@required_permissions(["read_all_orders"])
+def stream_all_orders(
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    return ndjson_response(OrderAdminController.stream_all_orders(), OrderListResponse)
 
 
 @router.get("/admin/orders/{order_id}", response_model=OrderDetailResponseBase)
@@ -263,10 +290,14 @@ def update_order(
 @required_permissions(["read_all_orders_details", "update_all_orders_details", "delete_all_orders"])
 def delete_order(
         order_id: int,
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user)
 ):
     OrderAdminController.delete_order_by_id(order_id=order_id)
-    return OrderAdminController.get_all_orders()
+    orders = OrderAdminController.get_all_orders(**page)
+
+    return set_next_cursor(response, orders, page["limit"])
 
 
 @router.put("/admin/orders/{order_id}", response_model=OrderSingleResponseExtended)
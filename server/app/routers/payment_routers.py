@@ -1,7 +1,8 @@
-from typing import Any, Union
+from typing import Annotated, Any, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from server.app.database.unit_of_work import request_unit_of_work
 from server.app.validators.payment_validators import PaymentValidator
 from server.app.controllers.payment_controller import PaymentController
 from server.app.utils.dependencies.dependencies import (
@@ -14,10 +15,13 @@ from server.app.schemas.payment_schemas import (
     PaymentResponse, 
     PaymentResponseExtended
 )
+from server.app.utils.crypto import get_masked_payment
+from server.app.utils.streaming import ndjson_response
+from server.app.utils.pagination import get_page_params, set_next_cursor
 from server.app.utils.exceptions import GlobalException
 
 
-router = APIRouter(prefix="/payments", tags=["payments"])
+router = APIRouter(prefix="/payments", tags=["payments"], dependencies=[Depends(request_unit_of_work, scope="function")])
 
 
 @router.post("/add_payment", response_model=PaymentResponse)
@@ -77,9 +81,27 @@ def delete_payment(
 @required_plans(["admin", "moderator"])
 @required_permissions(["read_all_users_payments"])
 def get_all_payments(
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user)
 ):
-    return PaymentController.get_all_users_payments()
+    payments = PaymentController.get_all_users_payments(**page)
+
+    return set_next_cursor(response, payments, page["limit"])
+
+
+@router.get("/list/stream")
+@GlobalException.catcher
+@required_plans(["admin", "moderator"])
+@required_permissions(["read_all_users_payments"])
+def stream_all_payments(
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    return ndjson_response(
+        PaymentController.stream_all_users_payments(),
+        PaymentResponseExtended,
+        transform=get_masked_payment
+    )
 
 
 @router.get("/{user_id}/list", response_model=Union[list[PaymentResponse], PaymentResponse])
@@ -1,4 +1,5 @@
 from typing import Any, Union
+import os
 
 from fastapi import APIRouter, Depends
 from google.protobuf import empty_pb2
@@ -17,6 +18,8 @@ from server.app.grpc.generated import (
 )
 
 
+GRPC_PAYMENTS_TARGET = os.getenv("GRPC_PAYMENTS_TARGET", "localhost:50051")
+
 router = APIRouter(prefix="/grpc/payments", tags=["grpc_payments"])
 
 
@@ -25,7 +28,7 @@ router = APIRouter(prefix="/grpc/payments", tags=["grpc_payments"])
 async def get_payment_list(
         token: str = Depends(get_token)
 ):
-    async with grpc.aio.insecure_channel('localhost:50051') as channel:
+    async with grpc.aio.insecure_channel(GRPC_PAYMENTS_TARGET) as channel:
         stub = payments_pb2_grpc.PaymentsServiceStub(channel)
         
         metadata = grpc.aio.Metadata(
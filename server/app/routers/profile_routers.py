@@ -1,8 +1,9 @@
-from typing import Any, Union
+from typing import Annotated, Any, Union
 import json
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
+from server.app.database.unit_of_work import request_unit_of_work
 from server.app.schemas.profile_feedback_schemas import (
     ProfileFeedbackCreate,
     ProfileFeedbackUpdate,
@@ -10,6 +11,7 @@ from server.app.schemas.profile_feedback_schemas import (
 )
 from server.app.controllers.profile_feedback_controller import ProfileFeedbackController
 from server.app.validators.profile_feedback_validators import ProfileFeedbackValidator
+from server.app.utils.pagination import get_page_params, set_next_cursor
 from server.app.utils.exceptions import GlobalException
 from server.app.utils.dependencies.dependencies import (
     get_current_user,
@@ -20,7 +22,7 @@ from server.app.utils.dependencies.feedback_permissions import can_delete_feedba
 from server.app.utils.redis_client import redis_client
 
 
-router = APIRouter(prefix="/profile", tags=["feedback"])
+router = APIRouter(prefix="/profile", tags=["feedback"], dependencies=[Depends(request_unit_of_work, scope="function")])
 
 
 @router.get("/me/feedback", response_model=Union[list[ProfileFeedbackResponse], ProfileFeedbackResponse])
@@ -28,9 +30,13 @@ router = APIRouter(prefix="/profile", tags=["feedback"])
 @required_plans(["customer", "performer"])
 @required_permissions(["read_all_feedbacks_own_profile"])
 def read_your_feedbacks(
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user),
 ):
-    return ProfileFeedbackController.get_all_user_feedback(user.get("id"))
+    feedback = ProfileFeedbackController.get_all_user_feedback(user.get("id"), **page)
+
+    return set_next_cursor(response, feedback, page["limit"])
 
 
 @router.get("/me/feedback/{feedback_id}", response_model=ProfileFeedbackResponse)
@@ -56,9 +62,13 @@ def read_your_feedbacks_details(
 @required_permissions(["read_all_feedbacks_selected_user"])
 def read_user_feedbacks(
         user_id: int,
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user),
 ):
-    return ProfileFeedbackController.get_all_user_feedback(user_id)
+    feedback = ProfileFeedbackController.get_all_user_feedback(user_id, **page)
+
+    return set_next_cursor(response, feedback, page["limit"])
 
 
 @router.post("/{user_id}/feedback", response_model=ProfileFeedbackResponse)
@@ -103,9 +113,13 @@ def update_feedback(
 def delete_feedback(
         user_id: int,
         feedback_id: int,
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
         user: dict[str, Any] = Depends(get_current_user),
 ):
-    return ProfileFeedbackController.delete_feedback(user_id=user_id, feedback_id=feedback_id)
+    feedback = ProfileFeedbackController.delete_feedback(user_id=user_id, feedback_id=feedback_id, **page)
+
+    return set_next_cursor(response, feedback, page["limit"])
 
 
 @router.get("/{user_id}/feedback/{feedback_id}", response_model=ProfileFeedbackResponse)
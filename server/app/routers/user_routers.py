@@ -1,8 +1,9 @@
-from typing import Any, Union
+from typing import Annotated, Any, Union
 
-from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, Query, BackgroundTasks, Response
 from fastapi.requests import Request
 
+from server.app.database.unit_of_work import request_unit_of_work
 from server.app.schemas.token_schemas import Token
 from server.app.schemas.users_schemas import (
     UserResponse,
@@ -23,15 +24,19 @@ from server.app.validators.user_validators import (
 )
 from server.app.utils.dependencies.dependencies import (
     get_current_user,
+    get_token,
     required_plans,
     required_permissions
 )
+from server.app.utils.streaming import ndjson_response
+from server.app.utils.pagination import get_page_params, set_next_cursor
 from server.app.utils.exceptions import GlobalException
+from server.app.utils.executor import handler_executor
 from server.app.utils.auth import oauth
 from server.app.services.smtp_service import send_reset_code
 
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], dependencies=[Depends(request_unit_of_work, scope="function")])
 
 
 @router.get("/google/login")
@@ -54,58 +59,58 @@ async def google_callback(request: Request):
     return await UserController.authenticate_user_google(token=token, plan=plan)
 
 
+def validate_user_create(user_data: UserCreateCustomer | UserCreatePerformer) -> None:
+    UserValidator(
+        MethodEnum.create,
+        user_data.username,
+        user_data.email,
+        user_data.password,
+        user_data.password_repeat,
+        user_data.phone_number) \
+        .validate_username() \
+        .validate_email() \
+        .validate_password() \
+        .validate_phone_number()
+
+
 @router.post("/customer/register", response_model=UserResponse)
 @GlobalException.catcher
-def create_user_customer(user_customer_data: UserCreateCustomer):
-    UserValidator(
-            MethodEnum.create,
-            user_customer_data.username,
-            user_customer_data.email,
-            user_customer_data.password,
-            user_customer_data.password_repeat,
-            user_customer_data.phone_number) \
-            .validate_username() \
-            .validate_email() \
-            .validate_password() \
-            .validate_phone_number()
+async def create_user_customer(user_customer_data: UserCreateCustomer):
+    await handler_executor.run(validate_user_create, user_customer_data)
 
-    return UserController.create_user_customer(user_customer_data.model_dump())
+    return await UserController.create_user_customer(user_customer_data.model_dump())
 
 
 @router.post("/performer/register", response_model=UserResponsePerformer)
 @GlobalException.catcher
-def create_user_performer(user_performer_data: UserCreatePerformer):
-    UserValidator(
-        MethodEnum.create,
-        user_performer_data.username,
-        user_performer_data.email,
-        user_performer_data.password,
-        user_performer_data.password_repeat,
-        user_performer_data.phone_number) \
-        .validate_username() \
-        .validate_email() \
-        .validate_password() \
-        .validate_phone_number()
+async def create_user_performer(user_performer_data: UserCreatePerformer):
+    await handler_executor.run(validate_user_create, user_performer_data)
 
-    return UserController.create_user_performer(user_performer_data.model_dump())
+    return await UserController.create_user_performer(user_performer_data.model_dump())
 
 
 @router.post("/token", response_model=Token)
 @GlobalException.catcher
-def create_user_token(user_data: UserCreateToken):
-    UserTokenValidator(
+async def create_user_token(user_data: UserCreateToken):
+    await UserTokenValidator(
         email=user_data.email,
         username=user_data.username,
         password=user_data.password) \
     .validate_user_exists()
 
-    return UserController.authenticate_user(user_data.model_dump())
+    return await UserController.authenticate_user(user_data.model_dump())
 
 
 @router.post("/token/refresh", response_model=Token)
 @GlobalException.catcher
-def refresh_user_token(refresh_tkn: dict[str, str]):
-    return UserController.refresh_bearer_token(refresh_tkn["refresh_token"])
+async def refresh_user_token(refresh_tkn: dict[str, str]):
+    return await UserController.refresh_bearer_token(refresh_tkn["refresh_token"])
+
+
+@router.post("/logout", status_code=204)
+@GlobalException.catcher
+async def logout_user(refresh_tkn: dict[str, str] | None = None, access_tkn: str = Depends(get_token)):
+    UserController.logout(access_tkn, (refresh_tkn or {}).get("refresh_token"))
 
 
 @router.get("/me", response_model=Union[UserResponse, UserResponsePerformer])
@@ -179,11 +184,26 @@ def delete_user(
 @required_plans(["admin", "moderator"])
 @required_permissions(["read_all_users_list"])
 def read_all_users(
+        response: Response,
+        page: Annotated[dict[str, int], Depends(get_page_params)],
+        plan: str = Query(None, description="filter by role"),
+        user: dict[str, Any] = Depends(get_current_user)
+):
+    users = UserController.get_all_users(plan, **page)
+
+    return set_next_cursor(response, users, page["limit"])
+
+
+@router.get("/list/stream")
+@GlobalException.catcher
+@required_plans(["admin", "moderator"])
+@required_permissions(["read_all_users_list"])
+def stream_all_users(
         plan: str = Query(None, description="filter by role"),
         limit: int = Query(None, description="number of users to return"),
         user: dict[str, Any] = Depends(get_current_user)
 ):
-    return UserController.get_all_users(plan, limit)
+    return ndjson_response(UserController.stream_all_users(plan, limit), UserResponse)
 
 
 @router.get("/{user_id}", response_model=Union[UserResponseExtended, UserResponseExtendedPerformer])
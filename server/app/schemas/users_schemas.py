@@ -51,7 +51,7 @@ class UserResponse(BaseModel):
 
 
 class UserResponsePerformer(UserResponse):
-    specialities: list[str] | None
+    specialities: list[int] | list[str] | None
 
 
 class UserResponseExtended(UserResponse):
@@ -1,7 +1,5 @@
-import json
-
-from server.app.utils.redis_client import redis_client
 from server.app.database.database import PostgresDatabase
+from server.app.utils.permission_snapshot import permission_snapshot
 
 
 def load_permissions():
@@ -22,19 +20,9 @@ def load_permissions():
 
     plans_permissions = {}
     for row in rows:
-        row = dict(row)
-        if row.get("id") not in plans_permissions:
-            plans_permissions[row.get("id")] = {
-                "name": row.get("name"),
-                "permissions": []
-            }
-        plans_permissions[row.get("id")]["permissions"].append(row.get("permission"))
+        plans_permissions.setdefault(row["name"], []).append(row["permission"])
 
-    for plan_id, data in plans_permissions.items():
-        key = data["name"]
-        redis_client.hset(key, mapping={
-            "permissions": json.dumps(data["permissions"])
-        })
+    permission_snapshot.publish(plans_permissions)
 
 
 if __name__ == '__main__':
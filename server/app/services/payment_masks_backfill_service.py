@@ -0,0 +1,67 @@
+import argparse
+
+from psycopg2.extras import execute_values
+
+from server.app.database.database import PostgresDatabase
+from server.app.utils.crypto import decrypt_many_data, fingerprint_payment, mask_payment
+from server.app.utils.logger import logger
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def backfill_payment_masks_batch(batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    with PostgresDatabase(on_commit=True) as db:
+        payments = db.fetch(
+            """
+                SELECT id, payment
+                FROM payments
+                WHERE payment_masked IS NULL
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """,
+            (batch_size, ),
+            is_all=True
+        )
+        if not payments:
+            return 0
+
+        rows = []
+        for payment, decrypted_payment in zip(payments, decrypt_many_data(payment["payment"] for payment in payments)):
+            decrypted_payment = decrypted_payment.decode("utf-8")
+            rows.append((payment["id"], mask_payment(decrypted_payment), fingerprint_payment(decrypted_payment)))
+
+        with db.connection.cursor() as cursor:
+            execute_values(
+                cursor,
+                """
+                    UPDATE payments p
+                    SET payment_masked = v.payment_masked, payment_fingerprint = v.payment_fingerprint
+                    FROM (VALUES %s) AS v (id, payment_masked, payment_fingerprint)
+                    WHERE p.id = v.id
+                """,
+                rows,
+                page_size=len(rows)
+            )
+
+        return len(rows)
+
+
+def backfill_payment_masks(batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    total = 0
+
+    while updated := backfill_payment_masks_batch(batch_size):
+        total += updated
+        logger.info("\x1b[1mPAYMENT MASKS BACKFILL\x1b[0m: %s payments updated", total)
+
+    logger.info("\x1b[1mPAYMENT MASKS BACKFILL\x1b[0m: Finished, %s payments updated", total)
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Store masked form and fingerprint for payments created before they existed")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="payments decrypted per transaction")
+    args = parser.parse_args()
+
+    backfill_payment_masks(args.batch_size)
@@ -0,0 +1,79 @@
+import argparse
+
+from psycopg2.extras import execute_values
+
+from server.app.database.database import PostgresDatabase
+from server.app.utils.crypto import decrypt_many_data, encrypt_data, envelope_cipher, fingerprint_payment, mask_payment
+from server.app.utils.envelope_encryption import ENVELOPE_VERSION
+from server.app.utils.logger import logger
+
+
+REENCRYPTION_BATCH_SIZE = 500
+
+
+def reencrypt_payments_batch(batch_size: int = REENCRYPTION_BATCH_SIZE) -> int:
+    with PostgresDatabase(on_commit=True) as db:
+        payments = db.fetch(
+            """
+                SELECT id, payment, payment_masked, payment_fingerprint
+                FROM payments
+                WHERE octet_length(payment) = %s OR get_byte(payment, 0) <> %s
+                ORDER BY id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """,
+            (envelope_cipher.legacy_size, ENVELOPE_VERSION, batch_size),
+            is_all=True
+        )
+        if not payments:
+            return 0
+
+        rows = []
+        for payment, decrypted_payment in zip(payments, decrypt_many_data(payment["payment"] for payment in payments)):
+            decrypted_payment = decrypted_payment.decode("utf-8")
+            rows.append((
+                payment["id"],
+                encrypt_data(decrypted_payment),
+                payment["payment_masked"] or mask_payment(decrypted_payment),
+                payment["payment_fingerprint"] or fingerprint_payment(decrypted_payment),
+            ))
+
+        with db.connection.cursor() as cursor:
+            execute_values(
+                cursor,
+                """
+                    UPDATE payments p
+                    SET payment = v.payment, payment_masked = v.payment_masked, payment_fingerprint = v.payment_fingerprint
+                    FROM (VALUES %s) AS v (id, payment, payment_masked, payment_fingerprint)
+                    WHERE p.id = v.id
+                """,
+                rows,
+                page_size=len(rows)
+            )
+
+        return len(rows)
+
+
+def reencrypt_payments(batch_size: int = REENCRYPTION_BATCH_SIZE) -> int:
+    total = 0
+
+    while updated := reencrypt_payments_batch(batch_size):
+        total += updated
+        logger.info("\x1b[1mPAYMENTS REENCRYPTION\x1b[0m: %s payments re-encrypted", total)
+
+    logger.info(
+        "\x1b[1mPAYMENTS REENCRYPTION\x1b[0m: Finished, %s payments re-encrypted, cipher stats %s",
+        total,
+        envelope_cipher.stats()
+    )
+    return total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=f"Re-encrypt RSA-only and older envelope payments into envelope version {ENVELOPE_VERSION}"
+    )
+    parser.add_argument("--batch-size", type=int, default=REENCRYPTION_BATCH_SIZE, help="payments re-encrypted per transaction")
+    args = parser.parse_args()
+
+    reencrypt_payments(args.batch_size)
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import json
+import statistics
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from server.app.utils.token_signer import TokenSigner, load_token_signer
+
+
+USER_DATA = {
+    "first_name": "Benchmark",
+    "last_name": "User",
+    "username": "benchmark_user_0123456789abcdef",
+    "email": "benchmark.user@example.com",
+    "phone_number": "+10000000000",
+    "plan_name": "performer",
+}
+
+KEY_GENERATORS: dict[str, Callable[[int], Any]] = {
+    "RS256": lambda rsa_key_size: rsa.generate_private_key(public_exponent=65537, key_size=rsa_key_size),
+    "ES256": lambda rsa_key_size: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": lambda rsa_key_size: ed25519.Ed25519PrivateKey.generate(),
+}
+
+
+def make_payload() -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "sub": USER_DATA["username"],
+        "iat": now.timestamp(),
+        "exp": now + timedelta(minutes=3000),
+        "content": USER_DATA,
+    }
+
+
+def measure(operation: Callable[[], Any], iterations: int, repeats: int) -> dict[str, float]:
+    rounds = []
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        rounds.append(time.perf_counter() - started_at)
+
+    best = min(rounds)
+    return {
+        "ops_per_second": round(iterations / best, 1),
+        "mean_us": round(statistics.mean(rounds) / iterations * 1_000_000, 2),
+        "best_us": round(best / iterations * 1_000_000, 2),
+    }
+
+
+def benchmark_signer(signer: TokenSigner, iterations: int, repeats: int) -> dict[str, Any]:
+    payload = make_payload()
+    token = signer.sign(payload)
+
+    return {
+        "algorithm": signer.algorithm,
+        "kid": signer.kid,
+        "token_bytes": len(token),
+        "sign": measure(lambda: signer.sign(payload), iterations, repeats),
+        "verify": measure(lambda: signer.verify(token), iterations, repeats),
+    }
+
+
+def run(algorithms: list[str], iterations: int, repeats: int, rsa_key_size: int, configured: bool) -> dict[str, Any]:
+    results = {}
+
+    for algorithm in algorithms:
+        signer = TokenSigner(signing_key=KEY_GENERATORS[algorithm](rsa_key_size))
+        results[algorithm] = benchmark_signer(signer, iterations, repeats)
+    if configured:
+        results["configured"] = benchmark_signer(load_token_signer(), iterations, repeats)
+
+    baseline = results.get("RS256")
+    if baseline is not None:
+        for result in results.values():
+            for operation in ("sign", "verify"):
+                result[operation]["speedup_vs_rs256"] = round(
+                    result[operation]["ops_per_second"] / baseline[operation]["ops_per_second"], 2
+                )
+
+    return {
+        "config": {
+            "iterations": iterations,
+            "repeats": repeats,
+            "rsa_key_size": rsa_key_size,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare JWT sign and verify throughput across the supported signing algorithms"
+    )
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(KEY_GENERATORS), default=list(KEY_GENERATORS))
+    parser.add_argument("--iterations", type=int, default=1000, help="operations per timed round")
+    parser.add_argument("--repeats", type=int, default=3, help="timed rounds per operation, the best one is reported")
+    parser.add_argument("--rsa-key-size", type=int, default=2048, help="modulus size of the generated RSA key")
+    parser.add_argument("--configured", action="store_true", help="also benchmark the signer configured from the environment")
+    parser.add_argument("--output", type=Path, help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report_json = json.dumps(
+        run(args.algorithms, args.iterations, args.repeats, args.rsa_key_size, args.configured),
+        indent=2
+    )
+    if args.output:
+        args.output.write_text(report_json + "\n")
+    else:
+        print(report_json)
@@ -0,0 +1,278 @@
+from pathlib import Path
+from typing import Any, Callable
+import argparse
+import json
+import sys
+
+from server.app.controllers.orders_logs_controller import OrdersLogsController
+from server.app.database.database import PostgresDatabase, UnitOfWork, set_unit_of_work, reset_unit_of_work
+from server.app.database.query_metrics import fingerprint, query_metrics
+from server.app.database.seed_data import DataSeeder
+from server.app.models.chat_model import Chat
+from server.app.models.order_model import Order
+from server.app.models.payment_model import Payment
+from server.app.models.permission_model import Permission
+from server.app.models.plan_model import Plan
+from server.app.models.speciality_model import Speciality
+from server.app.models.team_model import Team
+from server.app.models.user_model import User
+from server.app.models.users_profile_feedback_model import UserProfileFeedback
+from server.app.utils.pagination import DEFAULT_PAGE_SIZE, FIRST_PAGE_KEY
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "query_plans_baseline.json"
+BIG_TABLE_ROWS = 10_000
+COST_TOLERANCE = 0.25
+ALLOWED_SEQ_SCANS = {
+    "Order.get_performers_by_customer": {"users"},
+}
+EXPECTED_STATEMENTS = {
+    "Order.get_performer_teams_by_customer": 1,
+    "Team.get_order_team": 1,
+}
+
+
+def seed(scale: float = 1.0) -> None:
+    with PostgresDatabase() as db:
+        if db.fetch("SELECT COUNT(*) AS count FROM orders")["count"]:
+            sys.exit("Refusing to seed: the orders table is not empty. Point config.json at a scratch database.")
+
+    DataSeeder.scaled(scale).run()
+
+
+def sample_ids() -> dict[str, Any]:
+    with PostgresDatabase() as db:
+        ids = db.fetch(
+            """
+                SELECT
+                    (SELECT customer_id FROM orders GROUP BY customer_id ORDER BY COUNT(*) DESC LIMIT 1) AS customer_id,
+                    (SELECT performer_id FROM orders WHERE performer_id IS NOT NULL
+                        GROUP BY performer_id ORDER BY COUNT(*), performer_id
+                        OFFSET (SELECT COUNT(DISTINCT performer_id) / 2 FROM orders) LIMIT 1) AS performer_id,
+                    (SELECT MAX(id) FROM orders WHERE performer_id IS NOT NULL) AS order_id,
+                    (SELECT MAX(id) FROM teams) AS team_id,
+                    (SELECT MAX(id) FROM tags) AS tag_id,
+                    (SELECT MAX(id) FROM users_profile_feedbacks) AS feedback_id,
+                    (SELECT profile_id FROM users_profile_feedbacks ORDER BY id DESC LIMIT 1) AS profile_id,
+                    (SELECT chat_id FROM chats_users ORDER BY id DESC LIMIT 1) AS chat_id,
+                    (SELECT user_id FROM chats_users ORDER BY id DESC LIMIT 1) AS chat_user_id,
+                    (SELECT id FROM plans WHERE name = 'customer') AS plan_id,
+                    (SELECT username FROM users ORDER BY id DESC LIMIT 1) AS username,
+                    (SELECT email FROM users ORDER BY id DESC LIMIT 1) AS email
+            """
+        )
+        ids.update(
+            db.fetch(
+                """
+                    SELECT MAX(o.id) AS unassigned_order_id
+                    FROM orders o
+                    JOIN orders_tags ot
+                        ON ot.order_id = o.id
+                    JOIN specialities_tags spt
+                        ON spt.tag_id = ot.tag_id
+                    JOIN users_specialities usp
+                        ON usp.speciality_id = spt.speciality_id
+                    WHERE usp.user_id = %s
+                        AND o.execution_type = 'single'
+                        AND o.performer_id IS NULL
+                        AND o.is_blocked IS NOT TRUE
+                        AND o.blocked_until IS NULL
+                """,
+                (ids["performer_id"], )
+            )
+        )
+    return ids
+
+
+CASES: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "Order.get_orders_by_customer":
+        lambda ids: Order.get_orders_by_customer(ids["customer_id"], FIRST_PAGE_KEY, DEFAULT_PAGE_SIZE),
+    "Order.get_performers_by_customer": lambda ids: Order.get_performers_by_customer(ids["customer_id"]),
+    "Order.get_performer_teams_by_customer": lambda ids: Order.get_performer_teams_by_customer(ids["customer_id"]),
+    "Order.get_order_details": lambda ids: Order.get_order_details(ids["order_id"]),
+    "Order.increase_order_price": lambda ids: Order.increase_order_price(ids["order_id"], 10),
+    "Order.decrease_order_price": lambda ids: Order.decrease_order_price(ids["order_id"], 10),
+    "Order.create_order": lambda ids: Order.create_order(
+        ids["customer_id"],
+        {
+            "name": "Plan check order",
+            "description": "Plan check order",
+            "execution_type": "single",
+            "price": 100,
+            "images_links": ["https://cdn.example.com/plan-check.png"],
+            "tags": [ids["tag_id"]],
+        }
+    ),
+    "Order.update_order_by_id": lambda ids: Order.update_order_by_id(
+        ids["order_id"],
+        {"name": "Plan check order", "images_links": ["https://cdn.example.com/plan-check.png"], "tags": [ids["tag_id"]]}
+    ),
+    "Order.get_all_unassigned_orders":
+        lambda ids: Order.get_all_unassigned_orders(ids["performer_id"], FIRST_PAGE_KEY, DEFAULT_PAGE_SIZE),
+    "Order.assign_single_performer_to_order":
+        lambda ids: Order.assign_single_performer_to_order(ids["unassigned_order_id"], ids["performer_id"]),
+    "Order.get_assigned_orders_by_performer": lambda ids: Order.get_assigned_orders_by_performer(ids["performer_id"]),
+    "Order.get_customers_by_performer": lambda ids: Order.get_customers_by_performer(ids["performer_id"]),
+    "OrdersLogsController.log_created_order": lambda ids: OrdersLogsController.log_created_order(
+        {"id": ids["order_id"], "customer_id": ids["customer_id"], "price": 100, "name": "Plan check", "tags": ["seed"]}
+    ),
+    "OrdersLogsController.log_updated_order": lambda ids: OrdersLogsController.log_updated_order(
+        {"id": ids["order_id"], "customer_id": ids["customer_id"], "price": 110, "name": "Plan check", "tags": ["seed"]},
+        10
+    ),
+    "User.get_user_by_id": lambda ids: User.get_user_by_id(ids["customer_id"]),
+    "User.get_user_by_field": lambda ids: User.get_user_by_field("username", ids["username"]),
+    "User.get_user_by_field_extended": lambda ids: User.get_user_by_field_extended("email", ids["email"]),
+    "User.get_order_performer": lambda ids: User.get_order_performer(ids["performer_id"]),
+    "User.get_user_hashed_password": lambda ids: User.get_user_hashed_password(ids["customer_id"]),
+    "User.get_all_users": lambda ids: User.get_all_users("performer", FIRST_PAGE_KEY, DEFAULT_PAGE_SIZE),
+    "User.create_user_customer": lambda ids: User.create_user_customer(
+        {
+            "first_name": "Plan",
+            "last_name": "Check",
+            "username": "plan_check_user",
+            "email": "plan_check_user@example.com",
+            "password": "not-a-password-hash",
+            "payment": b"plan-check",
+        }
+    ),
+    "User.update_user": lambda ids: User.update_user(ids["customer_id"], {"first_name": "Plan"}),
+    "User.update_user_details": lambda ids: User.update_user_details(ids["customer_id"], {"description": "Plan"}),
+    "UserProfileFeedback.create_feedback": lambda ids: UserProfileFeedback.create_feedback(
+        ids["profile_id"],
+        ids["customer_id"],
+        {"content": "Plan check", "rate": 5, "image_link": None}
+    ),
+    "UserProfileFeedback.get_all_user_feedback":
+        lambda ids: UserProfileFeedback.get_all_user_feedback(ids["profile_id"], FIRST_PAGE_KEY, DEFAULT_PAGE_SIZE),
+    "UserProfileFeedback.get_user_feedback": lambda ids: UserProfileFeedback.get_user_feedback(ids["feedback_id"]),
+    "UserProfileFeedback.update_user_profile_feedback": lambda ids: UserProfileFeedback.update_user_profile_feedback(
+        ids["feedback_id"],
+        {"content": "Plan check", "rate": 4, "image_link": None}
+    ),
+    "Permission.get_permissions": lambda ids: Permission.get_permissions(),
+    "Permission.get_permissions_by_plan": lambda ids: Permission.get_permissions_by_plan("customer"),
+    "Plan.get_plan_detail_by_id": lambda ids: Plan.get_plan_detail_by_id(ids["plan_id"]),
+    "Speciality.get_users_specialities_array": lambda ids: Speciality.get_users_specialities_array(ids["performer_id"]),
+    "Payment.get_payments_by_user": lambda ids: Payment.get_payments_by_user(ids["customer_id"]),
+    "Team.get_order_team": lambda ids: Team.get_order_team(ids["team_id"]),
+    "Chat.get_order_chat_id": lambda ids: Chat.get_order_chat_id(ids["order_id"], ids["customer_id"]),
+    "Chat.is_order_participant": lambda ids: Chat.is_order_participant(ids["order_id"], ids["customer_id"]),
+    "Chat.create_order_chat": lambda ids: Chat.create_order_chat(ids["order_id"]),
+    "Chat.is_chat_member": lambda ids: Chat.is_chat_member(ids["chat_id"], ids["chat_user_id"]),
+    "Chat.get_chat_messages": lambda ids: Chat.get_chat_messages(ids["chat_id"]),
+    "Chat.add_chat_message": lambda ids: Chat.add_chat_message(ids["chat_id"], {"sender_id": ids["chat_user_id"]}),
+    "Chat.get_user_chat_ids": lambda ids: Chat.get_user_chat_ids(ids["chat_user_id"]),
+}
+
+
+def get_big_tables() -> set[str]:
+    with PostgresDatabase() as db:
+        return {
+            row["relname"]
+            for row in db.fetch(
+                """
+                    SELECT relname
+                    FROM pg_class
+                    WHERE relkind = 'r'
+                        AND relnamespace = 'public'::regnamespace
+                        AND reltuples >= %s
+                """,
+                (BIG_TABLE_ROWS, ),
+                is_all=True
+            )
+        }
+
+
+def walk_plan(node: dict[str, Any]):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk_plan(child)
+
+
+def explain_case(name: str, ids: dict[str, Any]) -> list[dict[str, Any]]:
+    unit_of_work = UnitOfWork()
+    token = set_unit_of_work(unit_of_work)
+    try:
+        with query_metrics.capture() as statements:
+            CASES[name](ids)
+
+        plans = []
+        with PostgresDatabase() as db:
+            for query, params in statements:
+                row = db.fetch(f"EXPLAIN (FORMAT JSON) {query}", params)
+                plans.append({"fingerprint": fingerprint(query), "plan": row["QUERY PLAN"][0]["Plan"]})
+        return plans
+    finally:
+        unit_of_work.complete(False)
+        reset_unit_of_work(token)
+
+
+def check(update_baseline: bool = False) -> list[str]:
+    ids = sample_ids()
+    big_tables = get_big_tables()
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    new_baseline = {}
+    failures = []
+
+    for name in CASES:
+        try:
+            plans = explain_case(name, ids)
+        except Exception as e:
+            failures.append(f"{name}: could not run: {e}")
+            continue
+
+        expected_statements = EXPECTED_STATEMENTS.get(name)
+        if expected_statements is not None and len(plans) != expected_statements:
+            failures.append(f"{name}: issued {len(plans)} statements, expected {expected_statements}")
+
+        new_baseline[name] = {}
+        for plan in plans:
+            cost = plan["plan"]["Total Cost"]
+            new_baseline[name][plan["fingerprint"]] = cost
+
+            seq_scans = sorted({
+                node["Relation Name"]
+                for node in walk_plan(plan["plan"])
+                if node["Node Type"] == "Seq Scan"
+                    and node["Relation Name"] in big_tables - ALLOWED_SEQ_SCANS.get(name, set())
+            })
+            if seq_scans:
+                failures.append(f"{name}: sequential scan on {', '.join(seq_scans)}\n    {plan['fingerprint']}")
+
+            baseline_cost = baseline.get(name, {}).get(plan["fingerprint"])
+            if baseline_cost is None:
+                print(f"NEW   {name}: cost {cost:.2f} (no baseline)")
+            elif cost > baseline_cost * (1 + COST_TOLERANCE):
+                failures.append(
+                    f"{name}: estimated cost grew from {baseline_cost:.2f} to {cost:.2f}\n    {plan['fingerprint']}"
+                )
+            else:
+                print(f"OK    {name}: cost {cost:.2f} (baseline {baseline_cost:.2f})")
+
+    if update_baseline:
+        BASELINE_PATH.write_text(json.dumps(new_baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN every model statement against a seeded database and fail on "
+                    "sequential scans of big tables, cost regressions against the stored baseline "
+                    "or extra statements from calls with a fixed query count"
+    )
+    parser.add_argument("--seed", action="store_true", help="seed an empty scratch database first")
+    parser.add_argument("--scale", type=float, default=1.0, help="seed size multiplier")
+    parser.add_argument("--update-baseline", action="store_true", help="store the current costs as the baseline")
+    args = parser.parse_args()
+
+    if args.seed:
+        seed(args.scale)
+
+    failures = check(update_baseline=args.update_baseline)
+    for failure in failures:
+        print(f"FAIL  {failure}")
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,90 @@
+from typing import Any
+import argparse
+import asyncio
+import sys
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from server.app.database.database import PostgresDatabase, close_pool
+from server.app.routers.admin_routers import router as admin_router
+from server.app.routers.order_routers import router as order_router
+from server.app.routers.payment_routers import router as payment_router
+from server.app.routers.profile_routers import router as profile_router
+from server.app.routers.user_routers import router as user_router
+from server.app.utils.exceptions import GlobalException
+
+
+BASE_URL = "http://unit-of-work-check"
+ROUTERS = {
+    "users": user_router,
+    "payments": payment_router,
+    "orders": order_router,
+    "admin": admin_router,
+    "profile": profile_router,
+}
+
+
+@GlobalException.catcher
+def write_with_failing_commit() -> dict[str, Any]:
+    with PostgresDatabase(on_commit=True) as db:
+        db.execute_query(
+            """
+                CREATE TEMPORARY TABLE unit_of_work_commit_check (
+                    id INTEGER UNIQUE DEFERRABLE INITIALLY DEFERRED
+                ) ON COMMIT DROP
+            """
+        )
+        db.execute_query("INSERT INTO unit_of_work_commit_check (id) VALUES (1), (1)")
+
+    return {"written": True}
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    for name, production_router in ROUTERS.items():
+        router = APIRouter(prefix=f"/{name}", dependencies=production_router.dependencies)
+        router.add_api_route("/commit-check", write_with_failing_commit, methods=["POST"])
+        app.include_router(router)
+
+    return app
+
+
+async def check() -> list[str]:
+    failures = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()), base_url=BASE_URL) as client:
+        for name in ROUTERS:
+            try:
+                response = await client.post(f"/{name}/commit-check")
+            except RuntimeError as e:
+                failures.append(f"/{name}: commit failed after the response had started: {e}")
+                continue
+
+            if response.status_code < 500:
+                failures.append(
+                    f"/{name}: commit failed after the handler but the client got {response.status_code} {response.text}"
+                )
+            else:
+                print(f"OK    /{name}: failing commit returned {response.status_code} {response.json()['detail']}")
+
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check that every router commits its unit of work before the response is sent, "
+                    "so a failing commit reaches the client as a 5xx"
+    )
+    parser.parse_args()
+
+    try:
+        failures = asyncio.run(check())
+    finally:
+        close_pool()
+
+    for failure in failures:
+        print(f"FAIL  {failure}")
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,322 @@
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator
+from uuid import uuid4
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import grpc
+import httpx
+
+from server.app.database.database import PostgresDatabase
+from server.app.grpc.generated import payments_pb2, payments_pb2_grpc
+from server.app.grpc.grpc_server import create_server
+from server.app.main import app
+from server.app.routers import payments_grpc_routers
+from server.app.utils.logger import logger
+
+
+BASE_URL = "http://load-harness"
+SOCKETIO_PATH = "/socket.io/"
+ENGINEIO_SEPARATOR = "\x1e"
+SOCKETIO_TIMEOUT_SECONDS = 10
+PASSWORD = "Load-harness-1"
+
+
+class LoadRecorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.journeys = 0
+        self.failed_journeys: dict[str, int] = defaultdict(int)
+
+    @asynccontextmanager
+    async def measure(self, route: str) -> AsyncIterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[route] += 1
+            raise
+        finally:
+            self.samples[route].append((time.perf_counter() - started_at) * 1000)
+
+    def report(self, duration: float, config: dict[str, Any]) -> dict[str, Any]:
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+            percentiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors.get(route, 0),
+                "throughput_rps": round(len(samples) / duration, 3),
+                "mean_ms": round(statistics.fmean(samples), 3),
+                "p50_ms": round(percentiles[49], 3),
+                "p95_ms": round(percentiles[94], 3),
+                "p99_ms": round(percentiles[98], 3),
+                "max_ms": round(samples[-1], 3),
+            }
+
+        return {
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "duration_s": round(duration, 3),
+            "config": config,
+            "journeys": self.journeys,
+            "failed_journeys": dict(self.failed_journeys),
+            "journeys_per_second": round(self.journeys / duration, 3),
+            "routes": routes,
+        }
+
+
+class HTTPUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: LoadRecorder):
+        self.client = client
+        self.recorder = recorder
+        self.token: str | None = None
+
+    async def request(self, method: str, route: str, path: str | None = None, **kwargs) -> Any:
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+        async with self.recorder.measure(f"{method} {route}"):
+            response = await self.client.request(method, path or route, headers=headers, **kwargs)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {path or route} returned {response.status_code}: {response.text[:200]}")
+
+        return response.json() if response.content else None
+
+    async def register(self, plan: str, username: str, **extra: Any) -> dict[str, Any]:
+        user = await self.request(
+            "POST",
+            f"/users/{plan}/register",
+            json={
+                "first_name": "Load",
+                "last_name": "Harness",
+                "username": username,
+                "email": f"{username.replace('_', '')}@example.com",
+                "password": PASSWORD,
+                "password_repeat": PASSWORD,
+                **extra,
+            }
+        )
+        token = await self.request("POST", "/users/token", json={"username": username, "password": PASSWORD})
+        self.token = token["access_token"]
+
+        return user
+
+
+class SocketIOUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: LoadRecorder, token: str):
+        self.client = client
+        self.recorder = recorder
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.sid: str | None = None
+        self.events: list[tuple[str, Any]] = []
+
+    async def _poll(self) -> None:
+        response = await self.client.get(
+            SOCKETIO_PATH,
+            params={"EIO": 4, "transport": "polling", "sid": self.sid},
+            headers=self.headers,
+            timeout=SOCKETIO_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+
+        for packet in response.text.split(ENGINEIO_SEPARATOR):
+            if packet == "2":
+                await self._send("3")
+            elif packet.startswith("42"):
+                event, *data = json.loads(packet[2:])
+                self.events.append((event, data[0] if data else None))
+            elif packet.startswith("41") or packet == "1":
+                raise RuntimeError("Socket.IO session was closed by the server")
+
+    async def _send(self, packet: str) -> None:
+        response = await self.client.post(
+            SOCKETIO_PATH,
+            params={"EIO": 4, "transport": "polling", "sid": self.sid},
+            headers=self.headers,
+            content=packet
+        )
+        response.raise_for_status()
+
+    async def wait_for(self, event: str) -> Any:
+        deadline = time.monotonic() + SOCKETIO_TIMEOUT_SECONDS
+
+        while time.monotonic() < deadline:
+            for index, (name, data) in enumerate(self.events):
+                if name == "socketio_error":
+                    raise RuntimeError(f"Socket.IO error while waiting for {event}: {data}")
+                if name == event:
+                    del self.events[index]
+                    return data
+            await self._poll()
+
+        raise TimeoutError(f"Socket.IO event {event} was not received")
+
+    async def connect(self) -> None:
+        async with self.recorder.measure("socket.io connect"):
+            response = await self.client.get(
+                SOCKETIO_PATH,
+                params={"EIO": 4, "transport": "polling"},
+                headers=self.headers
+            )
+            response.raise_for_status()
+            self.sid = json.loads(response.text[1:])["sid"]
+
+            await self._send("40")
+            await self.wait_for("user_connected")
+
+    async def call(self, event: str, data: dict[str, Any], reply: str) -> Any:
+        async with self.recorder.measure(f"socket.io {event}"):
+            await self._send("42" + json.dumps([event, data]))
+            return await self.wait_for(reply)
+
+    async def close(self) -> None:
+        if self.sid is not None:
+            await self._send("41")
+            self.sid = None
+
+
+async def journey(
+        client: httpx.AsyncClient,
+        payments: payments_pb2_grpc.PaymentsServiceStub,
+        recorder: LoadRecorder,
+        workload: dict[str, Any],
+        number: int
+) -> None:
+    run_id = workload["run_id"]
+    customer = HTTPUser(client, recorder)
+    performer = HTTPUser(client, recorder)
+
+    await customer.register("customer", f"load_{run_id}_c{number}", payment=workload["card"])
+    await customer.request("GET", "/users/me")
+
+    order = await customer.request(
+        "POST",
+        "/orders/customer/me",
+        json={
+            "name": f"Load harness order {number}",
+            "description": "Created by the load harness",
+            "execution_type": "single",
+            "images_links": [f"https://cdn.example.com/load/{run_id}/{number}.png"],
+            "tags": workload["tag_ids"],
+            "price": round(random.uniform(10, 1_000), 2),
+        }
+    )
+    await customer.request("GET", "/orders/customer/me/list")
+
+    await performer.register("performer", f"load_{run_id}_p{number}", specialities=[workload["speciality_id"]])
+    await performer.request("GET", "/orders/performer/list")
+    await performer.request(
+        "POST",
+        "/orders/performer/list/{order_id}",
+        f"/orders/performer/list/{order['id']}"
+    )
+    await performer.request("GET", "/orders/performer/me/list")
+
+    chat = SocketIOUser(client, recorder, customer.token)
+    try:
+        await chat.connect()
+        created = await chat.call("create_chat", {"order_id": order["id"]}, "chat_created")
+        for index in range(workload["messages"]):
+            await chat.call("send_message", {"chat_id": created["chat_id"], "content": f"Message {index}"}, "sent_message")
+    finally:
+        await chat.close()
+
+    metadata = (("authorization", f"Bearer {customer.token}"), )
+    async with recorder.measure("grpc PaymentsService/CreatePayment"):
+        await payments.CreatePayment(payments_pb2.CreatePaymentRequest(payment=workload["card"]), metadata=metadata)
+    await customer.request("GET", "/grpc/payments/me/list")
+    await customer.request("GET", "/payments/me/list")
+
+
+def get_workload(messages: int) -> dict[str, Any]:
+    with PostgresDatabase() as db:
+        speciality = db.fetch(
+            """
+                SELECT speciality_id, ARRAY_AGG(tag_id ORDER BY tag_id) AS tag_ids
+                FROM specialities_tags
+                GROUP BY speciality_id
+                ORDER BY COUNT(*) DESC, speciality_id
+                LIMIT 1
+            """
+        )
+    if not speciality:
+        sys.exit("No specialities with tags found. Seed the database with server.app.database.seed_data first.")
+
+    return {
+        "run_id": uuid4().hex[:8],
+        "speciality_id": speciality["speciality_id"],
+        "tag_ids": speciality["tag_ids"][:3],
+        "card": "4242424242424242",
+        "messages": messages,
+    }
+
+
+async def run(concurrency: int, journeys: int, messages: int) -> dict[str, Any]:
+    workload = get_workload(messages)
+    recorder = LoadRecorder()
+    numbers = iter(range(journeys))
+
+    with tempfile.TemporaryDirectory(prefix="load-harness-") as directory:
+        grpc_target = f"unix:{Path(directory) / 'grpc.sock'}"
+        payments_grpc_routers.GRPC_PAYMENTS_TARGET = grpc_target
+
+        grpc_server = create_server(grpc_target)
+        await grpc_server.start()
+
+        try:
+            async with app.router.lifespan_context(app), \
+                    httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=BASE_URL, timeout=60) as client, \
+                    grpc.aio.insecure_channel(grpc_target) as channel:
+                payments = payments_pb2_grpc.PaymentsServiceStub(channel)
+
+                async def virtual_user():
+                    for number in numbers:
+                        try:
+                            await journey(client, payments, recorder, workload, number)
+                            recorder.journeys += 1
+                        except Exception as e:
+                            recorder.failed_journeys[type(e).__name__] += 1
+                            logger.warning("Load harness journey \x1b[1m%s\x1b[0m failed: %s", number, e)
+
+                started_at = time.perf_counter()
+                await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+                duration = time.perf_counter() - started_at
+        finally:
+            await grpc_server.stop(grace=None)
+
+    return recorder.report(
+        duration,
+        {"concurrency": concurrency, "journeys": journeys, "messages": messages, "run_id": workload["run_id"]}
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Drive scripted user journeys through the FastAPI app and the gRPC payments server "
+                    "in-process and report per-route throughput and latency percentiles as JSON"
+    )
+    parser.add_argument("--concurrency", type=int, default=10, help="number of concurrent virtual users")
+    parser.add_argument("--journeys", type=int, default=50, help="total number of journeys to run")
+    parser.add_argument("--messages", type=int, default=5, help="chat messages sent per journey")
+    parser.add_argument("--output", type=Path, help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.concurrency, args.journeys, args.messages))
+    report_json = json.dumps(report, indent=2)
+
+    if args.output:
+        args.output.write_text(report_json + "\n")
+    else:
+        print(report_json)
+
+    sys.exit(1 if report["failed_journeys"] else 0)
@@ -6,20 +6,24 @@ import secrets
 import random
 
 import jwt
-from cryptography.hazmat.primitives import serialization
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from starlette.config import Config
 from authlib.integrations.starlette_client import OAuth
 
 from server.app.utils.exceptions import GlobalException
+from server.app.utils.executor import crypto_executor
+from server.app.utils.token_cache import verified_tokens
+from server.app.utils.token_signer import token_signer
 
 
 CONF_URL = 'https://accounts.google.com/.well-known/openid-configuration'
 
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 config = Config(os.path.join(os.path.dirname(__file__), ".env"))
 oauth = OAuth(config)
@@ -43,6 +47,18 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def async_get_password_hash(password: str) -> str:
+    return await crypto_executor.run(get_password_hash, password)
+
+
+async def async_verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await crypto_executor.run(verify_and_update_password, plain_password, hashed_password)
+
+
 def generate_password():
     passwd = ""
     
@@ -61,16 +77,6 @@ def generate_username(first_name: str, last_name: str):
     return username
 
 
-with open(os.path.join(os.path.dirname(__file__), "../../keys/private.pem"), "rb") as key_file:
-    private_key = serialization.load_pem_private_key(
-        key_file.read(),
-        password=None,
-    )
-
-with open(os.path.join(os.path.dirname(__file__), "../../keys/public.pem"), "rb") as key_file:
-    public_key = serialization.load_pem_public_key(key_file.read())
-
-
 def create_token(user_data: dict[str, Any], expires_in: timedelta):
     exp = datetime.now(timezone.utc) + expires_in
 
@@ -81,13 +87,15 @@ def create_token(user_data: dict[str, Any], expires_in: timedelta):
         "content": user_data
     }
 
-    token = jwt.encode(payload=payload, key=private_key, algorithm="RS256")
+    return token_signer.sign(payload)
+
 
-    return token
+async def async_create_token(user_data: dict[str, Any], expires_in: timedelta) -> str:
+    return await crypto_executor.run(create_token, user_data, expires_in)
 
 
 def refresh_token(token: str):
-    payload = jwt.decode(token, key=public_key, algorithms=["RS256"])
+    payload = verify_token(token)
 
     user_data = payload["content"]
 
@@ -103,9 +111,23 @@ def refresh_token(token: str):
     )
 
 
+async def async_refresh_token(token: str) -> dict[str, str]:
+    return await crypto_executor.run(refresh_token, token)
+
+
 def verify_token(token: str) -> dict[str, Any] | None:
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+
+    if verified_tokens.is_revoked(token):
+        GlobalException.CustomHTTPException.raise_exception(
+            status_code=401,
+            detail="Invalid token",
+        )
+
     try:
-        payload = jwt.decode(token, public_key, algorithms=["RS256"])
+        payload = token_signer.verify(token)
 
         if not payload.get("sub") or not isinstance(payload.get("sub"), str):
             GlobalException.CustomHTTPException.raise_exception(
@@ -113,6 +135,7 @@ def verify_token(token: str) -> dict[str, Any] | None:
                 detail="Invalid token",
             )
 
+        verified_tokens.put(token, payload)
         return payload
 
     except (jwt.PyJWTError, jwt.ExpiredSignatureError) as e:
@@ -120,3 +143,12 @@ def verify_token(token: str) -> dict[str, Any] | None:
             status_code=401,
             detail="Invalid token",
         )
+
+
+def revoke_token(token: str) -> None:
+    try:
+        expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.PyJWTError:
+        return
+
+    verified_tokens.revoke(token, expires_at)
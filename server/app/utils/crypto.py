@@ -1,8 +1,13 @@
+import hashlib
+import hmac
 import os
-from typing import Any
+import re
+from typing import Any, Iterable
 
-from cryptography.hazmat.primitives import serialization, hashes
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives import serialization
+
+from server.app.utils.envelope_encryption import DATA_KEY_CACHE_SIZE, DATA_KEY_MAX_USES, EnvelopeCipher
+from server.app.utils.executor import crypto_executor
 
 
 with open(os.path.join(os.path.dirname(__file__), "../../keys/private_key.pem"), "rb") as key_file:
@@ -16,39 +21,99 @@ with open(os.path.join(os.path.dirname(__file__), "../../keys/public_key.pem"),
     public_key = serialization.load_pem_public_key(key_file.read())
 
 
+envelope_cipher = EnvelopeCipher(
+    public_key=public_key,
+    private_key=private_key,
+    data_key_max_uses=DATA_KEY_MAX_USES,
+    data_key_cache_size=DATA_KEY_CACHE_SIZE
+)
+
+PAYMENT_MASK_PREFIX = "****" * 3
+
+_payment_separators_re = re.compile(r"[\s-]")
+_payment_fingerprint_key = os.getenv("PAYMENT_FINGERPRINT_KEY", "").encode("utf-8") or hashlib.sha256(
+    b"payment-fingerprint:" + private_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+).digest()
+
+
 def encrypt_data(data_to_encrypt: str) -> bytes:
     if not isinstance(data_to_encrypt, str):
         data_to_encrypt = str(data_to_encrypt)
 
     data = bytes(data_to_encrypt, encoding="utf-8")
 
-    encrypted_data = public_key.encrypt(
-        data,
-        padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA256()),
-            algorithm=hashes.SHA256(),
-            label=None
-        )
-    )
-
-    return encrypted_data
+    return envelope_cipher.encrypt(data)
 
 
 def decrypt_data(encrypted_data: bytes) -> bytes:
-    decrypted_data = private_key.decrypt(
-        encrypted_data,
-        padding.OAEP(
-            mgf=padding.MGF1(algorithm=hashes.SHA256()),
-            algorithm=hashes.SHA256(),
-            label=None
-        )
-    )
+    return envelope_cipher.decrypt(encrypted_data)
+
+
+def decrypt_many_data(encrypted_data: Iterable[bytes]) -> list[bytes]:
+    return envelope_cipher.decrypt_many(encrypted_data)
+
+
+def needs_reencryption(encrypted_data: bytes) -> bool:
+    return envelope_cipher.is_legacy(bytes(encrypted_data))
+
+
+async def async_encrypt_data(data_to_encrypt: str) -> bytes:
+    return await crypto_executor.run(encrypt_data, data_to_encrypt)
+
 
-    return decrypted_data
+async def async_decrypt_data(encrypted_data: bytes) -> bytes:
+    return await crypto_executor.run(decrypt_data, encrypted_data)
+
+
+async def async_decrypt_many_data(encrypted_data: list[bytes]) -> list[bytes]:
+    return await crypto_executor.run(decrypt_many_data, encrypted_data)
+
+
+async def async_protect_payment(payment: str) -> dict[str, Any]:
+    return await crypto_executor.run(protect_payment, payment)
+
+
+def _normalize_payment(payment: str) -> str:
+    return _payment_separators_re.sub("", str(payment))
+
+
+def mask_payment(payment: str) -> str:
+    return PAYMENT_MASK_PREFIX + _normalize_payment(payment)[-4:]
+
+
+def fingerprint_payment(payment: str) -> str:
+    return hmac.new(
+        _payment_fingerprint_key,
+        _normalize_payment(payment).encode("utf-8"),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def protect_payment(payment: str) -> dict[str, Any]:
+    return {
+        "payment": encrypt_data(payment),
+        "payment_masked": mask_payment(payment),
+        "payment_fingerprint": fingerprint_payment(payment),
+    }
 
 
 def get_masked_payment(payment: dict[str, Any]) -> dict[str, Any]:
-    decrypted_data = decrypt_data(payment.get("payment").tobytes()).decode("utf-8")
-    payment["payment"] = "****" * 3 + decrypted_data[-4:]
+    return get_masked_payments([payment])[0]
+
+
+def get_masked_payments(payments: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    unmasked = [payment for payment in payments if payment.get("payment_masked") is None]
+    decrypted = decrypt_many_data(payment["payment"] for payment in unmasked)
+
+    for payment, decrypted_payment in zip(unmasked, decrypted):
+        payment["payment_masked"] = mask_payment(decrypted_payment.decode("utf-8"))
+
+    for payment in payments:
+        payment["payment"] = payment.pop("payment_masked")
+        payment.pop("payment_fingerprint", None)
 
-    return payment
+    return payments
@@ -1,5 +1,4 @@
 import asyncio
-import json
 from functools import wraps
 from typing import Any, Annotated, Callable
 
@@ -8,8 +7,10 @@ from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from server.app.controllers.user_controller import UserController
+from server.app.database.read_your_writes import set_read_your_writes_key
 from server.app.utils.auth import verify_token
-from server.app.utils.redis_client import redis_client
+from server.app.utils.executor import handler_executor
+from server.app.utils.permission_snapshot import permission_snapshot
 from server.app.utils.exceptions import GlobalException
 
 
@@ -52,7 +53,7 @@ async def get_current_user(credentials: Annotated[HTTPAuthorizationCredentials,
     try:
         token = credentials.credentials
         verify_token(token)
-        user = UserController.get_user_by_token(token)
+        user = await UserController.get_user_by_token(token)
 
         if user is None:
             GlobalException.CustomHTTPException.raise_exception(
@@ -70,6 +71,8 @@ async def get_current_user(credentials: Annotated[HTTPAuthorizationCredentials,
                 detail="User was requested to perform deletion. Provide valid credentials or restore profile"
             )
 
+        set_read_your_writes_key(f"user:{user['id']}")
+
         return user
 
     except jwt.PyJWTError as e:
@@ -109,12 +112,14 @@ def required_plans(allowed_plans: list[str]):
             if asyncio.iscoroutinefunction(func):
                 return await func(*args, user=user, **kwargs)
             else:
-                return func(*args, user=user, **kwargs)
+                return await handler_executor.run(func, *args, user=user, **kwargs)
         return wrapper
     return decorator
 
 
 def required_permissions(permissions: list[str]):
+    required = frozenset(permissions)
+
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, user: dict[str, Any] = Depends(get_current_user), **kwargs) -> dict[str, Any]:
@@ -127,9 +132,7 @@ def required_permissions(permissions: list[str]):
                     extra={"plan_name": plan_name}
                 )
 
-            user_permissions = set(json.loads(redis_client.hgetall(plan_name).get("permissions")))
-
-            if not set(permissions).issubset(user_permissions):
+            if not permission_snapshot.has_permissions(plan_name, required):
                 GlobalException.CustomHTTPException.raise_exception(
                     status_code=403,
                     detail="User does not have permission to access resource"
@@ -137,6 +140,6 @@ def required_permissions(permissions: list[str]):
             if asyncio.iscoroutinefunction(func):
                 return await func(*args, user=user, **kwargs)
             else:
-                return func(*args, user=user, **kwargs)
+                return await handler_executor.run(func, *args, user=user, **kwargs)
         return wrapper
     return decorator
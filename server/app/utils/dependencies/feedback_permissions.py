@@ -1,12 +1,15 @@
 from functools import wraps
 from typing import Callable
-import json
 
-from server.app.utils.redis_client import redis_client
 from server.app.utils.exceptions import GlobalException
+from server.app.utils.permission_snapshot import permission_snapshot
 from server.app.validators.profile_feedback_validators import ProfileFeedbackValidator
 
 
+OWN_FEEDBACK_PERMISSIONS = frozenset({"update_feedback_info_created_by_current_user", "delete_feedback_created_by_current_user"})
+ANY_FEEDBACK_PERMISSIONS = frozenset({"read_feedbacks_details_selected_user", "delete_feedback_selected_user"})
+
+
 def can_delete_feedback():
     def decorator(func: Callable):
         @wraps(func)
@@ -16,7 +19,6 @@ def can_delete_feedback():
             user = kwargs.get("user")
 
             user_plan = user.get("plan_name")
-            user_permissions = set(json.loads(redis_client.hgetall(user_plan).get("permissions")))
 
             if not user_plan:
                 GlobalException.CustomHTTPException.raise_exception(
@@ -24,8 +26,7 @@ def can_delete_feedback():
                     detail="User plan not found",
                 )
             if user_plan in ["customer", "performer"]:
-                if not {"update_feedback_info_created_by_current_user", "delete_feedback_created_by_current_user"}.issubset(
-                        user_permissions):
+                if not permission_snapshot.has_permissions(user_plan, OWN_FEEDBACK_PERMISSIONS):
                     GlobalException.CustomHTTPException.raise_exception(
                         status_code=403,
                         detail="User does not have permission to access resource"
@@ -36,7 +37,7 @@ def can_delete_feedback():
                 ). \
                 validate_feedback_commentator()
             if user_plan in ["admin", "moderator"]:
-                if not {"read_feedbacks_details_selected_user", "delete_feedback_selected_user"}.issubset(user_permissions):
+                if not permission_snapshot.has_permissions(user_plan, ANY_FEEDBACK_PERMISSIONS):
                     GlobalException.CustomHTTPException.raise_exception(
                         status_code=403,
                         detail="User does not have permission to access resource"
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from typing import Any, Iterable
+import hashlib
+import os
+import struct
+import threading
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+
+ENVELOPE_VERSION = 1
+DATA_KEY_BITS = 256
+NONCE_SIZE = 12
+DATA_KEY_MAX_USES = int(os.getenv("DATA_KEY_MAX_USES", 1_000_000))
+DATA_KEY_CACHE_SIZE = int(os.getenv("DATA_KEY_CACHE_SIZE", 1_024))
+
+_HEADER = struct.Struct(">BH")
+
+
+class EnvelopeCipher:
+    def __init__(
+            self,
+            public_key: RSAPublicKey,
+            private_key: RSAPrivateKey,
+            data_key_max_uses: int,
+            data_key_cache_size: int
+    ):
+        self.public_key = public_key
+        self.private_key = private_key
+        self.data_key_max_uses = data_key_max_uses
+        self.data_key_cache_size = data_key_cache_size
+        self.legacy_size = public_key.key_size // 8
+
+        self._lock = threading.Lock()
+        self._data_key: tuple[AESGCM, bytes] | None = None
+        self._data_key_uses = 0
+        self._unwrapped_keys: OrderedDict[bytes, AESGCM] = OrderedDict()
+        self._counters = {
+            "encrypted": 0,
+            "decrypted": 0,
+            "legacy_decrypted": 0,
+            "data_keys_generated": 0,
+            "data_keys_unwrapped": 0,
+        }
+
+    def encrypt(self, data: bytes) -> bytes:
+        aesgcm, wrapped_key = self._current_data_key()
+        header = _HEADER.pack(ENVELOPE_VERSION, len(wrapped_key)) + wrapped_key
+        nonce = os.urandom(NONCE_SIZE)
+
+        return header + nonce + aesgcm.encrypt(nonce, data, header)
+
+    def decrypt(self, envelope: bytes) -> bytes:
+        return self.decrypt_many([envelope])[0]
+
+    def decrypt_many(self, envelopes: Iterable[bytes]) -> list[bytes]:
+        decrypted = []
+        legacy = 0
+
+        for envelope in envelopes:
+            envelope = bytes(envelope)
+
+            if self.is_legacy(envelope):
+                decrypted.append(self.private_key.decrypt(envelope, self._oaep()))
+                legacy += 1
+                continue
+
+            version, wrapped_key_size = _HEADER.unpack_from(envelope)
+            if version != ENVELOPE_VERSION:
+                raise ValueError(f"Unsupported envelope version {version}")
+
+            header_size = _HEADER.size + wrapped_key_size
+            header = envelope[:header_size]
+            nonce = envelope[header_size:header_size + NONCE_SIZE]
+
+            aesgcm = self._unwrap(envelope[_HEADER.size:header_size])
+            decrypted.append(aesgcm.decrypt(nonce, envelope[header_size + NONCE_SIZE:], header))
+
+        with self._lock:
+            self._counters["decrypted"] += len(decrypted) - legacy
+            self._counters["legacy_decrypted"] += legacy
+
+        return decrypted
+
+    def is_legacy(self, envelope: bytes) -> bool:
+        return len(envelope) == self.legacy_size
+
+    def rotate(self) -> None:
+        with self._lock:
+            self._data_key = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": ENVELOPE_VERSION,
+                "data_key_uses": self._data_key_uses,
+                "data_key_max_uses": self.data_key_max_uses,
+                "cached_data_keys": len(self._unwrapped_keys),
+                **self._counters,
+            }
+
+    def _current_data_key(self) -> tuple[AESGCM, bytes]:
+        with self._lock:
+            if self._data_key is None or self._data_key_uses >= self.data_key_max_uses:
+                data_key = AESGCM.generate_key(bit_length=DATA_KEY_BITS)
+                wrapped_key = self.public_key.encrypt(data_key, self._oaep())
+
+                self._data_key = (AESGCM(data_key), wrapped_key)
+                self._data_key_uses = 0
+                self._remember(wrapped_key, self._data_key[0])
+                self._counters["data_keys_generated"] += 1
+
+            self._data_key_uses += 1
+            self._counters["encrypted"] += 1
+            return self._data_key
+
+    def _unwrap(self, wrapped_key: bytes) -> AESGCM:
+        digest = hashlib.sha256(wrapped_key).digest()
+
+        with self._lock:
+            aesgcm = self._unwrapped_keys.get(digest)
+            if aesgcm is not None:
+                self._unwrapped_keys.move_to_end(digest)
+                return aesgcm
+
+        aesgcm = AESGCM(self.private_key.decrypt(wrapped_key, self._oaep()))
+
+        with self._lock:
+            self._remember(wrapped_key, aesgcm)
+            self._counters["data_keys_unwrapped"] += 1
+        return aesgcm
+
+    def _remember(self, wrapped_key: bytes, aesgcm: AESGCM) -> None:
+        self._unwrapped_keys[hashlib.sha256(wrapped_key).digest()] = aesgcm
+        while len(self._unwrapped_keys) > self.data_key_cache_size:
+            self._unwrapped_keys.popitem(last=False)
+
+    @staticmethod
+    def _oaep() -> padding.OAEP:
+        return padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None
+        )
@@ -7,13 +7,24 @@ import grpc
 
 from fastapi import HTTPException
 from fastapi.exceptions import ResponseValidationError, ValidationException
+from psycopg import errors as async_db_errors
 from psycopg2.errors import DatabaseError, OperationalError, IntegrityError
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from server.app.utils.executor import handler_executor
 from server.app.utils.logger import logger
 
 
+DATABASE_ERRORS = (
+    DatabaseError,
+    OperationalError,
+    IntegrityError,
+    async_db_errors.DatabaseError,
+    async_db_errors.OperationalError,
+)
+
+
 def get_http_error_code(status_code: grpc.StatusCode) -> int:
     mapping = {
         grpc.StatusCode.OK: 200,
@@ -38,7 +49,7 @@ class GlobalException(Exception):
             try:
                 if asyncio.iscoroutinefunction(func):
                     return await func(*args, **kwargs)
-                return func(*args, **kwargs)
+                return await handler_executor.run(func, *args, **kwargs)
             except (grpc.aio.AioRpcError, grpc.aio.AbortError) as e:
                 logger.error(
                     "gRPC error was occured: \n%s" \
@@ -50,7 +61,7 @@ class GlobalException(Exception):
                     status_code=get_http_error_code(e.code()),
                     detail=e.details()
                 )
-            except (DatabaseError, OperationalError, IntegrityError) as e:
+            except DATABASE_ERRORS as e:
                 logger.error(
                     "Database error was occured: \n%s\x1b[31m" \
                     "ERROR TRACEBACK:\x1b[0m\n%s",
@@ -0,0 +1,119 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+import asyncio
+import contextvars
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+
+load_dotenv()
+
+
+HANDLER_POOL_MAX_WORKERS = int(os.getenv("HANDLER_POOL_MAX_WORKERS", 40))
+HANDLER_POOL_MAX_QUEUE = int(os.getenv("HANDLER_POOL_MAX_QUEUE", 200))
+CRYPTO_POOL_MAX_WORKERS = int(os.getenv("CRYPTO_POOL_MAX_WORKERS", os.cpu_count() or 1))
+CRYPTO_POOL_MAX_QUEUE = int(os.getenv("CRYPTO_POOL_MAX_QUEUE", 100))
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "max_queued": 0,
+            "queue_wait_seconds_total": 0.0,
+        }
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        return await asyncio.wrap_future(self._submit(func, *args, **kwargs))
+
+    def call(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        return self._submit(func, *args, **kwargs).result()
+
+    def _submit(self, func: Callable, *args: Any, **kwargs: Any) -> Future:
+        call = self._reserve(func, *args, **kwargs)
+        try:
+            future = self._executor.submit(call)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._release_if_cancelled)
+
+        return future
+
+    def _release_if_cancelled(self, future: Future) -> None:
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._counters["cancelled"] += 1
+
+    def _reserve(self, func: Callable, *args: Any, **kwargs: Any) -> Callable[[], Any]:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server is busy. Please retry the request later"
+                )
+            self._queued += 1
+            self._counters["submitted"] += 1
+            self._counters["max_queued"] = max(self._counters["max_queued"], self._queued)
+
+        context = contextvars.copy_context()
+        return partial(context.run, self._call, time.monotonic(), func, *args, **kwargs)
+
+    def _call(self, submitted_at: float, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._counters["queue_wait_seconds_total"] += time.monotonic() - submitted_at
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._counters["completed"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "active": self._active,
+                **self._counters,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+handler_executor = BoundedExecutor(
+    max_workers=HANDLER_POOL_MAX_WORKERS,
+    max_queue=HANDLER_POOL_MAX_QUEUE,
+    thread_name_prefix="sync-handler"
+)
+
+crypto_executor = BoundedExecutor(
+    max_workers=CRYPTO_POOL_MAX_WORKERS,
+    max_queue=CRYPTO_POOL_MAX_QUEUE,
+    thread_name_prefix="crypto"
+)
@@ -0,0 +1,64 @@
+from typing import Any
+import base64
+import binascii
+import json
+
+from fastapi import Query, Response
+
+from server.app.utils.exceptions import GlobalException
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+FIRST_PAGE_KEY = 2 ** 31 - 1
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+
+    if (
+            not isinstance(values, dict)
+            or not isinstance(values.get("id"), int)
+            or not 0 < values["id"] <= FIRST_PAGE_KEY
+    ):
+        GlobalException.CustomHTTPException.raise_exception(
+            status_code=400,
+            detail="Invalid pagination cursor",
+            extra={"cursor": cursor}
+        )
+    return values
+
+
+def get_page_params(
+        cursor: str | None = Query(None, description="opaque cursor from the X-Next-Cursor header"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="page size"),
+) -> dict[str, int]:
+    return {
+        "after_id": decode_cursor(cursor)["id"] if cursor else FIRST_PAGE_KEY,
+        "limit": limit,
+    }
+
+
+def _row_id(row: Any) -> int:
+    return row["id"] if isinstance(row, dict) else row.id
+
+
+def set_next_cursor(response: Response, rows: list[Any], limit: int) -> list[Any]:
+    ids = list(dict.fromkeys(_row_id(row) for row in rows))
+
+    if len(ids) <= limit:
+        return rows
+
+    last_id = ids[limit - 1]
+    page_ids = set(ids[:limit])
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": last_id})
+
+    return [row for row in rows if _row_id(row) in page_ids]
@@ -0,0 +1,146 @@
+from typing import Any, Iterable
+from uuid import uuid4
+import json
+import os
+import threading
+import time
+
+import redis
+
+from server.app.utils.logger import logger
+from server.app.utils.redis_client import redis_client
+
+
+PLANS_PERMISSIONS_KEY = "plans_permissions"
+PLANS_PERMISSIONS_VERSION_KEY = "plans_permissions:version"
+PLANS_PERMISSIONS_CHANNEL = "plans_permissions:changed"
+PERMISSIONS_VERSION_CHECK_SECONDS = float(os.getenv("PERMISSIONS_VERSION_CHECK_SECONDS", 30))
+PERMISSIONS_LISTENER_SLEEP_SECONDS = 1
+
+
+class PermissionSnapshot:
+    def __init__(self, version_check_seconds: float):
+        self.version_check_seconds = version_check_seconds
+
+        self._lock = threading.Lock()
+        self._plans: dict[str, frozenset[str]] = {}
+        self._version: str | None = None
+        self._checked_at = 0.0
+        self._listener: redis.client.PubSubWorkerThread | None = None
+        self._counters = {
+            "checks": 0,
+            "denied": 0,
+            "refreshes": 0,
+            "version_checks": 0,
+        }
+
+    def permissions(self, plan_name: str) -> frozenset[str]:
+        self._ensure_fresh()
+        return self._plans.get(plan_name, frozenset())
+
+    def has_permissions(self, plan_name: str, required: frozenset[str]) -> bool:
+        allowed = required <= self.permissions(plan_name)
+
+        self._counters["checks"] += 1
+        if not allowed:
+            self._counters["denied"] += 1
+        return allowed
+
+    def refresh(self) -> None:
+        with redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.get(PLANS_PERMISSIONS_VERSION_KEY)
+            pipeline.hgetall(PLANS_PERMISSIONS_KEY)
+            version, plans = pipeline.execute()
+
+        with self._lock:
+            self._plans = {plan: frozenset(json.loads(permissions)) for plan, permissions in plans.items()}
+            self._version = version
+            self._checked_at = time.monotonic()
+            self._counters["refreshes"] += 1
+
+        logger.info("Loaded permissions snapshot version \x1b[1m%s\x1b[0m for plans %s", version, sorted(plans))
+
+    def publish(self, plans_permissions: dict[str, Iterable[str]]) -> None:
+        version = uuid4().hex
+
+        with redis_client.pipeline(transaction=True) as pipeline:
+            pipeline.delete(PLANS_PERMISSIONS_KEY)
+            if plans_permissions:
+                pipeline.hset(PLANS_PERMISSIONS_KEY, mapping={
+                    plan: json.dumps(sorted(permissions)) for plan, permissions in plans_permissions.items()
+                })
+            pipeline.set(PLANS_PERMISSIONS_VERSION_KEY, version)
+            pipeline.execute()
+
+        redis_client.publish(PLANS_PERMISSIONS_CHANNEL, version)
+        self.refresh()
+
+    def start_listener(self) -> None:
+        if self._listener is not None:
+            return
+
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{PLANS_PERMISSIONS_CHANNEL: self._on_change})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=PERMISSIONS_LISTENER_SLEEP_SECONDS,
+                daemon=True,
+                exception_handler=self._on_listener_error
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "Could not subscribe to \x1b[1m%s\x1b[0m, permissions are re-checked every %ss: %s",
+                PLANS_PERMISSIONS_CHANNEL,
+                self.version_check_seconds,
+                e
+            )
+
+    def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self._version,
+                "plans": {plan: len(permissions) for plan, permissions in self._plans.items()},
+                "listening": self._listener is not None,
+                **self._counters,
+            }
+
+    def _ensure_fresh(self) -> None:
+        if self._version is not None and time.monotonic() - self._checked_at < self.version_check_seconds:
+            return
+
+        try:
+            version = redis_client.get(PLANS_PERMISSIONS_VERSION_KEY)
+        except redis.RedisError as e:
+            if self._version is None:
+                raise
+            logger.warning("Could not check permissions snapshot version, keeping \x1b[1m%s\x1b[0m: %s", self._version, e)
+            version = self._version
+
+        self._counters["version_checks"] += 1
+        if version is None and self._version is not None:
+            logger.warning("Permissions snapshot version is missing in Redis, keeping \x1b[1m%s\x1b[0m", self._version)
+            version = self._version
+
+        if version is None or version != self._version:
+            self.refresh()
+        else:
+            self._checked_at = time.monotonic()
+
+    def _on_change(self, message: dict[str, Any]) -> None:
+        if message["data"] != self._version:
+            self.refresh()
+
+    def _on_listener_error(self, error: Exception, pubsub: redis.client.PubSub, thread) -> None:
+        logger.warning("Permissions snapshot listener stopped: %s", error)
+        thread.stop()
+        pubsub.close()
+        self._listener = None
+        self._checked_at = 0.0
+
+
+permission_snapshot = PermissionSnapshot(version_check_seconds=PERMISSIONS_VERSION_CHECK_SECONDS)
@@ -0,0 +1,29 @@
+from typing import Any, Callable, Iterable, Iterator
+
+from pydantic import BaseModel
+from starlette.responses import StreamingResponse
+
+from server.app.utils.logger import logger
+
+
+def ndjson_response(
+        batches: Iterable[list[dict[str, Any]]],
+        schema: type[BaseModel],
+        transform: Callable[[dict[str, Any]], dict[str, Any]] | None = None
+) -> StreamingResponse:
+    def content() -> Iterator[bytes]:
+        try:
+            for batch in batches:
+                yield b"".join(
+                    schema.model_validate(transform(row) if transform else row).model_dump_json().encode() + b"\n"
+                    for row in batch
+                )
+        except Exception as e:
+            logger.error("Streaming response was interrupted: %s", e)
+            raise
+        finally:
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+
+    return StreamingResponse(content(), media_type="application/x-ndjson")
@@ -0,0 +1,221 @@
+from collections import OrderedDict
+from typing import Any
+from uuid import uuid4
+import hashlib
+import heapq
+import json
+import os
+import threading
+import time
+
+import redis
+
+from server.app.utils.logger import logger
+from server.app.utils.redis_client import redis_client
+
+
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10_000))
+REVOKED_TOKEN_TTL_SECONDS = 7 * 24 * 60 * 60
+REVOKED_TOKEN_KEY_PREFIX = "revoked_token:"
+TOKEN_REVOCATION_CHANNEL = "verified_tokens:revoked"
+TOKEN_REVOCATION_LISTENER_SLEEP_SECONDS = 1
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._tokens: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._expirations: list[tuple[float, str]] = []
+        self._revoked: dict[str, float] = {}
+        self._origin = uuid4().hex
+        self._listener: redis.client.PubSubWorkerThread | None = None
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evicted": 0,
+            "revoked": 0,
+            "remote_revocations": 0,
+        }
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        digest = token_digest(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._tokens.get(digest)
+
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            if entry[0] <= now:
+                del self._tokens[digest]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._tokens.move_to_end(digest)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def put(self, token: str, payload: dict[str, Any]) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or not self.max_size:
+            return
+
+        digest = token_digest(token)
+        now = time.time()
+
+        with self._lock:
+            if digest in self._revoked:
+                return
+
+            self._purge_expired(now)
+            self._tokens[digest] = (expires_at, payload)
+            self._tokens.move_to_end(digest)
+            heapq.heappush(self._expirations, (expires_at, digest))
+
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+                self._counters["evicted"] += 1
+
+            if len(self._expirations) > 2 * self.max_size:
+                self._expirations = [
+                    *((exp, digest) for digest, (exp, _) in self._tokens.items()),
+                    *((exp, digest) for digest, exp in self._revoked.items()),
+                ]
+                heapq.heapify(self._expirations)
+
+    def is_revoked(self, token: str) -> bool:
+        digest = token_digest(token)
+
+        with self._lock:
+            if digest in self._revoked:
+                return True
+
+        try:
+            ttl_ms = redis_client.pttl(REVOKED_TOKEN_KEY_PREFIX + digest)
+        except redis.RedisError as e:
+            logger.warning("Could not check token revocation in Redis: %s", e)
+            return False
+
+        if ttl_ms is None or ttl_ms < 0:
+            return False
+
+        self._revoke_local(digest, time.time() + ttl_ms / 1000)
+        return True
+
+    def revoke(self, token: str, expires_at: float | None = None) -> None:
+        digest = token_digest(token)
+        expires_at = self._revoke_local(digest, expires_at)
+
+        with self._lock:
+            self._counters["revoked"] += 1
+
+        try:
+            with redis_client.pipeline(transaction=False) as pipeline:
+                pipeline.set(
+                    REVOKED_TOKEN_KEY_PREFIX + digest,
+                    1,
+                    px=max(1, int((expires_at - time.time()) * 1000))
+                )
+                pipeline.publish(
+                    TOKEN_REVOCATION_CHANNEL,
+                    json.dumps({"origin": self._origin, "digest": digest, "expires_at": expires_at})
+                )
+                pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning("Could not publish token revocation, it is enforced by this process only: %s", e)
+
+    def start_listener(self) -> None:
+        if self._listener is not None:
+            return
+
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{TOKEN_REVOCATION_CHANNEL: self._on_revocation})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=TOKEN_REVOCATION_LISTENER_SLEEP_SECONDS,
+                daemon=True,
+                exception_handler=self._on_listener_error
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "Could not subscribe to \x1b[1m%s\x1b[0m, cached tokens revoked elsewhere stay valid until they expire: %s",
+                TOKEN_REVOCATION_CHANNEL,
+                e
+            )
+
+    def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._expirations.clear()
+            self._revoked.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "max_size": self.max_size,
+                "size": len(self._tokens),
+                "revoked_size": len(self._revoked),
+                "listening": self._listener is not None,
+                **self._counters,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else None,
+            }
+
+    def _revoke_local(self, digest: str, expires_at: float | None) -> float:
+        with self._lock:
+            self._purge_expired(time.time())
+            entry = self._tokens.pop(digest, None)
+            if expires_at is None:
+                expires_at = entry[0] if entry is not None else time.time() + REVOKED_TOKEN_TTL_SECONDS
+
+            self._revoked[digest] = expires_at
+            heapq.heappush(self._expirations, (expires_at, digest))
+            return expires_at
+
+    def _on_revocation(self, message: dict[str, Any]) -> None:
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if data.get("origin") == self._origin:
+            return
+
+        self._revoke_local(data["digest"], data.get("expires_at"))
+        with self._lock:
+            self._counters["remote_revocations"] += 1
+
+    def _on_listener_error(self, error: Exception, pubsub: redis.client.PubSub, thread) -> None:
+        logger.warning("Token revocation listener stopped: %s", error)
+        thread.stop()
+        pubsub.close()
+        self._listener = None
+        with self._lock:
+            self._tokens.clear()
+
+    def _purge_expired(self, now: float) -> None:
+        while self._expirations and self._expirations[0][0] <= now:
+            expires_at, digest = heapq.heappop(self._expirations)
+
+            entry = self._tokens.get(digest)
+            if entry is not None and entry[0] == expires_at:
+                del self._tokens[digest]
+                self._counters["expired"] += 1
+            if self._revoked.get(digest) == expires_at:
+                del self._revoked[digest]
+
+
+verified_tokens = VerifiedTokenCache(max_size=TOKEN_CACHE_MAX_SIZE)
@@ -0,0 +1,128 @@
+from typing import Any, Iterable
+import base64
+import hashlib
+import os
+import threading
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+
+KEYS_DIR = os.path.join(os.path.dirname(__file__), "../../keys")
+JWT_SIGNING_KEY_PATH = os.getenv("JWT_SIGNING_KEY_PATH", os.path.join(KEYS_DIR, "private.pem"))
+JWT_VERIFICATION_KEY_PATHS = [path for path in os.getenv("JWT_VERIFICATION_KEY_PATHS", "").split(",") if path]
+JWT_LEGACY_KEY_PATH = os.getenv("JWT_LEGACY_KEY_PATH", os.path.join(KEYS_DIR, "public.pem"))
+JWT_RSA_ALGORITHM = os.getenv("JWT_RSA_ALGORITHM", "RS256")
+LEGACY_ALGORITHM = "RS256"
+
+EC_ALGORITHMS = {
+    "secp256r1": "ES256",
+    "secp384r1": "ES384",
+    "secp521r1": "ES512",
+}
+
+
+def algorithm_for_key(key) -> str:
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return JWT_RSA_ALGORITHM
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and key.curve.name in EC_ALGORITHMS:
+        return EC_ALGORITHMS[key.curve.name]
+
+    raise ValueError(f"Unsupported JWT key type {type(key).__name__}")
+
+
+def key_id(public_key) -> str:
+    der = public_key.public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return base64.urlsafe_b64encode(hashlib.sha256(der).digest()[:12]).decode("ascii")
+
+
+def load_private_key(path: str):
+    with open(path, "rb") as key_file:
+        return serialization.load_pem_private_key(key_file.read(), password=None)
+
+
+def load_public_key(path: str):
+    with open(path, "rb") as key_file:
+        return serialization.load_pem_public_key(key_file.read())
+
+
+class TokenSigner:
+    def __init__(self, signing_key, verification_keys: Iterable[Any] = (), legacy_key=None):
+        self.algorithm = algorithm_for_key(signing_key)
+        self.kid = key_id(signing_key.public_key())
+
+        self._signing_key = signing_key
+        self._headers = {"kid": self.kid}
+        self._keys: dict[str, tuple[str, Any]] = {self.kid: (self.algorithm, signing_key.public_key())}
+        for public_key in verification_keys:
+            self._keys.setdefault(key_id(public_key), (algorithm_for_key(public_key), public_key))
+        if legacy_key is not None and not isinstance(legacy_key, rsa.RSAPublicKey):
+            raise ValueError(f"Legacy JWT key must be an RSA public key, got {type(legacy_key).__name__}")
+        self._legacy_key = (LEGACY_ALGORITHM, legacy_key) if legacy_key is not None else None
+
+        self._lock = threading.Lock()
+        self._counters = {
+            "signed": 0,
+            "verified": 0,
+            "legacy_verified": 0,
+            "unknown_kid": 0,
+        }
+
+    def sign(self, payload: dict[str, Any]) -> str:
+        token = jwt.encode(payload=payload, key=self._signing_key, algorithm=self.algorithm, headers=self._headers)
+
+        with self._lock:
+            self._counters["signed"] += 1
+        return token
+
+    def verify(self, token: str) -> dict[str, Any]:
+        kid = jwt.get_unverified_header(token).get("kid")
+
+        if kid is None:
+            if self._legacy_key is None:
+                raise jwt.InvalidTokenError("Token has no key id")
+            algorithm, public_key = self._legacy_key
+            counter = "legacy_verified"
+        elif kid in self._keys:
+            algorithm, public_key = self._keys[kid]
+            counter = "verified"
+        else:
+            with self._lock:
+                self._counters["unknown_kid"] += 1
+            raise jwt.InvalidTokenError(f"Unknown key id {kid}")
+
+        payload = jwt.decode(token, key=public_key, algorithms=[algorithm])
+
+        with self._lock:
+            self._counters[counter] += 1
+        return payload
+
+    def verification_keys(self) -> list[dict[str, str]]:
+        return [{"kid": kid, "alg": algorithm} for kid, (algorithm, _) in self._keys.items()]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "algorithm": self.algorithm,
+                "kid": self.kid,
+                "verification_keys": self.verification_keys(),
+                "legacy_algorithm": self._legacy_key[0] if self._legacy_key is not None else None,
+                **self._counters,
+            }
+
+
+def load_token_signer() -> TokenSigner:
+    return TokenSigner(
+        signing_key=load_private_key(JWT_SIGNING_KEY_PATH),
+        verification_keys=[load_public_key(path) for path in JWT_VERIFICATION_KEY_PATHS],
+        legacy_key=load_public_key(JWT_LEGACY_KEY_PATH) if JWT_LEGACY_KEY_PATH else None
+    )
+
+
+token_signer = load_token_signer()
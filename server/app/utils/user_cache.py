@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from typing import Any
+from uuid import uuid4
+import json
+import os
+import threading
+import time
+
+import redis
+
+from server.app.utils.logger import logger
+from server.app.utils.redis_client import redis_client
+
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", 30))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", 10_000))
+USER_CACHE_INVALIDATION_CHANNEL = "user_cache:invalidate"
+USER_CACHE_LISTENER_SLEEP_SECONDS = 1
+
+
+class UserPrincipalCache:
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._users: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._usernames: dict[int, str] = {}
+        self._generation = 0
+        self._origin = uuid4().hex
+        self._listener: redis.client.PubSubWorkerThread | None = None
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evicted": 0,
+            "invalidated": 0,
+            "remote_invalidations": 0,
+        }
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, username: str) -> dict[str, Any] | None:
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._users.get(username)
+
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            if entry[0] <= now:
+                self._drop(username)
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+
+            self._users.move_to_end(username)
+            self._counters["hits"] += 1
+            return dict(entry[1])
+
+    def put(self, username: str, user: dict[str, Any], generation: int) -> None:
+        if not user or self.ttl_seconds <= 0 or not self.max_size:
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            self._drop(username)
+            self._users[username] = (time.monotonic() + self.ttl_seconds, dict(user))
+            self._usernames[user["id"]] = username
+
+            while len(self._users) > self.max_size:
+                self._drop(next(iter(self._users)))
+                self._counters["evicted"] += 1
+
+    def invalidate(self, *user_ids: int) -> None:
+        if not user_ids:
+            return
+
+        self._invalidate_local(user_ids)
+
+        try:
+            redis_client.publish(
+                USER_CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": self._origin, "user_ids": list(user_ids)})
+            )
+        except redis.RedisError as e:
+            logger.warning("Could not publish user cache invalidation for \x1b[1m%s\x1b[0m: %s", user_ids, e)
+
+    def invalidate_all(self) -> None:
+        self.clear()
+
+        try:
+            redis_client.publish(
+                USER_CACHE_INVALIDATION_CHANNEL,
+                json.dumps({"origin": self._origin, "user_ids": None})
+            )
+        except redis.RedisError as e:
+            logger.warning("Could not publish user cache invalidation for all users: %s", e)
+
+    def start_listener(self) -> None:
+        if self._listener is not None:
+            return
+
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{USER_CACHE_INVALIDATION_CHANNEL: self._on_invalidation})
+            self._listener = pubsub.run_in_thread(
+                sleep_time=USER_CACHE_LISTENER_SLEEP_SECONDS,
+                daemon=True,
+                exception_handler=self._on_listener_error
+            )
+        except redis.RedisError as e:
+            logger.warning(
+                "Could not subscribe to \x1b[1m%s\x1b[0m, user cache relies on its %ss TTL only: %s",
+                USER_CACHE_INVALIDATION_CHANNEL,
+                self.ttl_seconds,
+                e
+            )
+
+    def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._usernames.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "max_size": self.max_size,
+                "size": len(self._users),
+                "listening": self._listener is not None,
+                **self._counters,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else None,
+            }
+
+    def _invalidate_local(self, user_ids) -> None:
+        with self._lock:
+            self._generation += 1
+
+            for user_id in user_ids:
+                username = self._usernames.get(user_id)
+                if username is not None:
+                    self._drop(username)
+                    self._counters["invalidated"] += 1
+
+    def _drop(self, username: str) -> None:
+        entry = self._users.pop(username, None)
+        if entry is not None and self._usernames.get(entry[1]["id"]) == username:
+            del self._usernames[entry[1]["id"]]
+
+    def _on_invalidation(self, message: dict[str, Any]) -> None:
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if data.get("origin") == self._origin:
+            return
+
+        if data.get("user_ids") is None:
+            self.clear()
+        else:
+            self._invalidate_local(data["user_ids"])
+        with self._lock:
+            self._counters["remote_invalidations"] += 1
+
+    def _on_listener_error(self, error: Exception, pubsub: redis.client.PubSub, thread) -> None:
+        logger.warning("User cache invalidation listener stopped: %s", error)
+        thread.stop()
+        pubsub.close()
+        self._listener = None
+        self.clear()
+
+
+user_principals = UserPrincipalCache(ttl_seconds=USER_CACHE_TTL_SECONDS, max_size=USER_CACHE_MAX_SIZE)
@@ -1,8 +1,8 @@
 import re
 from enum import Enum
 
-from server.app.models.user_model import User
-from server.app.utils.auth import verify_password
+from server.app.models.user_model import User, AsyncUser
+from server.app.utils.auth import async_verify_and_update_password
 from server.app.utils.exceptions import GlobalException
 
 
@@ -143,13 +143,13 @@ class UserTokenValidator:
         self.email = email
         self.username = username
 
-    def validate_user_exists(self):
+    async def validate_user_exists(self):
         user = dict()
 
         if self.username:
-            user = User.get_user_by_field("username", self.username)
+            user = await AsyncUser.get_user_by_field("username", self.username)
         if self.email:
-            user = User.get_user_by_field("email", self.email)
+            user = await AsyncUser.get_user_by_field("email", self.email)
 
         if not user:
             GlobalException.CustomHTTPException.raise_exception(
@@ -158,12 +158,15 @@ class UserTokenValidator:
                 extra={"username": self.username, "email": self.email}
             )
 
-        hashed_password = User.get_user_hashed_password(user.get("id"))
+        hashed_password = await AsyncUser.get_user_hashed_password(user.get("id"))
+        verified, rehashed_password = await async_verify_and_update_password(self.password, hashed_password)
 
-        if not verify_password(self.password, hashed_password):
+        if not verified:
             GlobalException.CustomHTTPException.raise_exception(
                 status_code=400,
                 detail="Password does not match"
             )
+        if rehashed_password is not None:
+            await AsyncUser.update_user_password(user.get("id"), rehashed_password)
 
         return self